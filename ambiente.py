@@ -0,0 +1,127 @@
+import numpy as np
+from random import Random
+from typing import Optional
+from constants import *
+from simulacao import Simulacao
+from simulacao_mundos import SimulacaoMundos
+
+class AmbienteFlappy:
+    def __init__(self, semente: Optional[int] = None) -> None:
+        """
+        Ambiente no estilo do Gym sobre a simulação do jogo, para otimizadores fora do NEAT.
+
+        A observação é a mesma usada pelo treino com NEAT (distância horizontal até o cano,
+        distância até o topo do cano inferior, distância até a base do cano superior,
+        velocidade vertical e ângulo). A recompensa soma exatamente o fitness do NEAT:
+        FITNESS_POR_PASSO a cada passo vivo e -PENALIDADE_MORTE ao morrer.
+
+        Args:
+            semente (int, optional): Semente da qual são sorteados os percursos dos episódios
+                em que reset não recebe uma semente. Default é None (aleatória).
+
+        Returns:
+            None
+        """
+        self.rng_sementes: Random   = Random(semente)
+        self.simulacao: Simulacao   = Simulacao(quantidade_passaros=1, semente=self.rng_sementes.randrange(2**32))
+
+    def reset(self, semente: Optional[int] = None) -> np.ndarray:
+        """
+        Começa um novo episódio.
+
+        Args:
+            semente (int, optional): Semente do percurso do episódio. Default é None (sorteada).
+
+        Returns:
+            np.ndarray: Observação inicial.
+        """
+        if semente is None:
+            semente = self.rng_sementes.randrange(2**32)
+        self.simulacao.resetar(semente)
+        return np.array(self.simulacao.observacao(0), dtype=np.float64)
+
+    def step(self, pular: bool) -> tuple[np.ndarray, float, bool, dict]:
+        """
+        Avança o episódio em um passo de duração fixa.
+
+        Args:
+            pular (bool): True se o passaro deve pular neste passo.
+
+        Returns:
+            tuple: Observação, recompensa, se o episódio terminou e informações extras
+                (pontuação e passos vivos).
+        """
+        if not self.simulacao.passaros[0].vivo:
+            raise RuntimeError("O episódio terminou; chame reset antes de continuar.")
+
+        morreu = bool(self.simulacao.step((pular,)))
+        recompensa = FITNESS_POR_PASSO - (PENALIDADE_MORTE if morreu else 0)
+        info = {'pontuacao': self.simulacao.pontuacao, 'passos': self.simulacao.passaros[0].passos_vivo}
+        return np.array(self.simulacao.observacao(0), dtype=np.float64), recompensa, morreu, info
+
+class AmbienteLote:
+    def __init__(self, quantidade: int, semente: Optional[int] = None) -> None:
+        """
+        Versão em lote do AmbienteFlappy: avança `quantidade` mundos independentes de uma vez,
+        com observações, recompensas e fins de episódio em arrays.
+
+        Os mundos cujo episódio termina são reiniciados automaticamente com um novo percurso,
+        então todo step devolve uma observação válida para cada mundo.
+
+        Args:
+            quantidade (int): Quantidade de mundos.
+            semente (int, optional): Semente da qual são sorteados os percursos. Default é None
+                (aleatória).
+
+        Returns:
+            None
+        """
+        self.quantidade: int                = quantidade
+        self.simulacao: SimulacaoMundos     = SimulacaoMundos(quantidade, semente)
+
+    def reset(self, semente: Optional[int] = None) -> np.ndarray:
+        """
+        Reinicia todos os mundos.
+
+        Args:
+            semente (int, optional): Nova semente da qual são sorteados os percursos.
+                Default é None (continua a sequência atual).
+
+        Returns:
+            np.ndarray: Matriz (quantidade, 5) com a observação inicial de cada mundo.
+        """
+        if semente is not None:
+            self.simulacao.rng_sementes.seed(semente)
+        self.simulacao.resetar_mundos(np.arange(self.quantidade))
+        return self.simulacao.observacoes()
+
+    def step(self, acoes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Avança todos os mundos em um passo de duração fixa.
+
+        Args:
+            acoes (np.ndarray): Array booleano com True para cada mundo cujo passaro deve pular.
+
+        Returns:
+            tuple: Observações (quantidade, 5), recompensas, fins de episódio e informações
+                extras. Em 'pontuacao' e 'passos' ficam os valores finais dos episódios que
+                terminaram neste passo (e os atuais dos demais), e em 'observacao_final' a
+                última observação de cada mundo antes do reinício.
+        """
+        simulacao = self.simulacao
+        mortos = simulacao.step(np.asarray(acoes, dtype=bool))
+
+        terminados = np.zeros(self.quantidade, dtype=bool)
+        terminados[mortos] = True
+        recompensas = np.where(terminados, FITNESS_POR_PASSO - PENALIDADE_MORTE, FITNESS_POR_PASSO).astype(np.float64)
+        observacoes = simulacao.observacoes()
+        info = {
+            'pontuacao': simulacao.pontuacao.copy(),
+            'passos': simulacao.passos_vivo.copy(),
+            'observacao_final': observacoes
+        }
+
+        if len(mortos):
+            simulacao.resetar_mundos(mortos)
+            observacoes = simulacao.observacoes()
+        return observacoes, recompensas, terminados, info
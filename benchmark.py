@@ -0,0 +1,352 @@
+import os
+import sys
+import json
+import random
+import argparse
+import platform
+import subprocess
+from time import perf_counter, strftime
+from statistics import median
+from typing import Any, Callable, Optional
+import numpy as np
+import neat
+from neat.nn import FeedForwardNetwork
+from constants import *
+from simulacao import Simulacao, X_PASSARO
+from simulacao_vetorizada import SimulacaoVetorizada
+from rede_compilada import LoteRedes
+from flappy import FlappyBird
+from passaro import Passaro
+import neat_ai
+
+CAMINHO_CONFIG: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config-feedforward.txt")
+
+def medir(funcao: Callable[[], Any], repeticoes: int) -> float:
+    """
+    Mede o tempo de uma função.
+
+    Args:
+        funcao (Callable): Função sem argumentos a ser medida.
+        repeticoes (int): Quantidade de medições.
+
+    Returns:
+        float: Mediana, em segundos, do tempo de uma chamada.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = perf_counter()
+        funcao()
+        tempos.append(perf_counter() - inicio)
+    return median(tempos)
+
+def carregar_config(tamanho_populacao: int) -> neat.Config:
+    """
+    Carrega a configuração do NEAT com outro tamanho de população.
+
+    Args:
+        tamanho_populacao (int): Tamanho da população.
+
+    Returns:
+        neat.Config: Configuração do NEAT.
+    """
+    config = neat.config.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        CAMINHO_CONFIG
+    )
+    config.pop_size = tamanho_populacao
+    return config
+
+def genomas_evoluidos(config: neat.Config, geracoes: int, semente: int) -> list[neat.DefaultGenome]:
+    """
+    Evolui uma população por algumas gerações, sem janela, para ter redes com nós ocultos.
+
+    Args:
+        config (neat.Config): Configuração do NEAT.
+        geracoes (int): Quantidade de gerações.
+        semente (int): Semente do treino.
+
+    Returns:
+        list[neat.DefaultGenome]: Genomas da última população.
+    """
+    random.seed(semente)
+    neat_ai.rng_percurso.seed(semente)
+    populacao = neat.Population(config)
+    for _ in range(geracoes):
+        neat_ai.eval_genomes(list(populacao.population.items()), config, headless=True)
+        populacao.population = populacao.reproduction.reproduce(
+            config, populacao.species, config.pop_size, populacao.generation
+        )
+        populacao.species.speciate(config, populacao.population, populacao.generation)
+        populacao.generation += 1
+    return list(populacao.population.values())
+
+def acoes_aleatorias(quantidade: int, passos: int, semente: int) -> np.ndarray:
+    """
+    Sorteia ações (pulos) que mantêm a maior parte dos passaros vivos por um tempo.
+
+    Args:
+        quantidade (int): Quantidade de passaros.
+        passos (int): Quantidade de passos.
+        semente (int): Semente do sorteio.
+
+    Returns:
+        np.ndarray: Matriz booleana (passos, quantidade).
+    """
+    return np.random.default_rng(semente).random((passos, quantidade)) < 0.06
+
+def bench_fisica(tamanho: int, passos: int, repeticoes: int) -> dict:
+    """
+    Mede o passo da simulação (física, colisões e canos) em Python puro e vetorizado.
+
+    Args:
+        tamanho (int): Quantidade de passaros.
+        passos (int): Passos por medição.
+        repeticoes (int): Quantidade de medições.
+
+    Returns:
+        dict: Métricas medidas.
+    """
+    acoes = acoes_aleatorias(tamanho, passos, 0)
+    acoes_lista = acoes.tolist()
+
+    def rodar_puro() -> None:
+        simulacao = Simulacao(tamanho, semente=0)
+        for acao in acoes_lista:
+            simulacao.step(acao)
+
+    def rodar_vetorizado() -> None:
+        simulacao = SimulacaoVetorizada(tamanho, semente=0)
+        for acao in acoes:
+            simulacao.step(acao)
+
+    resultado = {}
+    for nome, funcao in (('puro', rodar_puro), ('vetorizado', rodar_vetorizado)):
+        tempo = medir(funcao, repeticoes)
+        resultado[f'{nome}_passos_por_segundo'] = passos / tempo
+        resultado[f'{nome}_passaros_passos_por_segundo'] = passos * tamanho / tempo
+    return resultado
+
+def bench_colisao(tamanho: int, repeticoes: int) -> dict:
+    """
+    Mede só a verificação de colisão com os canos, com um cano cruzando a coluna dos passaros.
+
+    Args:
+        tamanho (int): Quantidade de passaros.
+        repeticoes (int): Quantidade de medições.
+
+    Returns:
+        dict: Métricas medidas.
+    """
+    simulacao = Simulacao(tamanho, semente=0)
+    vetorizada = SimulacaoVetorizada(tamanho, semente=0)
+    for sim in (simulacao, vetorizada):
+        sim.canos[0].mover(X_PASSARO - sim.canos[0].x)
+        sim.atualizar_cano_coluna()
+    alturas = np.random.default_rng(0).uniform(0, ALTURA_TELA - DIMENSOES_CHAO.y, tamanho)
+    for passaro, y in zip(simulacao.passaros, alturas.tolist()):
+        passaro.y = y
+    vetorizada.y[:] = alturas
+
+    def rodar_puro() -> None:
+        for passaro in simulacao.passaros:
+            simulacao.verificar_colisao_canos(passaro)
+
+    tempo_puro = medir(rodar_puro, repeticoes)
+    tempo_vetorizado = medir(vetorizada.verificar_colisao_canos_vetorizada, repeticoes)
+    return {
+        'puro_passaros_por_segundo': tamanho / tempo_puro,
+        'vetorizado_passaros_por_segundo': tamanho / tempo_vetorizado
+    }
+
+def bench_inferencia(genomas: list[neat.DefaultGenome], config: neat.Config, repeticoes: int) -> dict:
+    """
+    Mede um passo de inferência de toda a população com activate, com cada rede compilada
+    e com o lote compilado.
+
+    Args:
+        genomas (list[neat.DefaultGenome]): Genomas evoluídos.
+        config (neat.Config): Configuração do NEAT.
+        repeticoes (int): Quantidade de medições.
+
+    Returns:
+        dict: Métricas medidas.
+    """
+    redes = [FeedForwardNetwork.create(g, config) for g in genomas]
+    compiladas = [neat_ai.compilar_genoma(g, config) for g in genomas]
+    lote = LoteRedes(compiladas)
+    entradas = np.random.default_rng(0).normal(0, 100, (len(genomas), 5))
+    entradas_lista = entradas.tolist()
+
+    def rodar_activate() -> None:
+        for rede, entrada in zip(redes, entradas_lista):
+            rede.activate(entrada)
+
+    def rodar_compilada() -> None:
+        for rede, entrada in zip(compiladas, entradas_lista):
+            rede.ativar(entrada)
+
+    tempo_activate = medir(rodar_activate, repeticoes)
+    tempo_compilada = medir(rodar_compilada, repeticoes)
+    tempo_lote = medir(lambda: lote.ativar(entradas), repeticoes)
+    tempo_lote_rapido = medir(lambda: lote.ativar(entradas, exato=False), repeticoes)
+    return {
+        'nos_ocultos_medio': float(np.mean([len(r.node_evals) - 1 for r in redes])),
+        'activate_redes_por_segundo': len(redes) / tempo_activate,
+        'compilada_redes_por_segundo': len(redes) / tempo_compilada,
+        'lote_redes_por_segundo': len(redes) / tempo_lote,
+        'lote_rapido_redes_por_segundo': len(redes) / tempo_lote_rapido
+    }
+
+def bench_renderizacao(tamanho: int, quadros: int, repeticoes: int) -> dict:
+    """
+    Mede o desenho de quadros do treino (cenário, canos, passaros e textos) sem janela.
+
+    Args:
+        tamanho (int): Quantidade de passaros desenhados.
+        quadros (int): Quadros por medição.
+        repeticoes (int): Quantidade de medições.
+
+    Returns:
+        dict: Métricas medidas.
+    """
+    jogo = FlappyBird(criar_passaro=False, configuracoes_iniciais=True, headless=True)
+    simulacao = SimulacaoVetorizada(tamanho, semente=0)
+    passaros = [
+        Passaro(tela=jogo.tela, posicao=POSICAO_INICIAL_PASSARO.copy(), dimensoes_sprite=DIMENSOES_PASSARO.copy())
+        for _ in range(tamanho)
+    ]
+    simulacao.y[:] = np.random.default_rng(0).uniform(0, ALTURA_TELA - DIMENSOES_CHAO.y, tamanho)
+
+    def rodar_cenario() -> None:
+        for _ in range(quadros):
+            jogo.desenhar_tudo(PASSO_SIMULACAO)
+
+    def rodar_geracao() -> None:
+        for _ in range(quadros):
+            neat_ai.desenhar_geracao(jogo, passaros, simulacao, PASSO_SIMULACAO)
+
+    return {
+        'desenhar_tudo_quadros_por_segundo': quadros / medir(rodar_cenario, repeticoes),
+        'desenhar_geracao_quadros_por_segundo': quadros / medir(rodar_geracao, repeticoes)
+    }
+
+def bench_geracao(config: neat.Config, repeticoes: int) -> dict:
+    """
+    Mede uma geração completa de eval_genomes sem janela, sobre a população inicial.
+
+    Args:
+        config (neat.Config): Configuração do NEAT (define o tamanho da população).
+        repeticoes (int): Quantidade de medições.
+
+    Returns:
+        dict: Métricas medidas.
+    """
+    random.seed(0)
+    genomas = list(neat.Population(config).population.items())
+    passos_totais = []
+
+    def rodar() -> None:
+        neat_ai.rng_percurso.seed(0)
+        neat_ai.eval_genomes(genomas, config, headless=True)
+        passos_totais.append(sum(g.fitness + PENALIDADE_MORTE for _, g in genomas) / FITNESS_POR_PASSO)
+
+    tempo = medir(rodar, repeticoes)
+    return {
+        'segundos_por_geracao': tempo,
+        'passaros_passos_por_segundo': passos_totais[-1] / tempo
+    }
+
+def comparar(atual: dict, anterior: dict) -> None:
+    """
+    Imprime a razão entre as métricas de dois resultados (acima de 1 é mais rápido, exceto
+    para métricas de tempo).
+
+    Args:
+        atual (dict): Resultado atual.
+        anterior (dict): Resultado salvo anteriormente.
+
+    Returns:
+        None
+    """
+    anteriores = {(r['nome'], json.dumps(r['parametros'], sort_keys=True)): r['metricas'] for r in anterior['resultados']}
+    for resultado in atual['resultados']:
+        metricas_anteriores = anteriores.get((resultado['nome'], json.dumps(resultado['parametros'], sort_keys=True)))
+        if not metricas_anteriores:
+            continue
+        for metrica, valor in resultado['metricas'].items():
+            if metricas_anteriores.get(metrica):
+                print(f"{resultado['nome']:<14} {str(resultado['parametros']):<24} {metrica:<40} x{valor / metricas_anteriores[metrica]:.2f}")
+
+def versao_git() -> Optional[str]:
+    """
+    Retorna o commit atual do repositório, se houver.
+
+    Returns:
+        str: Hash do commit, ou None fora de um repositório git.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> None:
+    """
+    Roda os benchmarks e salva os resultados em JSON.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks da simulação, inferência e renderização.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[150, 1000, 10000], help="tamanhos de população")
+    parser.add_argument("--passos", type=int, default=200, help="passos por medição da física")
+    parser.add_argument("--repeticoes", type=int, default=5, help="medições por benchmark (usa a mediana)")
+    parser.add_argument("--saida", default="benchmark.json", help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", default=None, help="resultado anterior para comparar")
+    parser.add_argument("--sem-renderizacao", action="store_true", help="pula os benchmarks de desenho")
+    args = parser.parse_args()
+
+    resultados = []
+    def registrar(nome: str, parametros: dict, metricas: dict) -> None:
+        resultados.append({'nome': nome, 'parametros': parametros, 'metricas': metricas})
+        print(f"{nome:<14} {str(parametros):<24} " + "  ".join(f"{k}={v:,.1f}" for k, v in metricas.items()))
+
+    for tamanho in args.tamanhos:
+        registrar('fisica', {'tamanho': tamanho}, bench_fisica(tamanho, args.passos, args.repeticoes))
+        registrar('colisao', {'tamanho': tamanho}, bench_colisao(tamanho, args.repeticoes))
+
+    genomas = genomas_evoluidos(carregar_config(150), geracoes=5, semente=0)
+    for tamanho in args.tamanhos:
+        amostra = [genomas[i % len(genomas)] for i in range(tamanho)]
+        registrar('inferencia', {'tamanho': tamanho}, bench_inferencia(amostra, carregar_config(150), args.repeticoes))
+
+    if not args.sem_renderizacao:
+        for tamanho in args.tamanhos:
+            registrar('renderizacao', {'tamanho': tamanho}, bench_renderizacao(tamanho, 20, args.repeticoes))
+
+    for tamanho in args.tamanhos:
+        registrar('geracao', {'tamanho': tamanho}, bench_geracao(carregar_config(tamanho), args.repeticoes))
+
+    saida = {
+        'commit': versao_git(),
+        'data': strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'resultados': resultados
+    }
+    with open(args.saida, 'w') as arquivo:
+        json.dump(saida, arquivo, indent=2)
+    print(f"Resultados salvos em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            comparar(saida, json.load(arquivo))
+
+if __name__ == '__main__':
+    main()
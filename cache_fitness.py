@@ -0,0 +1,116 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+import neat
+from medicao import MedidorFases
+from constants import *
+
+def assinatura_genoma(genome: neat.DefaultGenome) -> bytes:
+    """
+    Calcula uma assinatura da estrutura de um genoma: nós (vies, resposta, ativação e
+    agregação) e conexões (peso e se está ativa). Genomas com a mesma assinatura jogam
+    exatamente igual, independentemente da chave ou da espécie.
+
+    Args:
+        genome (neat.DefaultGenome): O genoma.
+
+    Returns:
+        bytes: Hash de 16 bytes da estrutura.
+    """
+    nos = tuple(
+        (chave, no.bias, no.response, no.activation, no.aggregation)
+        for chave, no in sorted(genome.nodes.items())
+    )
+    conexoes = tuple(
+        (chave, conexao.weight, conexao.enabled)
+        for chave, conexao in sorted(genome.connections.items())
+    )
+    # O REPR DE UM FLOAT O REPRESENTA EXATAMENTE, ENTAO PESOS DIFERENTES GERAM ASSINATURAS DIFERENTES
+    return hashlib.blake2b(repr((nos, conexoes)).encode(), digest_size=16).digest()
+
+class CacheFitness:
+    def __init__(self, tamanho: int = TAMANHO_CACHE_FITNESS) -> None:
+        """
+        Guarda o fitness de genomas já avaliados em cada percurso, para não simulá-los de novo.
+
+        Como a simulação é determinística e os passaros não interagem, o fitness depende só
+        da estrutura do genoma e da semente do percurso. Isso vale, por exemplo, para os
+        genomas que o elitismo leva sem mudanças para a geração seguinte, que são justamente
+        os que mais demoram para morrer; só há acertos se o percurso se repete (veja
+        --percurso-fixo no neat_ai.py).
+
+        Quando o cache está cheio, o fitness usado há mais tempo é descartado.
+
+        Args:
+            tamanho (int, optional): Quantidade máxima de fitness guardados. Default é
+                TAMANHO_CACHE_FITNESS.
+
+        Returns:
+            None
+        """
+        self.tamanho: int                                           = tamanho
+        self.fitness: OrderedDict[tuple[bytes, Hashable], float]    = OrderedDict()
+        self.acertos: int                                           = 0
+        self.consultas: int                                         = 0
+
+    def avaliar(
+            self,
+            ge:         list[neat.DefaultGenome],
+            semente:    Hashable,
+            avaliar:    Callable[[list[neat.DefaultGenome]], list[float]],
+            consultar:  bool = True,
+            medidor:    Optional[MedidorFases] = None
+    ) -> list[float]:
+        """
+        Retorna o fitness de cada genoma, simulando só os que não estão no cache.
+
+        Args:
+            ge (list[neat.DefaultGenome]): Genomas da geração.
+            semente (Hashable): Semente do percurso da geração (ou qualquer valor que
+                identifique como os genomas são avaliados, como a semente e o limite de passos).
+            avaliar (Callable): Avalia uma lista de genomas no percurso e retorna o fitness
+                de cada um.
+            consultar (bool, optional): Se False, simula todos (por exemplo, para gravar o
+                replay da geração inteira), guardando os resultados. Default é True.
+            medidor (MedidorFases, optional): Recebe a quantidade de acertos em
+                'cache_acertos'. Default é None.
+
+        Returns:
+            list[float]: Fitness de cada genoma, na mesma ordem de ge.
+        """
+        chaves = [(assinatura_genoma(g), semente) for g in ge]
+        resultado: list[Optional[float]] = [None] * len(ge)
+        if consultar:
+            for i, chave in enumerate(chaves):
+                fitness = self.fitness.get(chave)
+                if fitness is not None:
+                    self.fitness.move_to_end(chave)
+                    resultado[i] = fitness
+            acertos = sum(fitness is not None for fitness in resultado)
+            self.consultas += len(ge)
+            self.acertos += acertos
+            if medidor:
+                medidor.contar('cache_acertos', acertos)
+
+        pendentes = [i for i, fitness in enumerate(resultado) if fitness is None]
+        if pendentes:
+            for i, fitness in zip(pendentes, avaliar([ge[i] for i in pendentes])):
+                resultado[i] = fitness
+                self.guardar(chaves[i], fitness)
+        return resultado
+
+    def guardar(self, chave: tuple[bytes, Hashable], fitness: float) -> None:
+        """
+        Guarda um fitness, descartando o mais antigo se o cache estiver cheio.
+
+        Args:
+            chave (tuple[bytes, Hashable]): Assinatura do genoma e semente do percurso.
+            fitness (float): Fitness do genoma no percurso.
+
+        Returns:
+            None
+        """
+        self.fitness[chave] = fitness
+        self.fitness.move_to_end(chave)
+        while len(self.fitness) > self.tamanho:
+            self.fitness.popitem(last=False)
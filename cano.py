@@ -1,5 +1,6 @@
 import pygame as pg
 from pygame import Vector2
+from recursos import redimensionar
 
 class Cano:
     def __init__(
@@ -27,10 +28,11 @@ class Cano:
         """
         self.tela: pg.Surface           = tela
         self.posicao: Vector2           = posicao
-        self.sprite: pg.Surface         = pg.transform.scale(sprite, dimensoes_sprite)
+        self.sprite: pg.Surface         = redimensionar(sprite, dimensoes_sprite)
         self.velocidade: Vector2        = velocidade
         self.dimensoes_sprite: Vector2  = dimensoes_sprite
         self.angulo: int                = angulo
+        self.sprite_rotacionado: pg.Surface = pg.transform.rotate(self.sprite, angulo) if angulo else self.sprite
 
     def movimentar(self, delta_time: float) -> None:
         """
@@ -45,12 +47,11 @@ class Cano:
         self.posicao.x += self.velocidade.x * delta_time
         self.posicao.y += self.velocidade.y * delta_time
 
-    def desenhar(self) -> None:
+    def desenhar(self) -> pg.Rect:
         """
         Desenha o cano na tela.
 
         Returns:
-            None
+            pg.Rect: Região da tela desenhada.
         """
-        sprite_rotacionado = pg.transform.rotate(self.sprite, self.angulo)
-        self.tela.blit(sprite_rotacionado, self.posicao)
+        return self.tela.blit(self.sprite_rotacionado, self.posicao)
@@ -0,0 +1,166 @@
+import os
+import gzip
+import pickle
+import random
+import tempfile
+from glob import glob
+from itertools import count
+from typing import Any, Callable, Optional
+import neat
+from neat.reporting import BaseReporter
+
+VERSAO_CHECKPOINT: int = 1
+
+class CheckpointerAtomico(BaseReporter):
+    def __init__(
+            self,
+            intervalo:      int,
+            pasta:          str = 'checkpoints',
+            prefixo:        str = 'checkpoint-',
+            manter:         int = 3,
+            estado_extra:   Optional[Callable[[], dict]] = None
+    ) -> None:
+        """
+        Reporter do NEAT que salva o treino a cada `intervalo` gerações.
+
+        Cada arquivo guarda a população, as espécies, o número da geração, o estado do
+        gerador aleatório do Python e um estado extra fornecido pelo treino. Os arquivos
+        são escritos num temporário e depois renomeados, então um checkpoint nunca fica
+        pela metade, mesmo se o processo morrer durante a escrita.
+
+        Args:
+            intervalo (int): De quantas em quantas gerações salvar.
+            pasta (str, optional): Pasta dos checkpoints. Default é 'checkpoints'.
+            prefixo (str, optional): Prefixo do nome dos arquivos. Default é 'checkpoint-'.
+            manter (int, optional): Quantos checkpoints mais recentes manter (0 mantém todos).
+                Default é 3.
+            estado_extra (Callable, optional): Função que retorna o estado extra a salvar.
+                Default é None.
+
+        Returns:
+            None
+        """
+        self.intervalo: int         = intervalo
+        self.pasta: str             = pasta
+        self.prefixo: str           = prefixo
+        self.manter: int            = manter
+        self.estado_extra           = estado_extra or dict
+        self.geracao_atual: int     = 0
+        self.estado_inicio: Optional[tuple[Any, dict]] = None
+
+    def start_generation(self, generation: int) -> None:
+        self.geracao_atual = generation
+        # ESTADO NO INICIO DA GERACAO, USADO SE O TREINO FOR INTERROMPIDO ANTES DE ELA TERMINAR
+        self.estado_inicio = (random.getstate(), self.estado_extra())
+
+    def end_generation(self, config, population, species_set) -> None:
+        proxima_geracao = self.geracao_atual + 1
+        if self.intervalo and proxima_geracao % self.intervalo == 0:
+            self.salvar(config, population, species_set, proxima_geracao, random.getstate(), self.estado_extra())
+
+    def salvar_interrupcao(self, populacao: neat.Population) -> Optional[str]:
+        """
+        Salva a geração em andamento de um treino interrompido, com o estado do seu início.
+
+        Args:
+            populacao (neat.Population): População do treino.
+
+        Returns:
+            str: Caminho do checkpoint, ou None se nenhuma geração chegou a começar.
+        """
+        if self.estado_inicio is None:
+            return None
+        estado_random, estado_extra = self.estado_inicio
+        return self.salvar(
+            populacao.config,
+            populacao.population,
+            populacao.species,
+            populacao.generation,
+            estado_random,
+            estado_extra
+        )
+
+    def salvar(
+            self,
+            config:         neat.Config,
+            population:     dict,
+            species_set:    neat.DefaultSpeciesSet,
+            geracao:        int,
+            estado_random:  Any,
+            estado_extra:   dict
+    ) -> str:
+        """
+        Escreve um checkpoint de forma atômica.
+
+        Args:
+            config (neat.Config): Configuração do NEAT.
+            population (dict): Genomas da população, por chave.
+            species_set (neat.DefaultSpeciesSet): Espécies.
+            geracao (int): Geração que a população vai iniciar ao ser retomada.
+            estado_random (Any): Estado do módulo random.
+            estado_extra (dict): Estado extra do treino.
+
+        Returns:
+            str: Caminho do checkpoint.
+        """
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = os.path.join(self.pasta, f'{self.prefixo}{geracao:05d}.pkl.gz')
+        dados = {
+            'versao': VERSAO_CHECKPOINT,
+            'geracao': geracao,
+            'config': config,
+            'populacao': population,
+            'especies': species_set,
+            'estado_random': estado_random,
+            'estado_extra': estado_extra
+        }
+
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta, prefix='.tmp-')
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                with gzip.GzipFile(fileobj=arquivo, mode='wb', compresslevel=5) as compactado:
+                    pickle.dump(dados, compactado, protocol=pickle.HIGHEST_PROTOCOL)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, caminho)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+        print(f"Checkpoint salvo em {caminho}")
+        self.remover_antigos()
+        return caminho
+
+    def remover_antigos(self) -> None:
+        """
+        Apaga os checkpoints mais antigos, mantendo só os `manter` mais recentes.
+
+        Returns:
+            None
+        """
+        if not self.manter:
+            return
+        checkpoints = sorted(glob(os.path.join(self.pasta, f'{self.prefixo}*.pkl.gz')))
+        for caminho in checkpoints[:-self.manter]:
+            os.remove(caminho)
+
+def restaurar_checkpoint(caminho: str) -> tuple[neat.Population, dict]:
+    """
+    Recria a população de um checkpoint e restaura o estado do módulo random.
+
+    Args:
+        caminho (str): Caminho do checkpoint.
+
+    Returns:
+        tuple[neat.Population, dict]: A população e o estado extra salvo junto com ela.
+    """
+    with gzip.open(caminho, 'rb') as arquivo:
+        dados = pickle.load(arquivo)
+    if dados.get('versao') != VERSAO_CHECKPOINT:
+        raise ValueError(f"Versão de checkpoint não suportada: {dados.get('versao')}")
+
+    random.setstate(dados['estado_random'])
+    populacao = neat.Population(dados['config'], (dados['populacao'], dados['especies'], dados['geracao']))
+    # O NEAT RECOMECA A NUMERACAO DOS GENOMAS EM 1; CONTINUA DE ONDE O TREINO PAROU PARA NAO REPETIR CHAVES
+    populacao.reproduction.genome_indexer = count(max(dados['populacao']) + 1)
+    return populacao, dados['estado_extra']
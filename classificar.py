@@ -0,0 +1,92 @@
+import random
+import argparse
+from time import perf_counter
+from typing import Optional, Sequence
+from constants import *
+from rede_compilada import RedeCompilada
+from neat_ai import REDUCOES, avaliar_redes_percursos, calcular_fitness, reduzir_fitness
+
+def sortear_sementes(semente: int, quantidade: int) -> list[int]:
+    """
+    Sorteia as sementes dos percursos de uma classificação; a mesma semente gera sempre os
+    mesmos percursos, então classificações diferentes podem ser comparadas.
+
+    Args:
+        semente (int): Semente do sorteio.
+        quantidade (int): Quantidade de percursos.
+
+    Returns:
+        list[int]: Sementes dos percursos.
+    """
+    rng = random.Random(semente)
+    return [rng.randrange(2**32) for _ in range(quantidade)]
+
+def classificar(
+        caminhos:       Sequence[str],
+        sementes:       Sequence[int],
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO,
+        reducao:        str = REDUCAO_FITNESS
+) -> list[dict]:
+    """
+    Avalia campeões exportados pelo treino (.npz) nos mesmos percursos, todos ao mesmo
+    tempo, e os ordena do mais robusto para o menos robusto.
+
+    Args:
+        caminhos (Sequence[str]): Arquivos .npz dos campeões.
+        sementes (Sequence[int]): Sementes dos percursos.
+        passos_maximos (int, optional): Limite de passos de cada episódio (None para sem
+            limite). Default é PASSOS_MAXIMOS_EPISODIO.
+        reducao (str, optional): Como os fitness dos percursos viram um só (veja
+            neat_ai.reduzir_fitness). Default é REDUCAO_FITNESS.
+
+    Returns:
+        list[dict]: Para cada campeão, do melhor para o pior: o arquivo, o fitness reduzido,
+            a média, o mínimo, o máximo e em quantos percursos chegou ao limite de passos.
+    """
+    redes = [RedeCompilada.carregar(caminho) for caminho in caminhos]
+    fitness = avaliar_redes_percursos(redes, sementes, passos_maximos)
+    reduzido = reduzir_fitness(fitness, reducao)
+    limite = None if passos_maximos is None else calcular_fitness(passos_maximos, morreu=False)
+
+    resultados = [
+        {
+            'arquivo': caminho,
+            'fitness': float(reduzido[i]),
+            'media': float(fitness[i].mean()),
+            'minimo': float(fitness[i].min()),
+            'maximo': float(fitness[i].max()),
+            'no_limite': 0 if limite is None else int((fitness[i] >= limite).sum())
+        }
+        for i, caminho in enumerate(caminhos)
+    ]
+    return sorted(resultados, key=lambda resultado: -resultado['fitness'])
+
+def main() -> None:
+    """
+    Classifica, sem janela, os campeões informados pela robustez em vários percursos.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Classifica campeões do Flappy Bird em vários percursos.")
+    parser.add_argument("arquivos", nargs="+", help="campeões exportados pelo treino (.npz)")
+    parser.add_argument("--percursos", type=int, default=PERCURSOS_CLASSIFICACAO, metavar="K", help="quantidade de percursos")
+    parser.add_argument("--semente", type=int, default=0, help="semente do sorteio dos percursos")
+    parser.add_argument("--passos-maximos", type=int, default=PASSOS_MAXIMOS_EPISODIO, metavar="N", help="limite de passos de cada episódio (0 para sem limite)")
+    parser.add_argument("--reducao", choices=REDUCOES, default=REDUCAO_FITNESS, help=f"como os fitness dos percursos viram um só ('quantil' usa o quantil {QUANTIL_FITNESS})")
+    args = parser.parse_args()
+
+    inicio = perf_counter()
+    resultados = classificar(
+        args.arquivos, sortear_sementes(args.semente, args.percursos), args.passos_maximos or None, args.reducao
+    )
+    print(f"{len(args.arquivos)} campeões em {args.percursos} percursos ({perf_counter() - inicio:.1f} s):")
+    for posicao, resultado in enumerate(resultados, start=1):
+        print(
+            f"{posicao:>3}. {resultado['arquivo']}: {args.reducao} {resultado['fitness']:.0f} "
+            f"(média {resultado['media']:.0f}, mínimo {resultado['minimo']:.0f}, máximo {resultado['maximo']:.0f}, "
+            f"no limite em {resultado['no_limite']} de {args.percursos})"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-from pygame import Vector2, Rect
+from pygame import Vector2, Rect, K_t
 
 # --------------------- CONSTANTES PYGAME ---------------------
 
@@ -56,3 +56,32 @@ HITBOX_PASSARO = Rect(
     DIMENSOES_PASSARO.x,
     DIMENSOES_PASSARO.y
 )
+
+# --------------------- CONSTANTES DA SIMULACAO ---------------------
+
+PASSO_SIMULACAO: float  = 1 / FRAMERATE # DURACAO FIXA (EM SEGUNDOS) DE CADA PASSO DA SIMULACAO
+ACUMULO_MAXIMO: float   = 0.25 # ATRASO MAXIMO (EM SEGUNDOS) QUE O JOGO TENTA RECUPERAR DE UMA VEZ
+TEMPO_REINICIO: float   = 3 # TEMPO (EM SEGUNDOS) ATE O JOGO REINICIAR APOS A MORTE
+
+# --------------------- CONSTANTES DO NEAT ---------------------
+
+FITNESS_POR_PASSO: int  = 10 # FITNESS GANHO A CADA PASSO QUE O PASSARO SOBREVIVE
+PENALIDADE_MORTE: int   = 50 # FITNESS PERDIDO QUANDO O PASSARO MORRE
+LIMIAR_PULO: float      = 0.5 # SAIDA DA REDE ACIMA DA QUAL O PASSARO PULA
+GERACOES_TREINO: int    = 30 # QUANTIDADE DE GERACOES DO TREINO
+PASSOS_MAXIMOS_EPISODIO: int = 120 * FRAMERATE # LIMITE DE PASSOS DE CADA PASSARO NO TREINO (2 MINUTOS DE JOGO)
+# ETAPAS DA AVALIACAO EM ETAPAS: (FRACAO DE PASSOS_MAXIMOS_EPISODIO, QUANTIDADE DE PERCURSOS)
+ETAPAS_AVALIACAO: tuple[tuple[float, int], ...] = ((0.1, 1), (0.3, 2), (1.0, 3))
+FRACAO_PROMOVIDA: float = 1 / 3 # FRACAO DOS GENOMAS DE UMA ETAPA QUE PASSA PARA A SEGUINTE
+PERCURSOS_AVALIACAO: int = 5 # PERCURSOS DE CADA GENOMA NA AVALIACAO EM VARIOS PERCURSOS (--percursos)
+PERCURSOS_CLASSIFICACAO: int = 50 # PERCURSOS DE CADA CAMPEAO NA CLASSIFICACAO (classificar.py)
+REDUCAO_FITNESS: str    = 'media' # COMO OS FITNESS DOS PERCURSOS VIRAM UM SO: 'media', 'minimo' OU 'quantil'
+QUANTIL_FITNESS: float  = 0.25 # QUANTIL USADO PELA REDUCAO 'quantil'
+CUSTO_PASSO_MUNDOS: int  = 16 # UM PASSO DA SimulacaoMundos CUSTA TANTO QUANTO ESTES PASSOS DE UM PASSARO NA Simulacao
+TECLA_TURBO: int        = K_t # ALTERNA O TREINO ENTRE TEMPO REAL E SEM LIMITE DE FRAMERATE
+PASSOS_ENTRE_EVENTOS: int = 50 # PASSOS SIMULADOS ENTRE DUAS LEITURAS DE EVENTOS QUANDO A GERACAO NAO E DESENHADA
+INTERVALO_PREVIA: float = 0.5 # SEGUNDOS ENTRE DOIS QUADROS DE PREVIA QUANDO A GERACAO NAO E DESENHADA
+TAMANHO_CACHE_FITNESS: int = 4096 # QUANTIDADE MAXIMA DE FITNESS GUARDADOS PELO CACHE DE GENOMAS JA AVALIADOS
+QUANTIDADE_ILHAS: int   = 4 # POPULACOES INDEPENDENTES DO MODELO DE ILHAS (ilhas.py), UMA POR PROCESSO
+INTERVALO_MIGRACAO: int = 5 # GERACOES ENTRE DUAS MIGRACOES ENTRE ILHAS
+QUANTIDADE_MIGRANTES: int = 2 # MELHORES GENOMAS QUE CADA ILHA ENVIA PARA A SEGUINTE A CADA MIGRACAO
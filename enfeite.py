@@ -1,6 +1,7 @@
 import pygame as pg
 from constants import *
 from pygame import Vector2
+from recursos import redimensionar
 
 class Enfeite:
     def __init__(
@@ -26,7 +27,7 @@ class Enfeite:
         """
         self.tela: pg.Surface           = tela
         self.posicao: Vector2           = posicao
-        self.sprite: pg.Surface         = pg.transform.scale(sprite, dimensoes_sprite)
+        self.sprite: pg.Surface         = redimensionar(sprite, dimensoes_sprite)
         self.velocidade: pg.Surface     = velocidade
         self.dimensoes_sprite: Vector2  = dimensoes_sprite
     
@@ -0,0 +1,270 @@
+import os
+import zlib
+import queue
+import struct
+import argparse
+import threading
+import numpy as np
+import pygame as pg
+from time import perf_counter
+from typing import Any, Optional
+from constants import *
+from flappy import FlappyBird
+from rede_compilada import RedeCompilada
+from replay import Replay, GravadorReplay
+from simulacao_vetorizada import SimulacaoVetorizada
+
+try:
+    from PIL import Image
+except ImportError: # O PILLOW E OPCIONAL: SO E NECESSARIO PARA EXPORTAR GIF
+    Image = None
+
+TAMANHO_FILA: int       = 32 # QUADROS QUE PODEM ESPERAR PELOS ESCRITORES ANTES DE O DESENHO PARAR
+NIVEL_COMPRESSAO: int   = 3 # NIVEL DO ZLIB DOS PNGS: QUASE O TAMANHO DO NIVEL PADRAO, EM METADE DO TEMPO
+
+def codificar_png(dados: bytes, tamanho: tuple[int, int], nivel: int = NIVEL_COMPRESSAO) -> bytes:
+    """
+    Codifica pixels RGB num PNG, só com zlib e NumPy.
+
+    O zlib libera o GIL enquanto comprime, então vários escritores comprimem em paralelo.
+
+    Args:
+        dados (bytes): Pixels em RGB, linha a linha.
+        tamanho (tuple[int, int]): Largura e altura da imagem.
+        nivel (int, optional): Nível de compressão do zlib. Default é NIVEL_COMPRESSAO.
+
+    Returns:
+        bytes: O arquivo PNG.
+    """
+    largura, altura = tamanho
+    linhas = np.frombuffer(dados, dtype=np.uint8).reshape(altura, largura * 3)
+    # CADA LINHA DO PNG COMECA COM O TIPO DE FILTRO (0 = NENHUM)
+    filtradas = np.concatenate((np.zeros((altura, 1), dtype=np.uint8), linhas), axis=1)
+
+    def bloco(tipo: bytes, conteudo: bytes) -> bytes:
+        return struct.pack('>I', len(conteudo)) + tipo + conteudo + struct.pack('>I', zlib.crc32(tipo + conteudo))
+
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        bloco(b'IHDR', struct.pack('>IIBBBBB', largura, altura, 8, 2, 0, 0, 0)),
+        bloco(b'IDAT', zlib.compress(filtradas.tobytes(), nivel)),
+        bloco(b'IEND', b'')
+    ))
+
+class EscritorQuadros:
+    def __init__(
+            self,
+            destino:        str,
+            fps:            int,
+            escritores:     int = 1,
+            tamanho_fila:   int = TAMANHO_FILA
+    ) -> None:
+        """
+        Grava, em threads de fundo, os quadros desenhados enquanto os próximos são desenhados.
+
+        Os quadros chegam como bytes RGB por uma fila limitada, então a memória usada não
+        cresce se a gravação for mais lenta que o desenho. Se o destino termina em .gif, os
+        quadros são reduzidos a uma paleta nas threads e o GIF é escrito no fim (requer o
+        Pillow); senão, o destino é uma pasta e cada quadro vira um PNG.
+
+        Args:
+            destino (str): Arquivo .gif ou pasta dos quadros.
+            fps (int): Quadros por segundo do vídeo.
+            escritores (int, optional): Quantidade de threads que gravam. Default é 1.
+            tamanho_fila (int, optional): Tamanho máximo da fila. Default é TAMANHO_FILA.
+
+        Returns:
+            None
+        """
+        self.destino: str               = destino
+        self.fps: int                   = fps
+        self.gif: bool                  = destino.lower().endswith('.gif')
+        self.fila: queue.Queue          = queue.Queue(maxsize=tamanho_fila)
+        self.quadros: dict[int, Any]    = {}
+        self.quantidade: int            = 0
+        self.erro: Optional[BaseException] = None
+
+        if self.gif and Image is None:
+            raise RuntimeError("Exportar GIF requer o Pillow (pip install pillow); informe uma pasta para exportar os quadros em PNG.")
+        if not self.gif:
+            os.makedirs(destino, exist_ok=True)
+
+        self.threads: list[threading.Thread] = [
+            threading.Thread(target=self.trabalhar, daemon=True) for _ in range(max(1, escritores))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def adicionar(self, dados: bytes, tamanho: tuple[int, int]) -> None:
+        """
+        Envia um quadro para a gravação, esperando se a fila estiver cheia.
+
+        Args:
+            dados (bytes): Pixels do quadro em RGB.
+            tamanho (tuple[int, int]): Largura e altura do quadro.
+
+        Returns:
+            None
+        """
+        if self.erro:
+            raise self.erro
+        self.fila.put((self.quantidade, dados, tamanho))
+        self.quantidade += 1
+
+    def fechar(self) -> None:
+        """
+        Espera os quadros pendentes serem gravados e finaliza o arquivo.
+
+        Returns:
+            None
+        """
+        for _ in self.threads:
+            self.fila.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.erro:
+            raise self.erro
+
+        if self.gif and self.quadros:
+            quadros = [self.quadros[indice] for indice in sorted(self.quadros)]
+            quadros[0].save(
+                self.destino,
+                save_all=True,
+                append_images=quadros[1:],
+                duration=round(1000 / self.fps),
+                loop=0
+            )
+
+    def trabalhar(self) -> None:
+        """
+        Laço de cada thread: grava os quadros da fila até receber None.
+
+        Returns:
+            None
+        """
+        while (item := self.fila.get()) is not None:
+            if self.erro:
+                continue # CONTINUA ESVAZIANDO A FILA PARA QUE QUEM DESENHA NAO FIQUE BLOQUEADO
+            try:
+                self.gravar(*item)
+            except BaseException as erro:
+                self.erro = erro
+
+    def gravar(self, indice: int, dados: bytes, tamanho: tuple[int, int]) -> None:
+        """
+        Grava um quadro.
+
+        Args:
+            indice (int): Posição do quadro no vídeo.
+            dados (bytes): Pixels do quadro em RGB.
+            tamanho (tuple[int, int]): Largura e altura do quadro.
+
+        Returns:
+            None
+        """
+        if self.gif:
+            self.quadros[indice] = Image.frombytes('RGB', tamanho, dados).quantize()
+            return
+        with open(os.path.join(self.destino, f'quadro-{indice:05d}.png'), 'wb') as arquivo:
+            arquivo.write(codificar_png(dados, tamanho))
+
+def replay_campeao(rede: RedeCompilada, semente: Optional[int] = None, passos_maximos: int = 60 * FRAMERATE) -> Replay:
+    """
+    Joga uma partida com o campeão, sem janela, e a devolve como replay.
+
+    Args:
+        rede (RedeCompilada): Rede do campeão.
+        semente (int, optional): Semente do percurso. Default é None (aleatória).
+        passos_maximos (int, optional): Limite de passos, para campeões que não morrem.
+            Default é 60 segundos de jogo.
+
+    Returns:
+        Replay: A partida jogada.
+    """
+    simulacao = SimulacaoVetorizada(quantidade_passaros=1, semente=semente)
+    gravador = GravadorReplay(1, simulacao.gerador.semente)
+    while simulacao.quantidade_vivos > 0 and simulacao.passos < passos_maximos:
+        acoes = [rede.ativar(simulacao.observacao(0))[0] > LIMIAR_PULO]
+        gravador.registrar(acoes, simulacao.vivo)
+        simulacao.step(acoes)
+    return gravador.finalizar(simulacao.gerador.aberturas, simulacao.passos_vivo, simulacao.vivo)
+
+def exportar(
+        replay:     Replay,
+        destino:    str,
+        fps:        int = 30,
+        segundos:   Optional[float] = None,
+        escritores: int = max(1, (os.cpu_count() or 1) - 1)
+) -> int:
+    """
+    Desenha um replay fora da tela, o mais rápido possível, e grava os quadros em segundo plano.
+
+    Args:
+        replay (Replay): Replay a exportar.
+        destino (str): Arquivo .gif ou pasta dos quadros em PNG.
+        fps (int, optional): Quadros por segundo do vídeo (no máximo FRAMERATE). Default é 30.
+        segundos (float, optional): Duração máxima do vídeo. Default é None (o replay inteiro).
+        escritores (int, optional): Threads que codificam os quadros. Default é um a menos
+            que a quantidade de núcleos.
+
+    Returns:
+        int: Quantidade de quadros exportados.
+    """
+    passos_por_quadro = max(1, round(FRAMERATE / fps))
+    passos_maximos = None if segundos is None else int(segundos * FRAMERATE)
+    delta_time = passos_por_quadro * PASSO_SIMULACAO
+
+    jogo = FlappyBird(criar_passaro=False, headless=True)
+    passaros = jogo.instanciar_populacao(len(replay.pulos))
+    escritor = EscritorQuadros(destino, FRAMERATE // passos_por_quadro, escritores)
+
+    passo = 0
+    def desenhar(simulacao: SimulacaoVetorizada) -> bool:
+        nonlocal passo
+        passo += 1
+        if passos_maximos is not None and passo > passos_maximos:
+            return False
+        if passo % passos_por_quadro:
+            return True
+
+        jogo.desenhar_populacao(passaros, simulacao, delta_time)
+        jogo.escrever_texto(simulacao.pontuacao, x=LARGURA_TELA // 2, y=100, tamanho=70)
+        escritor.adicionar(pg.image.tobytes(jogo.tela, 'RGB'), jogo.tela.get_size())
+        return True
+
+    try:
+        replay.simular(desenhar)
+    finally:
+        escritor.fechar()
+        pg.quit()
+    return escritor.quantidade
+
+def main() -> None:
+    """
+    Exporta um replay ou uma partida do campeão para GIF ou quadros em PNG.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Exporta um replay (.fbr) ou um campeão (.npz) para GIF ou PNGs.")
+    parser.add_argument("entrada", help="arquivo .fbr (replay) ou .npz (campeão)")
+    parser.add_argument("destino", help="arquivo .gif (requer o Pillow) ou pasta para os quadros em PNG")
+    parser.add_argument("--fps", type=int, default=30, help="quadros por segundo do vídeo")
+    parser.add_argument("--segundos", type=float, default=None, help="duração máxima do vídeo")
+    parser.add_argument("--semente", type=int, default=None, help="semente do percurso jogado pelo campeão")
+    args = parser.parse_args()
+
+    if args.entrada.endswith('.npz'):
+        passos_maximos = int((args.segundos or 60) * FRAMERATE)
+        replay = replay_campeao(RedeCompilada.carregar(args.entrada), args.semente, passos_maximos)
+    else:
+        replay = Replay.carregar(args.entrada)
+
+    inicio = perf_counter()
+    quadros = exportar(replay, args.destino, args.fps, args.segundos)
+    duracao = perf_counter() - inicio
+    fps = FRAMERATE // max(1, round(FRAMERATE / args.fps))
+    print(f"{quadros} quadros ({quadros / fps:.1f} s de vídeo) exportados para {args.destino} em {duracao:.1f} s")
+
+if __name__ == '__main__':
+    main()
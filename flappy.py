@@ -1,22 +1,35 @@
+import os
 import pygame as pg
 from pygame import Vector2
-from pygame.font import Font
 from constants import *
 from cano import Cano
 from passaro import Passaro
 from enfeite import Enfeite
-from os.path import join
-from time import time
-from random import randint
+from simulacao import Simulacao
+from rede_compilada import RedeCompilada
+from replay import Replay, GravadorReplay
+from medicao import MedidorFases
+from renderizador import Renderizador
+from recursos import carregar_sprite, renderizar_texto, precarregar, limpar
+from time import time, strftime, perf_counter
 from typing import Optional, Any
 
 class FlappyBird:
     def __init__(
             self,
             criar_passaro: Optional[bool]=True,
-            configuracoes_iniciais: Optional[bool]=True
+            configuracoes_iniciais: Optional[bool]=True,
+            headless: Optional[bool]=False,
+            piloto: Optional[RedeCompilada]=None,
+            pasta_replay: Optional[str]=None,
+            perfilador: Optional[MedidorFases]=None
     ) -> None:
         self.criar_passaro: bool = criar_passaro
+        self.headless: bool = headless
+        self.piloto: Optional[RedeCompilada] = piloto # REDE QUE JOGA NO LUGAR DO JOGADOR
+        self.pasta_replay: Optional[str] = pasta_replay # PASTA ONDE CADA PARTIDA E GRAVADA
+        self.gravador: Optional[GravadorReplay] = None
+        self.perfilador: Optional[MedidorFases] = perfilador # MEDE CADA FASE DE CADA QUADRO (veja perfil.py)
         self.flag = False
 
         if configuracoes_iniciais:
@@ -33,6 +46,9 @@ class FlappyBird:
             None
         """
         # JANELA
+        if self.headless:
+            # SEM JANELA: O DRIVER DUMMY AINDA PERMITE CRIAR SUPERFICIES E CONVERTER SPRITES
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pg.init()
         pg.display.set_caption('Flappy Bird')
         self.tela: pg.Surface = pg.display.set_mode((LARGURA_TELA, ALTURA_TELA))
@@ -40,11 +56,17 @@ class FlappyBird:
 
         # ATT JOGO
         self.passaro_morto: bool    = False
-        self.tempo_inicial: int     = 0
-        self.pontuacao: int         = 0
+        self.tempo_inicial: float   = 0
+        self.pulo_pendente: bool    = False
+        self.simulacao: Simulacao   = Simulacao(quantidade_passaros=1 if criar_passaro else 0)
+        self.iniciar_gravacao()
 
         # METODOS JOGO
+        precarregar()
         self.instanciar_enfeites()
+        self.renderizador: Renderizador = Renderizador(
+            self.tela, self.fundo, [self.nuvens, self.predios, self.arvores], self.chaos
+        )
         self.instanciar_canos()
         self.atualizar_icone()
         if criar_passaro:
@@ -52,9 +74,6 @@ class FlappyBird:
             self.teclas_permitidas = [pg.K_UP, pg.K_SPACE]
         else:
             self.passaro = None
-        
-        if QUANTIDADE_CANO > 0:
-            self.idx_cano_atual = 0
 
     def atualizar_icone(self) -> None:
         """
@@ -63,7 +82,7 @@ class FlappyBird:
         Returns:
             None
         """
-        icone = pg.image.load(join("img", 'flap1.png')).convert_alpha()
+        icone = carregar_sprite('flap1.png')
         pg.display.set_icon(icone)
     
     def escrever_texto(
@@ -71,7 +90,8 @@ class FlappyBird:
             info:       Any,
             x:          int,
             y:          int,
-            tamanho:    int = 30
+            tamanho:    int = 30,
+            cor:        tuple[int, int, int] = (255, 255, 255)
     ) -> None:
         """
         Escreve um texto na tela.
@@ -80,33 +100,23 @@ class FlappyBird:
             info (str): Texto que será escrito na tela.
             x (int): Coordenada X do texto.
             y (int): Coordenada Y do texto.
+            tamanho (int, optional): Tamanho da fonte. Default é 30.
+            cor (tuple[int, int, int], optional): Cor do texto. Default é branco.
         Returns:
             None
         """
-        fonte: Font = Font(join("font", 'flappy_bird.ttf'), tamanho)
-        superficie_texto: pg.Surface = fonte.render(str(info), True, (255, 255, 255))
+        superficie_texto: pg.Surface = renderizar_texto(str(info), tamanho, cor)
         retangulo_texto: pg.Rect = superficie_texto.get_rect(center=(x, y))
-        self.tela.blit(superficie_texto, retangulo_texto)
+        self.renderizador.registrar(self.tela.blit(superficie_texto, retangulo_texto))
 
     def atualizar_placar(self) -> None:
         """
-        Atualiza e desenha o placar do jogo.
+        Desenha o placar do jogo.
 
         Returns:
             None
         """
-        if self.idx_cano_atual == QUANTIDADE_CANO:
-            self.idx_cano_atual = 0
-
-        cano_atual: Cano = self.canos_sup[self.idx_cano_atual]
-        x_cano_atual = cano_atual.posicao.x
-        x_passaro = self.passaro.posicao.x
-
-        passou_do_cano: bool = x_passaro > x_cano_atual + DIMENSOES_CANO.x
-        if passou_do_cano:
-            self.pontuacao += 1
-            self.idx_cano_atual += 1
-        self.escrever_texto(self.pontuacao, x=LARGURA_TELA // 2, y=100, tamanho=70)
+        self.escrever_texto(self.simulacao.pontuacao, x=LARGURA_TELA // 2, y=100, tamanho=70)
 
     def instanciar_enfeites(self) -> None:
         """
@@ -115,17 +125,11 @@ class FlappyBird:
         Returns:
             None
         """
-        caminho_sprite_fundo        = join("img", 'fundo.png')
-        caminho_sprite_chao         = join("img", 'chao.png')
-        caminho_sprite_nuvem        = join("img", 'nuvens.png')
-        caminho_sprite_predio       = join("img", 'predios.png')
-        caminho_sprite_arvore       = join("img", 'arvores.png')
-
-        sprite_fundo: pg.Surface    = pg.image.load(caminho_sprite_fundo).convert_alpha()
-        sprite_chao: pg.Surface     = pg.image.load(caminho_sprite_chao).convert_alpha()
-        sprite_nuvem: pg.Surface    = pg.image.load(caminho_sprite_nuvem).convert_alpha()
-        sprite_predio: pg.Surface   = pg.image.load(caminho_sprite_predio).convert_alpha()
-        sprite_arvore: pg.Surface   = pg.image.load(caminho_sprite_arvore).convert_alpha()
+        sprite_fundo: pg.Surface    = carregar_sprite('fundo.png', Vector2(LARGURA_TELA, ALTURA_TELA))
+        sprite_chao: pg.Surface     = carregar_sprite('chao.png', DIMENSOES_CHAO)
+        sprite_nuvem: pg.Surface    = carregar_sprite('nuvens.png', DIMENSOES_NUVEM)
+        sprite_predio: pg.Surface   = carregar_sprite('predios.png', DIMENSOES_PREDIO)
+        sprite_arvore: pg.Surface   = carregar_sprite('arvores.png', DIMENSOES_ARVORE)
 
         self.fundo: Enfeite = Enfeite(
             tela=self.tela,
@@ -193,15 +197,27 @@ class FlappyBird:
         self.passaro: Passaro = Passaro(
             tela=self.tela,
             posicao=POSICAO_INICIAL_PASSARO.copy(),
-            dimensoes_sprite=DIMENSOES_PASSARO.copy(),
-            hitbox=pg.Rect(
-                POSICAO_INICIAL_PASSARO.x,
-                POSICAO_INICIAL_PASSARO.y,
-                DIMENSOES_PASSARO.x,
-                DIMENSOES_PASSARO.y
-            )
+            dimensoes_sprite=DIMENSOES_PASSARO.copy()
         )
 
+    def instanciar_populacao(self, quantidade: int) -> list[Passaro]:
+        """
+        Cria os sprites de uma população de passaros, usados para desenhar uma simulação vetorizada.
+
+        Args:
+            quantidade (int): Quantidade de passaros.
+        Returns:
+            list[Passaro]: Os sprites dos passaros.
+        """
+        return [
+            Passaro(
+                tela=self.tela,
+                posicao=POSICAO_INICIAL_PASSARO.copy(),
+                dimensoes_sprite=DIMENSOES_PASSARO.copy()
+            )
+            for _ in range(quantidade)
+        ]
+
     def instanciar_canos(self) -> None:
         """
         Cria os canos do jogo.
@@ -209,28 +225,16 @@ class FlappyBird:
         Returns:
             None
         """
-        caminho_sprite_cano = join('img', 'cano.png')
-        sprite_cano         = pg.image.load(caminho_sprite_cano).convert_alpha()
+        sprite_cano: pg.Surface = carregar_sprite('cano.png', DIMENSOES_CANO)
 
         self.canos_sup: list[Cano] = []
         self.canos_inf: list[Cano] = []
 
-        for cano in range(QUANTIDADE_CANO):
-            x_cano_sup = LARGURA_TELA + DIMENSOES_CANO.x * (cano + 1) + DISTANCIA_ENTRE_CANOS * (cano + 1)
-            x_cano_inf = LARGURA_TELA + DIMENSOES_CANO.x * (cano + 1) + DISTANCIA_ENTRE_CANOS * (cano + 1)
-
-            rng = randint(
-                int((ALTURA_TELA - DIMENSOES_CHAO.y) // 2 - CONSTANTE_RNG),
-                int((ALTURA_TELA - DIMENSOES_CHAO.y) // 2  + CONSTANTE_RNG)
-            )
-
-            y_cano_sup = rng - DIMENSOES_CANO.y - ABERTURA_CANO
-            y_cano_inf = rng + ABERTURA_CANO
-
+        for _ in range(QUANTIDADE_CANO):
             self.canos_sup.append(Cano(
                 tela=self.tela,
                 sprite=sprite_cano,
-                posicao=Vector2(x_cano_sup, y_cano_sup),
+                posicao=Vector2(0, 0),
                 velocidade=VELOCIDADE_CANO.copy(),
                 dimensoes_sprite=DIMENSOES_CANO.copy(),
                 angulo=0
@@ -239,11 +243,12 @@ class FlappyBird:
             self.canos_inf.append(Cano(
                 tela=self.tela,
                 sprite=sprite_cano,
-                posicao=Vector2(x_cano_inf, y_cano_inf),
+                posicao=Vector2(0, 0),
                 velocidade=VELOCIDADE_CANO.copy(),
                 dimensoes_sprite=DIMENSOES_CANO.copy(),
                 angulo=180
             ))
+        self.sincronizar_canos(self.simulacao.posicoes_canos())
 
     def resetar_enfeites(self) -> None:
         """
@@ -268,93 +273,31 @@ class FlappyBird:
             if nuvem.posicao.x + DIMENSOES_NUVEM.x < 0:
                 nuvem.posicao.x += (QUANTIDADE_NUVEM - 1) * DIMENSOES_NUVEM.x
 
-    def resetar_canos(self) -> None:
-        """
-        Reseta o cano do jogo quando ele ultrapassa o lado esquerdo da tela.
-
-        Returns:
-            None
-        """
-        offset_cano = QUANTIDADE_CANO * DIMENSOES_CANO.x + DISTANCIA_ENTRE_CANOS * QUANTIDADE_CANO
-        for cano in range(QUANTIDADE_CANO):
-            if self.canos_sup[cano].posicao.x + DIMENSOES_CANO.x < 0:
-                self.canos_sup[cano].posicao.x += offset_cano
-                self.canos_inf[cano].posicao.x += offset_cano
-                rng = randint(
-                    int((ALTURA_TELA - DIMENSOES_CHAO.y) // 2 - CONSTANTE_RNG),
-                    int((ALTURA_TELA - DIMENSOES_CHAO.y) // 2  + CONSTANTE_RNG)
-                )
-
-                novo_y_cano_sup = 0 - DIMENSOES_CANO.y + rng - ABERTURA_CANO
-                novo_y_cano_inf = rng + ABERTURA_CANO
-
-                self.canos_sup[cano].posicao.y = novo_y_cano_sup
-                self.canos_inf[cano].posicao.y = novo_y_cano_inf
-
-    def verificar_colisao_canos(self, passaro: Passaro) -> bool:
+    def sincronizar_canos(self, posicoes: list[tuple[float, int]]) -> None:
         """
-        Verifica se o passaro colidiu com o cano.
+        Posiciona os sprites dos canos de acordo com o estado da simulação.
 
         Args:
-            passaro (Passaro): O passaro a ser verificado.
+            posicoes (list[tuple[float, int]]): Posição horizontal e centro da abertura de cada par.
         Returns:
-            bool: True se houver colisão, False caso contrário.
-        """
-        for cano in range(QUANTIDADE_CANO):
-            # x_passaro = passaro.posicao.x
-            # y_passaro = passaro.posicao.y
-            x_cano_inf = self.canos_inf[cano].posicao.x
-            y_cano_inf = self.canos_inf[cano].posicao.y
-            rect_cano_inf = self.canos_inf[cano].sprite.get_rect(topleft=(x_cano_inf, y_cano_inf))
-
-            x_cano = self.canos_sup[cano].posicao.x
-            y_cano = self.canos_sup[cano].posicao.y
-            rect_cano_sup = self.canos_sup[cano].sprite.get_rect(topleft=(x_cano, y_cano))
-
-            # try:
-            #     rect_passaro = passaro.sprite_rotacionado.get_rect(topleft=(x_passaro, y_passaro))
-            # except AttributeError:
-            #     rect_passaro = passaro.sprites[self.passaro.frame_atual - 1].get_rect(topleft=(x_passaro, y_passaro))
-
-            colisao_superior = passaro.hitbox.colliderect(rect_cano_inf)
-            colisao_inferior = passaro.hitbox.colliderect(rect_cano_sup)
-
-            if colisao_superior or colisao_inferior:
-                return True
-        return False
-
-    def verificar_colisao_tela(self, passaro: Passaro) -> bool:
-        """
-        Verifica se o passaro colidiu com o teto ou com o chão.
-
-        Args:
-            passaro (Passaro): O passaro a ser verificado.
-        Returns:
-            bool: True se houver colisão, False caso contrário.
-        """
-        return self.verificar_colisao_teto(passaro) or self.verificar_colisao_chao(passaro)
-        
-    def verificar_colisao_chao(self, passaro: Passaro) -> bool:
-        """
-        Verifica se o passaro colidiu com o chão.
-
-        Args:
-            passaro (Passaro): O passaro a ser verificado.
-        Returns:
-            bool: True se houver colisão, False caso contrário.
+            None
         """
-        return passaro.posicao.y + DIMENSOES_PASSARO.y > ALTURA_TELA - DIMENSOES_CHAO.y
+        for cano, (x_cano, abertura) in enumerate(posicoes):
+            self.canos_sup[cano].posicao.update(x_cano, abertura - ABERTURA_CANO - DIMENSOES_CANO.y)
+            self.canos_inf[cano].posicao.update(x_cano, abertura + ABERTURA_CANO)
 
-    def verificar_colisao_teto(self, passaro: Passaro) -> bool:
+    def sincronizar_passaro(self, alpha: float) -> None:
         """
-        Verifica se o passaro colidiu com o teto.
+        Posiciona o sprite do passaro entre os dois últimos passos da simulação.
 
         Args:
-            passaro (Passaro): O passaro a ser verificado.
+            alpha (float): Fração do passo já decorrida (0 a 1).
         Returns:
-            bool: True se houver colisão, False caso contrário.
+            None
         """
-        return passaro.posicao.y < 0
+        estado = self.simulacao.passaros[0]
+        self.passaro.posicao.y = estado.y_anterior + (estado.y - estado.y_anterior) * alpha
+        self.passaro.angulo = estado.angulo_anterior + (estado.angulo - estado.angulo_anterior) * alpha
 
     def zerar_velocidade_tudo(self) -> None:
         """
@@ -363,12 +306,6 @@ class FlappyBird:
         Returns:
             None
         """
-        for cano_inf in self.canos_inf:
-            cano_inf.velocidade = Vector2(0, 0)
-        
-        for cano_sup in self.canos_sup:
-            cano_sup.velocidade = Vector2(0, 0)
-        
         for predio in self.predios:
             predio.velocidade = Vector2(0, 0)
         
@@ -388,12 +325,6 @@ class FlappyBird:
         Returns:
             None
         """
-        for cano_inf in self.canos_inf:
-            cano_inf.velocidade = VELOCIDADE_CANO
-        
-        for cano_sup in self.canos_sup:
-            cano_sup.velocidade = VELOCIDADE_CANO
-        
         for predio in self.predios:
             predio.velocidade = VELOCIDADE_PREDIO
         
@@ -406,63 +337,79 @@ class FlappyBird:
         for chao in self.chaos:
             chao.velocidade = VELOCIDADE_CHAO
 
-    def verificar_morte(self, delta_time) -> bool:
+    def simular_passo(self) -> None:
         """
-        Verifica se o passaro colidiu com a tela ou com o cano.
+        Avança a simulação em um passo fixo, consumindo o pulo pendente do jogador
+        (ou decidindo o pulo com o piloto, se houver um).
 
         Returns:
-            bool: True se houver colisão, False caso contrário.
+            None
         """
-        if self.verificar_colisao_canos(self.passaro):
-            if not self.passaro_morto:
-                self.passaro.velocidade_y = 0
-                self.passaro_morto = True
-            self.resetar_jogo(delta_time)
-        if self.verificar_colisao_tela(self.passaro):
+        if self.piloto and not self.passaro_morto:
+            self.pulo_pendente = self.piloto.ativar(self.simulacao.observacao(0))[0] > LIMIAR_PULO
+        if self.gravador and not self.passaro_morto:
+            self.gravador.registrar((self.pulo_pendente,), (True,))
+        self.simulacao.step((self.pulo_pendente,))
+        self.pulo_pendente = False
+        self.verificar_morte()
+
+    def verificar_morte(self) -> None:
+        """
+        Verifica se o passaro morreu na simulação e conta o tempo até reiniciar o jogo.
+
+        Returns:
+            None
+        """
+        if not self.simulacao.passaros[0].vivo:
             if not self.passaro_morto:
-                self.passaro.velocidade_y = 0
                 self.passaro_morto = True
-            self.resetar_jogo(delta_time)
+                self.zerar_velocidade_tudo()
+                self.salvar_gravacao()
+            self.resetar_jogo()
 
-    def resetar_jogo(self, delta_time: float) -> None:
+    def resetar_jogo(self) -> None:
         """
-        Reseta o jogo para o estado inicial.
-
-        Args:
-            delta_time (float): Tempo decorrido desde o ultimo frame.
+        Reseta o jogo para o estado inicial depois de TEMPO_REINICIO segundos de simulação.
 
         Returns:
             None
         """
-        self.zerar_velocidade_tudo()
-
-        if self.tempo_inicial < 3:
-            self.tempo_inicial += delta_time
+        if self.tempo_inicial < TEMPO_REINICIO:
+            self.tempo_inicial += PASSO_SIMULACAO
             return
 
-        self.pontuacao              = 0
-        self.idx_cano_atual         = 0
+        self.simulacao.resetar()
+        self.iniciar_gravacao()
         self.tempo_inicial          = 0
-        self.passaro.velocidade_y   = 0
-        self.passaro.posicao        = POSICAO_INICIAL_PASSARO.copy()
-        self.passaro.angulo         = 0
         self.passaro_morto          = False
-        
-        for cano in range(QUANTIDADE_CANO):
-            x_cano_sup = LARGURA_TELA + DIMENSOES_CANO.x * (cano + 1) + DISTANCIA_ENTRE_CANOS * (cano + 1)
-            x_cano_inf = LARGURA_TELA + DIMENSOES_CANO.x * (cano + 1) + DISTANCIA_ENTRE_CANOS * (cano + 1)
 
-            rng = randint(ALTURA_TELA // 2 - CONSTANTE_RNG, ALTURA_TELA // 2 + CONSTANTE_RNG)
+        self.reiniciar_velocidade_tudo()
+
+    def iniciar_gravacao(self) -> None:
+        """
+        Começa a gravar a partida atual, se o jogo foi criado com uma pasta de replays.
 
-            y_cano_sup = 0 - DIMENSOES_CANO.y + rng - ABERTURA_CANO
-            y_cano_inf = rng + ABERTURA_CANO
+        Returns:
+            None
+        """
+        if self.pasta_replay and self.simulacao.quantidade_passaros:
+            self.gravador = GravadorReplay(1, self.simulacao.gerador.semente)
 
-            self.canos_sup[cano].posicao = Vector2(x_cano_sup, y_cano_sup)
-            self.canos_inf[cano].posicao = Vector2(x_cano_inf, y_cano_inf)
-            self.canos_sup[cano].velocidade = VELOCIDADE_CANO
-            self.canos_inf[cano].velocidade = VELOCIDADE_CANO
+    def salvar_gravacao(self) -> None:
+        """
+        Salva o replay da partida que acabou de terminar.
 
-        self.reiniciar_velocidade_tudo()
+        Returns:
+            None
+        """
+        if not self.gravador:
+            return
+        estado = self.simulacao.passaros[0]
+        replay = self.gravador.finalizar(self.simulacao.gerador.aberturas, (estado.passos_vivo,), (estado.vivo,))
+        os.makedirs(self.pasta_replay, exist_ok=True)
+        caminho = os.path.join(self.pasta_replay, f'jogo-{strftime("%Y%m%d-%H%M%S")}-{self.simulacao.pontuacao}.fbr')
+        replay.salvar(caminho)
+        self.gravador = None
 
     def desenhar_tudo(self, delta_time: float) -> None:
         """
@@ -474,25 +421,78 @@ class FlappyBird:
         Returns:
             None
         """
-        self.fundo.desenhar()
+        self.renderizador.desenhar_cenario(delta_time)
+        self.renderizador.desenhar_canos(self.canos_inf + self.canos_sup)
+        if self.passaro:
+            self.renderizador.registrar(self.passaro.desenhar())
+        self.renderizador.desenhar_chao(delta_time)
 
-        for grupo in (self.nuvens, self.predios, self.arvores):
-            for enfeite in grupo:
-                enfeite.movimentar(delta_time)
-                enfeite.desenhar()
+    def desenhar_populacao(
+            self,
+            passaros:   list[Passaro],
+            simulacao:  Any,
+            delta_time: float,
+            indices:    Optional[list[int]] = None
+    ) -> None:
+        """
+        Desenha o cenario, os canos e os passaros vivos de uma simulação vetorizada.
 
-        for cano in range(QUANTIDADE_CANO):
-            self.canos_inf[cano].movimentar(delta_time)
-            self.canos_inf[cano].desenhar()
-            self.canos_sup[cano].movimentar(delta_time)
-            self.canos_sup[cano].desenhar()
+        Args:
+            passaros (list[Passaro]): Sprites de todos os passaros da simulação.
+            simulacao (SimulacaoVetorizada): Simulação com o estado atual dos passaros e canos.
+            delta_time (float): Tempo decorrido desde o ultimo frame.
+            indices (list[int], optional): Passaros (vivos) a desenhar. Default é None (todos os vivos).
 
-        if self.passaro:
-            self.passaro.desenhar()
+        Returns:
+            None
+        """
+        self.resetar_enfeites()
+        self.sincronizar_canos(simulacao.posicoes_canos())
 
-        for chao in self.chaos:
-            chao.movimentar(delta_time)
-            chao.desenhar()
+        self.renderizador.desenhar_cenario(delta_time)
+        self.renderizador.desenhar_canos(self.canos_inf + self.canos_sup)
+
+        if indices is None:
+            indices = simulacao.vivo.nonzero()[0].tolist()
+        vivos = [passaros[i] for i in indices]
+        for passaro, y, angulo in zip(vivos, simulacao.y[indices].tolist(), simulacao.angulo[indices].tolist()):
+            passaro.posicao.y = y
+            passaro.angulo = angulo
+            passaro.aplicar_animacao(delta_time)
+        self.renderizador.desenhar_passaros(vivos)
+
+        self.renderizador.desenhar_chao(delta_time)
+
+    def assistir_replay(self, replay: Replay) -> bool:
+        """
+        Reproduz um replay na janela, em tempo real.
+
+        Args:
+            replay (Replay): Replay a reproduzir.
+        Returns:
+            bool: True se a reprodução foi até o fim e bateu com a gravação.
+        """
+        if not self.flag:
+            self.configuracoes_iniciais(False)
+        passaros = self.instanciar_populacao(len(replay.pulos))
+
+        def desenhar(simulacao) -> bool:
+            delta_time = self.clock.tick(FRAMERATE) / 1000
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    return False
+
+            self.desenhar_populacao(passaros, simulacao, delta_time)
+            self.escrever_texto(f"Individuos:{simulacao.quantidade_vivos}", LARGURA_TELA // 2, 30)
+            self.escrever_texto(f"Placar:{simulacao.pontuacao}", LARGURA_TELA // 2, 60)
+            self.renderizador.apresentar()
+            return True
+
+        try:
+            return replay.simular(desenhar)
+        finally:
+            limpar()
+            pg.quit()
 
     def event_loop(self) -> None:
         """
@@ -504,9 +504,25 @@ class FlappyBird:
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 self.running = False
+            if event.type == pg.WINDOWEXPOSED:
+                self.renderizador.invalidar()
             if event.type == pg.KEYDOWN:
-                if event.key in self.teclas_permitidas and not self.passaro_morto:
-                    self.passaro.aplicar_pulo()
+                if event.key in self.teclas_permitidas and not self.passaro_morto and not self.piloto:
+                    self.pulo_pendente = True
+
+    def marcar(self, fase: str, inicio: float) -> float:
+        """
+        Soma ao perfilador, se houver um, o tempo da fase que começou em `inicio`.
+
+        Args:
+            fase (str): Nome da fase.
+            inicio (float): Instante (perf_counter) em que a fase começou.
+        Returns:
+            float: O instante atual, início da próxima fase.
+        """
+        if self.perfilador:
+            return self.perfilador.marcar(fase, inicio)
+        return perf_counter()
 
     def run(self) -> None:
         """
@@ -519,35 +535,53 @@ class FlappyBird:
             self.configuracoes_iniciais(self.criar_passaro)
         self.running: bool = True
 
+        acumulador: float = 0
         last_time = time()
+        if self.perfilador:
+            self.perfilador.inicio_quadros()
         while self.running:
             try:
                 # ATUALIZAR
                 current_time = time()
                 delta_time = current_time - last_time
                 last_time = current_time
+                inicio = perf_counter()
 
-                if self.passaro:
-                    self.passaro.atualizar_hitbox()
-                    self.verificar_morte(delta_time)
                 self.event_loop()
+                inicio = self.marcar('event_loop', inicio)
+                acumulador += min(delta_time, ACUMULO_MAXIMO)
+                while acumulador >= PASSO_SIMULACAO:
+                    if self.passaro:
+                        self.simular_passo()
+                    else:
+                        self.simulacao.step(())
+                    acumulador -= PASSO_SIMULACAO
+                alpha = acumulador / PASSO_SIMULACAO
+                inicio = self.marcar('fisica', inicio)
+
                 self.resetar_enfeites()
-                self.resetar_canos()
-                if self.passaro:
-                    if not self.verificar_colisao_chao(self.passaro):
-                        self.passaro.aplicar_gravidade(delta_time)
-                        self.passaro.aplicar_angulo(delta_time)
+                inicio = self.marcar('resetar_enfeites', inicio)
+                self.sincronizar_canos(self.simulacao.posicoes_canos(alpha))
                 if self.passaro:
+                    self.sincronizar_passaro(alpha)
                     if not self.passaro_morto:
                         self.passaro.aplicar_animacao(delta_time)
+                inicio = self.marcar('sincronizar', inicio)
 
                 # DESENHAR
                 self.desenhar_tudo(delta_time)
+                inicio = self.marcar('desenhar_tudo', inicio)
                 if self.passaro:
                     if QUANTIDADE_CANO > 0:
                         self.atualizar_placar()
-                pg.display.flip()
+                inicio = self.marcar('atualizar_placar', inicio)
+                self.renderizador.apresentar()
+                inicio = self.marcar('apresentar', inicio)
                 self.clock.tick(FRAMERATE)
+                self.marcar('espera', inicio)
+                if self.perfilador:
+                    self.perfilador.fim_quadro()
             except KeyboardInterrupt:
                 self.running = False
+        limpar()
         pg.quit()
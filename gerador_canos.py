@@ -0,0 +1,72 @@
+import numpy as np
+from random import Random, randrange
+from typing import Optional
+from constants import *
+
+ABERTURA_MINIMA: int = int((ALTURA_TELA - DIMENSOES_CHAO.y) // 2 - CONSTANTE_RNG)
+ABERTURA_MAXIMA: int = int((ALTURA_TELA - DIMENSOES_CHAO.y) // 2 + CONSTANTE_RNG)
+
+class GeradorCanos:
+    def __init__(self, semente: Optional[int] = None) -> None:
+        """
+        Inicializa o gerador das aberturas dos canos.
+
+        A sequência de aberturas depende apenas da semente, então dois geradores com a mesma
+        semente produzem o mesmo percurso. O gerador é serializado só pela semente e pela
+        posição atual, o que o torna barato de enviar para outros processos ou de salvar.
+
+        Args:
+            semente (int, optional): Semente do percurso. Default é None (sorteia uma semente,
+                que fica disponível em self.semente).
+
+        Returns:
+            None
+        """
+        self.semente: int           = randrange(2**32) if semente is None else semente
+        self.rng: Random            = Random(self.semente)
+        self.aberturas: list[int]   = []
+        self.indice: int            = 0
+
+    def __getstate__(self) -> dict:
+        return {'semente': self.semente, 'indice': self.indice}
+
+    def __setstate__(self, estado: dict) -> None:
+        self.__init__(estado['semente'])
+        self.precomputar(estado['indice'])
+        self.indice = estado['indice']
+
+    def proxima(self) -> int:
+        """
+        Retorna a próxima abertura do percurso.
+
+        Returns:
+            int: Coordenada Y do centro da abertura.
+        """
+        if self.indice == len(self.aberturas):
+            self.aberturas.append(self.rng.randint(ABERTURA_MINIMA, ABERTURA_MAXIMA))
+        abertura = self.aberturas[self.indice]
+        self.indice += 1
+        return abertura
+
+    def precomputar(self, quantidade: int) -> np.ndarray:
+        """
+        Gera antecipadamente as primeiras aberturas do percurso.
+
+        Args:
+            quantidade (int): Quantidade de aberturas.
+
+        Returns:
+            np.ndarray: As primeiras `quantidade` aberturas do percurso.
+        """
+        while len(self.aberturas) < quantidade:
+            self.aberturas.append(self.rng.randint(ABERTURA_MINIMA, ABERTURA_MAXIMA))
+        return np.array(self.aberturas[:quantidade], dtype=np.int64)
+
+    def reiniciar(self) -> None:
+        """
+        Volta para o início do percurso, reaproveitando as aberturas já geradas.
+
+        Returns:
+            None
+        """
+        self.indice = 0
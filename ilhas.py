@@ -0,0 +1,359 @@
+import os
+import json
+import random
+import argparse
+import multiprocessing
+from itertools import count
+from functools import partial
+from multiprocessing.connection import Connection
+from typing import Optional
+import numpy as np
+import neat
+from neat.reporting import BaseReporter
+import neat_ai
+from neat_ai import REDUCOES, AvaliadorEtapas, calcular_fitness, compilar_genoma, eval_genomes
+from constants import *
+
+class ReporterIlha(BaseReporter):
+    def __init__(self, ilha: int, migrantes: int) -> None:
+        """
+        Reporter do NEAT de uma ilha: guarda os melhores genomas da última geração avaliada
+        (os próximos migrantes), um resumo de cada geração e se a ilha resolveu o jogo.
+
+        Args:
+            ilha (int): Número da ilha.
+            migrantes (int): Quantidade de genomas que a ilha envia a cada migração.
+
+        Returns:
+            None
+        """
+        self.ilha: int                          = ilha
+        self.migrantes: int                     = migrantes
+        self.geracao_atual: int                 = 0
+        self.melhores: list[neat.DefaultGenome] = []
+        self.historico: list[dict]              = []
+        self.resolvido: bool                    = False
+
+    def start_generation(self, generation: int) -> None:
+        self.geracao_atual = generation
+
+    def post_evaluate(self, config, population, species, best_genome) -> None:
+        ordenados = sorted(population.values(), key=lambda g: -g.fitness)
+        self.melhores = ordenados[:self.migrantes]
+        fitness = np.array([g.fitness for g in ordenados], dtype=np.float64)
+        self.historico.append({
+            'ilha': self.ilha,
+            'geracao': self.geracao_atual,
+            'melhor': float(fitness.max()),
+            'media': float(fitness.mean()),
+            'especies': len(species.species),
+            'populacao': len(population)
+        })
+
+    def found_solution(self, config, generation, best) -> None:
+        self.resolvido = True
+
+def rechavear_migrante(genome: neat.DefaultGenome, populacao: neat.Population) -> neat.DefaultGenome:
+    """
+    Copia um genoma vindo de outra ilha com uma chave nova e com os nós ocultos renumerados.
+
+    Cada ilha numera genomas e nós ocultos por conta própria, então as chaves do migrante
+    podem coincidir com as de genomas e nós da ilha que o recebe; sem a renumeração, a
+    próxima mutação que criasse um nó poderia reutilizar uma chave que o migrante já tem.
+
+    Args:
+        genome (neat.DefaultGenome): O migrante.
+        populacao (neat.Population): População que o recebe.
+
+    Returns:
+        neat.DefaultGenome: A cópia, sem fitness.
+    """
+    config = populacao.config.genome_config
+    if config.node_indexer is None:
+        config.node_indexer = count(max(max(g.nodes) for g in populacao.population.values()) + 1)
+
+    novo = populacao.config.genome_type(next(populacao.reproduction.genome_indexer))
+    # AS ENTRADAS (CHAVES NEGATIVAS) E AS SAIDAS TEM AS MESMAS CHAVES EM TODAS AS ILHAS
+    mapa: dict[int, int] = {chave: chave for chave in config.output_keys}
+    for chave, no in genome.nodes.items():
+        if chave not in mapa:
+            mapa[chave] = next(config.node_indexer)
+        no = no.copy()
+        no.key = mapa[chave]
+        novo.nodes[no.key] = no
+    for (origem, destino), conexao in genome.connections.items():
+        conexao = conexao.copy()
+        conexao.key = (mapa.get(origem, origem), mapa.get(destino, destino))
+        novo.connections[conexao.key] = conexao
+    return novo
+
+def inserir_migrantes(populacao: neat.Population, migrantes: list[neat.DefaultGenome]) -> None:
+    """
+    Coloca os migrantes no lugar de filhos recém-gerados (nunca de elites) e divide a
+    população em espécies de novo.
+
+    Args:
+        populacao (neat.Population): População que recebe os migrantes, já reproduzida.
+        migrantes (list[neat.DefaultGenome]): Genomas vindos de outra ilha.
+
+    Returns:
+        None
+    """
+    # OS ELITES SAO OS UNICOS QUE CHEGAM A NOVA GERACAO COM FITNESS
+    filhos = [chave for chave, g in populacao.population.items() if g.fitness is None]
+    for chave, migrante in zip(reversed(filhos), migrantes):
+        del populacao.population[chave]
+        populacao.reproduction.ancestors.pop(chave, None)
+        novo = rechavear_migrante(migrante, populacao)
+        populacao.population[novo.key] = novo
+        populacao.reproduction.ancestors[novo.key] = tuple()
+    populacao.species.speciate(populacao.config, populacao.population, populacao.generation)
+
+def rodar_ilha(
+        ilha:           int,
+        config_path:    str,
+        semente:        int,
+        conexao:        Connection,
+        geracoes:       int,
+        intervalo:      int,
+        migrantes:      int,
+        passos_maximos: Optional[int],
+        percursos:      int,
+        reducao:        str
+) -> None:
+    """
+    Evolui a população de uma ilha no próprio processo. A cada `intervalo` gerações, envia
+    pela conexão o resumo das gerações, o melhor genoma e os migrantes, e espera os
+    migrantes de outra ilha (ou None, para terminar).
+
+    Args:
+        ilha (int): Número da ilha.
+        config_path (str): Caminho para o arquivo de configuração do NEAT.
+        semente (int): Semente da ilha (mutações e percursos).
+        conexao (Connection): Ponta da ilha no Pipe com o processo principal.
+        geracoes (int): Quantidade máxima de gerações.
+        intervalo (int): Gerações entre duas migrações.
+        migrantes (int): Quantidade de genomas enviados a cada migração.
+        passos_maximos (int, optional): Limite de passos de cada episódio (None para sem limite).
+        percursos (int): Percursos de cada genoma por geração (veja neat_ai.rodar).
+        reducao (str): Como os fitness dos percursos viram um só (veja neat_ai.reduzir_fitness).
+
+    Returns:
+        None
+    """
+    random.seed(semente)
+    neat_ai.rng_percurso.seed(semente)
+    config = neat.config.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        config_path
+    )
+    populacao = neat.Population(config)
+    reporter = ReporterIlha(ilha, migrantes)
+    populacao.add_reporter(reporter)
+
+    if percursos > 1:
+        avaliador = AvaliadorEtapas(((1.0, percursos),), passos_maximos=passos_maximos, reducao=reducao)
+        avaliar, fitness_limite = avaliador.avaliar, avaliador.fitness_maximo
+    else:
+        avaliar = partial(eval_genomes, headless=True, passos_maximos=passos_maximos)
+        fitness_limite = None if passos_maximos is None else calcular_fitness(passos_maximos, morreu=False)
+    if fitness_limite is not None:
+        # A ILHA PARA QUANDO ALGUM GENOMA CHEGA AO LIMITE DE PASSOS, COMO NO neat_ai.rodar
+        config.fitness_threshold = min(config.fitness_threshold, fitness_limite)
+
+    while True:
+        populacao.run(avaliar, min(intervalo, geracoes - populacao.generation))
+        conexao.send({
+            'ilha': ilha,
+            'geracao': populacao.generation,
+            'historico': reporter.historico,
+            'melhor': populacao.best_genome,
+            'migrantes': reporter.melhores,
+            'resolvido': reporter.resolvido
+        })
+        reporter.historico = []
+        recebidos = conexao.recv()
+        if recebidos is None:
+            break
+        inserir_migrantes(populacao, recebidos)
+    conexao.close()
+
+def rodar_ilhas(
+        config_path:    str,
+        ilhas:          int = QUANTIDADE_ILHAS,
+        semente:        Optional[int] = None,
+        geracoes:       int = GERACOES_TREINO,
+        intervalo:      int = INTERVALO_MIGRACAO,
+        migrantes:      int = QUANTIDADE_MIGRANTES,
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO,
+        percursos:      int = 1,
+        reducao:        str = REDUCAO_FITNESS,
+        campeao:        Optional[str] = 'campeao.npz',
+        relatorio:      Optional[str] = None
+) -> Optional[neat.DefaultGenome]:
+    """
+    Treina várias populações independentes (ilhas), cada uma num processo e com sua própria
+    semente. A cada `intervalo` gerações, as ilhas param juntas e cada uma recebe os melhores
+    genomas da anterior, num anel. As ilhas usam todos os núcleos e mantêm a diversidade de
+    populações separadas, sem que uma população enorme concentre a especiação num processo.
+
+    O treino termina quando todas as ilhas chegam a `geracoes` ou quando alguma resolve o
+    jogo (chega ao limite de passos). Ao fim, mostra um resumo de cada ilha e exporta o
+    melhor genoma de todas.
+
+    Args:
+        config_path (str): Caminho para o arquivo de configuração do NEAT.
+        ilhas (int, optional): Quantidade de ilhas. Default é QUANTIDADE_ILHAS.
+        semente (int, optional): Semente do treino; a ilha i usa semente + i. Default é
+            None (aleatória).
+        geracoes (int, optional): Quantidade máxima de gerações de cada ilha. Default é
+            GERACOES_TREINO.
+        intervalo (int, optional): Gerações entre duas migrações. Default é INTERVALO_MIGRACAO.
+        migrantes (int, optional): Genomas que cada ilha envia a cada migração. Default é
+            QUANTIDADE_MIGRANTES.
+        passos_maximos (int, optional): Limite de passos de cada episódio (None para sem
+            limite). Default é PASSOS_MAXIMOS_EPISODIO.
+        percursos (int, optional): Percursos de cada genoma por geração. Default é 1.
+        reducao (str, optional): Como os fitness dos percursos viram um só. Default é
+            REDUCAO_FITNESS.
+        campeao (str, optional): Arquivo .npz onde o melhor genoma é exportado (None
+            desativa). Default é 'campeao.npz'.
+        relatorio (str, optional): Arquivo JSON que recebe o resumo de cada geração de cada
+            ilha e o campeão. Default é None.
+
+    Returns:
+        neat.DefaultGenome: O melhor genoma de todas as ilhas (None se nenhuma geração terminou).
+    """
+    if semente is None:
+        semente = random.randrange(2**32)
+    conexoes: list[Connection] = []
+    processos: list[multiprocessing.Process] = []
+    for ilha in range(ilhas):
+        conexao, conexao_ilha = multiprocessing.Pipe()
+        processo = multiprocessing.Process(
+            target=rodar_ilha,
+            args=(ilha, config_path, semente + ilha, conexao_ilha, geracoes, intervalo, migrantes,
+                  passos_maximos, percursos, reducao),
+            daemon=True
+        )
+        processo.start()
+        # SO A ILHA FICA COM A PONTA DELA; SE A ILHA MORRER, O recv DAQUI FALHA EM VEZ DE ESPERAR PARA SEMPRE
+        conexao_ilha.close()
+        conexoes.append(conexao)
+        processos.append(processo)
+
+    historico: list[dict] = []
+    melhores: list[Optional[neat.DefaultGenome]] = [None] * ilhas
+    try:
+        while True:
+            mensagens = []
+            for ilha, conexao in enumerate(conexoes):
+                try:
+                    mensagens.append(conexao.recv())
+                except EOFError:
+                    raise RuntimeError(f"A ilha {ilha} terminou inesperadamente.") from None
+            for mensagem in mensagens:
+                historico.extend(mensagem['historico'])
+                melhores[mensagem['ilha']] = mensagem['melhor']
+            imprimir_ilhas(mensagens)
+
+            if any(m['resolvido'] for m in mensagens) or all(m['geracao'] >= geracoes for m in mensagens):
+                break
+            # MIGRACAO EM ANEL: A ILHA i RECEBE OS MELHORES DA ILHA i - 1
+            for ilha, conexao in enumerate(conexoes):
+                conexao.send(mensagens[ilha - 1]['migrantes'])
+        for conexao in conexoes:
+            conexao.send(None)
+    except KeyboardInterrupt:
+        print("Treino interrompido.")
+    finally:
+        for processo in processos:
+            processo.join(timeout=5)
+            if processo.is_alive():
+                processo.terminate()
+
+    candidatos = [(ilha, g) for ilha, g in enumerate(melhores) if g is not None]
+    if not candidatos:
+        return None
+    ilha_campeao, melhor = max(candidatos, key=lambda candidato: candidato[1].fitness)
+    print(f"Campeão: genoma {melhor.key} da ilha {ilha_campeao}, fitness {melhor.fitness}")
+
+    if relatorio:
+        with open(relatorio, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'semente': semente,
+                'ilhas': ilhas,
+                'intervalo': intervalo,
+                'migrantes': migrantes,
+                'historico': historico,
+                'campeao': {'ilha': ilha_campeao, 'chave': melhor.key, 'fitness': melhor.fitness}
+            }, arquivo, indent=2)
+        print(f"Relatório das ilhas salvo em {relatorio}")
+
+    if campeao:
+        config = neat.config.Config(
+            neat.DefaultGenome,
+            neat.DefaultReproduction,
+            neat.DefaultSpeciesSet,
+            neat.DefaultStagnation,
+            config_path
+        )
+        ultima_geracao = max(linha['geracao'] for linha in historico if linha['ilha'] == ilha_campeao)
+        compilar_genoma(melhor, config).salvar(
+            campeao, fitness=melhor.fitness, chave=melhor.key, geracao=ultima_geracao, ilha=ilha_campeao
+        )
+        print(f"Campeão exportado para {campeao}")
+    return melhor
+
+def imprimir_ilhas(mensagens: list[dict]) -> None:
+    """
+    Mostra, para cada ilha, o resumo da última geração avaliada desde a migração anterior.
+
+    Args:
+        mensagens (list[dict]): Mensagens enviadas pelas ilhas (veja rodar_ilha).
+
+    Returns:
+        None
+    """
+    for mensagem in mensagens:
+        if not mensagem['historico']:
+            continue
+        linha = mensagem['historico'][-1]
+        print(
+            f"Ilha {linha['ilha']}: geração {linha['geracao']}, melhor {linha['melhor']:.0f}, "
+            f"média {linha['media']:.0f}, {linha['especies']} espécies"
+            f"{' - resolveu' if mensagem['resolvido'] else ''}"
+        )
+
+def main() -> None:
+    """
+    Treina o Flappy Bird com o modelo de ilhas, sem janela.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Treina o Flappy Bird com NEAT em várias ilhas com migração.")
+    parser.add_argument("--ilhas", type=int, default=QUANTIDADE_ILHAS, help="quantidade de populações, uma por processo")
+    parser.add_argument("--semente", type=int, default=None, help="semente que torna o treino reproduzível (a ilha i usa semente + i)")
+    parser.add_argument("--geracoes", type=int, default=GERACOES_TREINO, help="quantidade máxima de gerações de cada ilha")
+    parser.add_argument("--migrar-a-cada", type=int, default=INTERVALO_MIGRACAO, metavar="N", help="gerações entre duas migrações")
+    parser.add_argument("--migrantes", type=int, default=QUANTIDADE_MIGRANTES, metavar="M", help="melhores genomas que cada ilha envia para a seguinte")
+    parser.add_argument("--passos-maximos", type=int, default=PASSOS_MAXIMOS_EPISODIO, metavar="N", help="limite de passos de cada episódio (0 para sem limite)")
+    parser.add_argument("--percursos", type=int, default=1, metavar="K", help="avalia cada genoma em K percursos por geração")
+    parser.add_argument("--reducao", choices=REDUCOES, default=REDUCAO_FITNESS, help="como os fitness de vários percursos viram um só")
+    parser.add_argument("--campeao", default="campeao.npz", metavar="ARQUIVO", help="onde exportar o melhor genoma ao fim do treino")
+    parser.add_argument("--relatorio", default=None, metavar="ARQUIVO", help="salva o resumo de cada geração de cada ilha neste JSON")
+    args = parser.parse_args()
+
+    caminho_config = os.path.join(os.path.dirname(__file__), "config-feedforward.txt")
+    rodar_ilhas(
+        caminho_config, ilhas=args.ilhas, semente=args.semente, geracoes=args.geracoes,
+        intervalo=args.migrar_a_cada, migrantes=args.migrantes, passos_maximos=args.passos_maximos or None,
+        percursos=args.percursos, reducao=args.reducao, campeao=args.campeao, relatorio=args.relatorio
+    )
+
+if __name__ == '__main__':
+    main()
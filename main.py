@@ -1,14 +1,34 @@
+import argparse
 from flappy import FlappyBird
+from rede_compilada import RedeCompilada
+from replay import Replay
+from perfil import Perfilador, perfilar
 
 def main() -> None:
     """
-    Função principal do jogo.
+    Função principal do jogo.
 
     Returns:
         None
     """
-    flappy: FlappyBird = FlappyBird()
-    flappy.run()
+    parser = argparse.ArgumentParser(description="Flappy Bird.")
+    parser.add_argument("--ia", default=None, metavar="ARQUIVO", help="deixa um campeão exportado pelo treino (.npz) jogar")
+    parser.add_argument("--gravar", default=None, metavar="PASTA", help="salva o replay de cada partida nesta pasta")
+    parser.add_argument("--replay", default=None, metavar="ARQUIVO", help="assiste a um replay (.fbr) de uma partida ou geração")
+    parser.add_argument("--perfil", default=None, metavar="ARQUIVO", help="mede cada fase de cada quadro e salva percentis e histogramas neste JSON")
+    parser.add_argument("--cprofile", default=None, metavar="ARQUIVO", help="salva as estatísticas do cProfile do jogo neste arquivo .pstats")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay = Replay.carregar(args.replay)
+        FlappyBird(criar_passaro=False).assistir_replay(replay)
+        return
+
+    piloto = RedeCompilada.carregar(args.ia) if args.ia else None
+    perfilador = Perfilador() if args.perfil else None
+    flappy: FlappyBird = FlappyBird(piloto=piloto, pasta_replay=args.gravar, perfilador=perfilador)
+    with perfilar(perfilador, args.perfil, args.cprofile):
+        flappy.run()
 
 if __name__ == '__main__':
     main()
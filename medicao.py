@@ -0,0 +1,109 @@
+from time import perf_counter
+from collections import defaultdict
+from typing import Sequence
+
+class MedidorFases:
+    def __init__(self) -> None:
+        """
+        Acumula o tempo gasto em cada fase do laço de simulação (inferência, física, colisão,
+        desenho...) e alguns contadores, com custo de uma chamada a perf_counter por fase.
+
+        Uso: `t = perf_counter(); ...; t = medidor.marcar('fisica', t); ...; medidor.marcar('colisao', t)`.
+
+        Returns:
+            None
+        """
+        self.zerar()
+
+    def zerar(self) -> None:
+        """
+        Descarta tudo o que foi medido.
+
+        Returns:
+            None
+        """
+        self.tempos: defaultdict[str, float]    = defaultdict(float)
+        self.contadores: defaultdict[str, int]  = defaultdict(int)
+        self.duracoes: list[int]                = []
+
+    def marcar(self, fase: str, inicio: float) -> float:
+        """
+        Soma à fase o tempo decorrido desde `inicio`.
+
+        Args:
+            fase (str): Nome da fase.
+            inicio (float): Instante (perf_counter) em que a fase começou.
+
+        Returns:
+            float: O instante atual, que pode ser usado como início da próxima fase.
+        """
+        agora = perf_counter()
+        self.tempos[fase] += agora - inicio
+        return agora
+
+    def inicio_quadros(self) -> None:
+        """
+        Marca o início de uma sequência de quadros (o laço do jogo ou de uma avaliação).
+        Aqui não faz nada; veja Perfilador.
+
+        Returns:
+            None
+        """
+
+    def fim_quadro(self) -> None:
+        """
+        Marca o fim de um quadro. Aqui não faz nada; o Perfilador guarda as amostras de cada quadro.
+
+        Returns:
+            None
+        """
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        """
+        Soma uma quantidade a um contador.
+
+        Args:
+            nome (str): Nome do contador.
+            quantidade (int, optional): Quantidade somada. Default é 1.
+
+        Returns:
+            None
+        """
+        self.contadores[nome] += quantidade
+
+    def registrar_duracoes(self, passos_vivo: Sequence[int]) -> None:
+        """
+        Guarda quantos passos cada passaro de uma avaliação sobreviveu.
+
+        Args:
+            passos_vivo (Sequence[int]): Passos vividos por cada passaro.
+
+        Returns:
+            None
+        """
+        self.duracoes.extend(int(passos) for passos in passos_vivo)
+
+    def exportar(self) -> dict:
+        """
+        Retorna o que foi medido num dicionário simples, que pode ser enviado entre processos.
+
+        Returns:
+            dict: Tempos por fase, contadores e durações.
+        """
+        return {'tempos': dict(self.tempos), 'contadores': dict(self.contadores), 'duracoes': list(self.duracoes)}
+
+    def somar(self, medicao: dict) -> None:
+        """
+        Soma a este medidor o que foi medido em outro (por exemplo, num processo do AvaliadorParalelo).
+
+        Args:
+            medicao (dict): Resultado de MedidorFases.exportar.
+
+        Returns:
+            None
+        """
+        for fase, tempo in medicao['tempos'].items():
+            self.tempos[fase] += tempo
+        for nome, quantidade in medicao['contadores'].items():
+            self.contadores[nome] += quantidade
+        self.duracoes.extend(medicao['duracoes'])
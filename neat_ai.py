@@ -1,161 +1,1134 @@
 import os
+import math
+import random
+import argparse
+import multiprocessing
+from time import perf_counter
+from functools import partial
+from typing import Optional, Sequence
+import numpy as np
 import pygame as pg
 from pygame.time import Clock
 import neat
 from neat.nn import FeedForwardNetwork
 from flappy import FlappyBird
 from passaro import Passaro
+from simulacao_vetorizada import SimulacaoVetorizada
+from simulacao import Simulacao
+from simulacao_mundos import SimulacaoMundos
+from rede_compilada import RedeCompilada, LoteRedes
+from checkpoint import CheckpointerAtomico, restaurar_checkpoint
+from replay import Replay, GravadorReplay
+from medicao import MedidorFases
+from telemetria import ReporterTelemetria
+from perfil import Perfilador, perfilar
+from cache_fitness import CacheFitness
 from constants import *
 
-def eval_genomes(genomes, config) -> None:
+REDUCOES: tuple[str, ...] = ('media', 'minimo', 'quantil') # VEJA reduzir_fitness
+
+class AbortTraining(Exception):
+    pass
+
+class Exibicao:
+    def __init__(self, intervalo: int = 1, melhores: Optional[int] = None, turbo: bool = False) -> None:
+        """
+        Define quando e o que o treino desenha, e mantém a janela entre as gerações.
+
+        As gerações desenhadas rodam em tempo real; as outras (e todas, no modo turbo) rodam
+        sem limite de framerate, lendo os eventos a cada PASSOS_ENTRE_EVENTOS passos e
+        mostrando uma prévia a cada INTERVALO_PREVIA segundos. TECLA_TURBO liga e desliga o
+        modo turbo durante o treino.
+
+        Args:
+            intervalo (int, optional): Desenha uma geração a cada tantas. Default é 1 (todas).
+            melhores (int, optional): Quantidade máxima de passaros desenhados, dando
+                preferência aos genomas com maior fitness na geração anterior. Default é None
+                (todos os vivos).
+            turbo (bool, optional): Começa no modo turbo. Default é False.
+
+        Returns:
+            None
+        """
+        self.intervalo: int             = max(1, intervalo)
+        self.melhores: Optional[int]    = melhores
+        self.turbo: bool                = turbo
+        self.jogo: Optional[FlappyBird] = None
+
+    def abrir(self) -> FlappyBird:
+        """
+        Retorna o jogo usado para desenhar, criando a janela na primeira vez.
+
+        Returns:
+            FlappyBird: O jogo.
+        """
+        if self.jogo is None:
+            self.jogo = FlappyBird(criar_passaro=False, configuracoes_iniciais=True)
+        return self.jogo
+
+    def tempo_real(self, numero_geracao: int) -> bool:
+        """
+        Retorna se a geração deve ser desenhada em tempo real.
+
+        Args:
+            numero_geracao (int): Número da geração.
+
+        Returns:
+            bool: True se a geração é desenhada quadro a quadro.
+        """
+        return not self.turbo and numero_geracao % self.intervalo == 0
+
+    def ordem_desenho(self, ge: list[neat.DefaultGenome]) -> Optional[np.ndarray]:
+        """
+        Ordena os passaros pela preferência de desenho, se só os melhores são desenhados.
+
+        Args:
+            ge (list[neat.DefaultGenome]): Genomas da geração.
+
+        Returns:
+            np.ndarray: Índices dos passaros, do genoma com maior fitness anterior (os novos,
+                ainda sem fitness, por último) para o menor; None se todos são desenhados.
+        """
+        if self.melhores is None:
+            return None
+        fitness = np.array([-np.inf if g.fitness is None else g.fitness for g in ge], dtype=np.float64)
+        return np.argsort(-fitness, kind='stable')
+
+    def processar_eventos(self) -> None:
+        """
+        Lê os eventos da janela: fechar interrompe o treino e TECLA_TURBO alterna o modo turbo.
+
+        Returns:
+            None
+        """
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                raise AbortTraining()
+            if event.type == pg.KEYDOWN and event.key == TECLA_TURBO:
+                self.turbo = not self.turbo
+            if event.type == pg.WINDOWEXPOSED and self.jogo:
+                self.jogo.renderizador.invalidar()
+
+def eval_genomes(
+        genomes,
+        config,
+        headless:       bool = False,
+        pasta_replay:   Optional[str] = None,
+        medidor:        Optional[MedidorFases] = None,
+        exibicao:       Optional[Exibicao] = None,
+        cache:          Optional[CacheFitness] = None,
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO
+) -> None:
     """
     Função que evalua os genomas e cria os passaros.
 
     Args:
         genomes (list): Lista de genomas.
         config (neat.Config): Configuração do NEAT.
+        headless (bool, optional): Se True, roda sem janela, sem desenhar e sem limite de
+            framerate. Default é False.
+        pasta_replay (str, optional): Pasta onde o replay da geração é salvo. Default é None
+            (sem gravar).
+        medidor (MedidorFases, optional): Medidor das fases da avaliação. Default é None.
+        exibicao (Exibicao, optional): Quando e o que desenhar, se não for headless.
+            Default é None (desenha todas as gerações, numa janela nova).
+        cache (CacheFitness, optional): Cache do fitness dos genomas já avaliados no
+            percurso; os genomas encontrados não são simulados. Default é None.
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+            Default é PASSOS_MAXIMOS_EPISODIO.
 
     Returns:
         None
     """
-    redes:      list[FeedForwardNetwork]    = []
-    ge:         list[neat.DefaultGenome]    = []
-    passaros:   list[Passaro]               = []
-
-    jogo: FlappyBird        = FlappyBird(criar_passaro=False, configuracoes_iniciais=True)
-    clock: Clock            = Clock()
-
-    for _, g in genomes:
-        net: FeedForwardNetwork = FeedForwardNetwork.create(g, config)
-        redes.append(net)
-        g.fitness = 0
-        ge.append(g)
-
-        passaros.append(Passaro(
-            tela=jogo.tela,
-            posicao=POSICAO_INICIAL_PASSARO.copy(),
-            dimensoes_sprite=DIMENSOES_PASSARO.copy(),
-            hitbox=pg.Rect(
-                POSICAO_INICIAL_PASSARO.x,
-                POSICAO_INICIAL_PASSARO.y,
-                DIMENSOES_PASSARO.x,
-                DIMENSOES_PASSARO.y
+    global geracao
+
+    ge: list[neat.DefaultGenome] = [g for _, g in genomes]
+    if not headless:
+        exibicao = exibicao or Exibicao()
+    jogo: Optional[FlappyBird] = exibicao.abrir() if exibicao else None
+    semente = sortear_semente_percurso()
+    gravador = GravadorReplay(len(ge), semente) if pasta_replay else None
+
+    def avaliar(pendentes: list[neat.DefaultGenome]) -> list[float]:
+        return avaliar_genomas(pendentes, config, semente, jogo, gravador, medidor, exibicao, passos_maximos)
+
+    if cache is None:
+        resultados = avaliar(ge)
+    else:
+        # O REPLAY E AS GERACOES DESENHADAS EM TEMPO REAL PRECISAM DE TODOS OS PASSAROS
+        consultar = not gravador and not (jogo and exibicao.tempo_real(geracao))
+        resultados = cache.avaliar(ge, semente, avaliar, consultar, medidor)
+    for g, fitness in zip(ge, resultados):
+        g.fitness = fitness
+    registrar_limite(ge, passos_maximos, medidor)
+    if gravador:
+        salvar_replay_geracao(gravador.replay, pasta_replay)
+    geracao += 1
+
+def avaliar_lote(
+        ge:         list[neat.DefaultGenome],
+        config:     neat.Config,
+        semente:    int,
+        gravar:     bool = False,
+        medidor:    Optional[MedidorFases] = None,
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO
+) -> tuple[list[float], Optional[Replay], Optional[dict]]:
+    """
+    Avalia um lote sem janela num processo do AvaliadorParalelo, devolvendo também o que
+    não pode ser compartilhado entre processos (o replay e as medições).
+
+    Args:
+        ge (list[neat.DefaultGenome]): Genomas a serem avaliados.
+        config (neat.Config): Configuração do NEAT.
+        semente (int): Semente das aberturas dos canos.
+        gravar (bool, optional): Se True, grava o replay do lote. Default é False.
+        medidor (MedidorFases, optional): Medidor vazio (MedidorFases ou Perfilador) que, se
+            informado, mede as fases da avaliação no processo. Default é None.
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+            Default é PASSOS_MAXIMOS_EPISODIO.
+
+    Returns:
+        tuple: Fitness de cada genoma, o replay (ou None) e as medições (MedidorFases.exportar, ou None).
+    """
+    gravador = GravadorReplay(len(ge), semente) if gravar else None
+    fitness = avaliar_genomas(ge, config, semente, gravador=gravador, medidor=medidor, passos_maximos=passos_maximos)
+    return fitness, gravador and gravador.replay, medidor and medidor.exportar()
+
+def avaliar_lote_percursos(
+        ge:             list[neat.DefaultGenome],
+        config:         neat.Config,
+        sementes:       Sequence[int],
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO,
+        medidor:        Optional[MedidorFases] = None
+) -> tuple[np.ndarray, Optional[dict]]:
+    """
+    Avalia um lote em vários percursos num processo do AvaliadorParalelo (veja avaliar_percursos).
+
+    Args:
+        ge (list[neat.DefaultGenome]): Genomas a serem avaliados.
+        config (neat.Config): Configuração do NEAT.
+        sementes (Sequence[int]): Sementes dos percursos.
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+            Default é PASSOS_MAXIMOS_EPISODIO.
+        medidor (MedidorFases, optional): Medidor vazio que, se informado, mede as fases da
+            avaliação no processo. Default é None.
+
+    Returns:
+        tuple: Fitness (genomas x percursos) e as medições (MedidorFases.exportar, ou None).
+    """
+    fitness = avaliar_percursos(ge, config, sementes, passos_maximos, medidor)
+    return fitness, medidor and medidor.exportar()
+
+def avaliar_percursos(
+        ge:             list[neat.DefaultGenome],
+        config:         neat.Config,
+        sementes:       Sequence[int],
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO,
+        medidor:        Optional[MedidorFases] = None
+) -> np.ndarray:
+    """
+    Simula cada genoma em vários percursos ao mesmo tempo (veja avaliar_redes_percursos).
+
+    Args:
+        ge (list[neat.DefaultGenome]): Genomas a serem avaliados.
+        config (neat.Config): Configuração do NEAT.
+        sementes (Sequence[int]): Sementes dos percursos.
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+            Default é PASSOS_MAXIMOS_EPISODIO.
+        medidor (MedidorFases, optional): Se informado, recebe o tempo de compilação,
+            inferência e física, os passos simulados e quanto cada passaro durou. Default é None.
+
+    Returns:
+        np.ndarray: Fitness de cada genoma (linhas) em cada percurso (colunas).
+    """
+    if medidor:
+        inicio = perf_counter()
+    compiladas: list[RedeCompilada] = [compilar_genoma(g, config) for g in ge]
+    if medidor:
+        medidor.marcar('compilacao', inicio)
+    return avaliar_redes_percursos(compiladas, sementes, passos_maximos, medidor)
+
+def avaliar_redes_percursos(
+        compiladas:     Sequence[RedeCompilada],
+        sementes:       Sequence[int],
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO,
+        medidor:        Optional[MedidorFases] = None
+) -> np.ndarray:
+    """
+    Simula cada rede em vários percursos ao mesmo tempo, numa SimulacaoMundos com um mundo
+    por par (rede, percurso). O custo fixo de cada passo é pago uma vez para todos os
+    percursos, em vez de uma vez por percurso.
+
+    Cada mundo evolui exatamente como uma SimulacaoVetorizada com a mesma semente, então o
+    fitness de uma rede num percurso é o mesmo de avaliar_genomas.
+
+    Args:
+        compiladas (Sequence[RedeCompilada]): Redes a serem avaliadas.
+        sementes (Sequence[int]): Sementes dos percursos.
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+            Default é PASSOS_MAXIMOS_EPISODIO.
+        medidor (MedidorFases, optional): Se informado, recebe o tempo de inferência e
+            física, os passos simulados e quanto cada passaro durou. Default é None.
+
+    Returns:
+        np.ndarray: Fitness de cada rede (linhas) em cada percurso (colunas).
+    """
+    k = len(sementes)
+    mundos = len(compiladas) * k
+    # O MUNDO i * k + j E A REDE i NO PERCURSO j
+    simulacao = SimulacaoMundos(mundos)
+    simulacao.resetar_mundos(np.arange(mundos), list(sementes) * len(compiladas))
+
+    ativos: np.ndarray  = np.arange(mundos)
+    redes: LoteRedes    = LoteRedes([compiladas[mundo // k] for mundo in range(mundos)])
+    acoes: np.ndarray   = np.zeros(mundos, dtype=bool)
+    quantidade_vivos    = mundos
+    passos              = 0
+    if medidor:
+        medidor.inicio_quadros()
+
+    while quantidade_vivos > 0 and (passos_maximos is None or passos < passos_maximos):
+        if medidor:
+            inicio = perf_counter()
+        if quantidade_vivos <= len(ativos) // 2:
+            # RECOMPILA O LOTE SO COM OS VIVOS PARA NAO CALCULAR REDES DE PASSAROS MORTOS
+            ativos = np.flatnonzero(simulacao.vivo)
+            redes = LoteRedes([compiladas[mundo // k] for mundo in ativos.tolist()])
+
+        saidas = redes.ativar(simulacao.observacoes()[ativos])
+        acoes[ativos] = saidas[:, 0] > LIMIAR_PULO
+        if medidor:
+            inicio = medidor.marcar('inferencia', inicio)
+            medidor.contar('passos_passaros', quantidade_vivos)
+        quantidade_vivos -= len(simulacao.step(acoes))
+        passos += 1
+        if medidor:
+            medidor.marcar('fisica', inicio)
+            medidor.fim_quadro()
+        # PIOR CASO DA CAUDA: OS VIVOS CHEGAM AO LIMITE (SEM LIMITE, VIVEM O DOBRO DO QUE JA VIVERAM)
+        fim = passos_maximos if passos_maximos is not None else 2 * passos
+        if 0 < quantidade_vivos and quantidade_vivos * fim <= CUSTO_PASSO_MUNDOS * (fim - passos):
+            break
+
+    passos_vivo: list[int]  = simulacao.passos_vivo.tolist()
+    vivos: list[bool]       = simulacao.vivo.tolist()
+    if quantidade_vivos and (passos_maximos is None or passos < passos_maximos):
+        # COM POUCOS MUNDOS VIVOS, O CUSTO FIXO DE CADA PASSO DA SimulacaoMundos DOMINA; REFAZER
+        # ESSES MUNDOS DESDE O INICIO EM PYTHON PURO E BEM MAIS BARATO E DA O MESMO RESULTADO
+        if medidor:
+            inicio = perf_counter()
+        for mundo in np.flatnonzero(simulacao.vivo).tolist():
+            passos_vivo[mundo], vivos[mundo] = simular_rede(
+                compiladas[mundo // k], sementes[mundo % k], passos_maximos
             )
-        ))
+            if medidor:
+                medidor.contar('passos_passaros', passos_vivo[mundo] - passos)
+                passos = max(passos, passos_vivo[mundo])
+        if medidor:
+            # A CAUDA MISTURA INFERENCIA E FISICA; CONTA COMO FISICA
+            medidor.marcar('fisica', inicio)
 
-    class AbortTraining(Exception):
-        pass
+    if medidor:
+        medidor.contar('passos', passos)
+        medidor.registrar_duracoes(passos_vivo)
+    fitness = [
+        calcular_fitness(duracao, morreu=not vivo)
+        for duracao, vivo in zip(passos_vivo, vivos)
+    ]
+    return np.array(fitness, dtype=np.float64).reshape(len(compiladas), k)
 
-    rodando = True
-    idx_cano_atual = 0
-    while rodando and len(passaros) > 0:
-        delta_time = clock.tick(FRAMERATE) / 1000
-    
-        for event in pg.event.get():
-            if event.type == pg.QUIT:
-                rodando = False
-                raise AbortTraining()
-        
-        jogo.resetar_enfeites()
-        jogo.resetar_canos()
-
-        if idx_cano_atual == QUANTIDADE_CANO:
-            idx_cano_atual = 0
-        
-        cano_sup_ref    = jogo.canos_sup[idx_cano_atual]
-        cano_inf_ref    = jogo.canos_inf[idx_cano_atual]
-        x_passaro       = passaros[0].posicao.x
-
-        passou_do_cano = x_passaro > cano_sup_ref.posicao.x + DIMENSOES_CANO.x - 10
-        if passou_do_cano:
-            idx_cano_atual += 1
-        
-        for i, passaro in enumerate(passaros):
-            entrada = (
-                cano_sup_ref.posicao.x - passaro.posicao.x,
-                cano_inf_ref.posicao.y - passaro.posicao.y,
-                cano_sup_ref.posicao.y + DIMENSOES_CANO.y - passaro.posicao.y, # posição de entrada corrigida
-                passaro.velocidade_y,
-                passaro.angulo
+def simular_rede(
+        rede:           RedeCompilada,
+        semente:        int,
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO
+) -> tuple[int, bool]:
+    """
+    Simula um único passaro controlado por uma rede numa Simulacao em Python puro, que com
+    um passaro só custa poucos microssegundos por passo.
+
+    Args:
+        rede (RedeCompilada): Rede que controla o passaro.
+        semente (int): Semente das aberturas dos canos.
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+            Default é PASSOS_MAXIMOS_EPISODIO.
+
+    Returns:
+        tuple[int, bool]: Passos que o passaro sobreviveu e se ainda está vivo.
+    """
+    simulacao = Simulacao(1, semente)
+    passaro = simulacao.passaros[0]
+    while passaro.vivo and (passos_maximos is None or passaro.passos_vivo < passos_maximos):
+        simulacao.step((rede.ativar(simulacao.observacao(0))[0] > LIMIAR_PULO,))
+    return passaro.passos_vivo, passaro.vivo
+
+def avaliar_genomas(
+        ge:         list[neat.DefaultGenome],
+        config:     neat.Config,
+        semente:    Optional[int] = None,
+        jogo:       Optional[FlappyBird] = None,
+        gravador:   Optional[GravadorReplay] = None,
+        medidor:    Optional[MedidorFases] = None,
+        exibicao:   Optional[Exibicao] = None,
+        passos_maximos: Optional[int] = PASSOS_MAXIMOS_EPISODIO
+) -> list[float]:
+    """
+    Simula todos os genomas no mesmo percurso e calcula o fitness de cada um.
+
+    Todos os passaros compartilham uma SimulacaoVetorizada de passo fixo, então o fitness
+    não depende da velocidade da máquina nem de a geração estar sendo desenhada. O episódio
+    termina quando todos morrem ou ao fim de passos_maximos passos, o que limita a duração
+    da avaliação mesmo quando algum genoma já aprendeu a jogar.
+
+    Args:
+        ge (list[neat.DefaultGenome]): Genomas a serem avaliados.
+        config (neat.Config): Configuração do NEAT.
+        semente (int, optional): Semente das aberturas dos canos. Default é None (aleatória).
+        jogo (FlappyBird, optional): Jogo usado para desenhar a simulação em tempo real.
+            Default é None (sem desenhar e sem limite de framerate).
+        gravador (GravadorReplay, optional): Gravador dos pulos; ao fim, o replay fica em
+            gravador.replay. Default é None.
+        medidor (MedidorFases, optional): Se informado, recebe o tempo de cada fase
+            (compilação, inferência, física, colisão, desenho e eventos), os passos simulados
+            e quanto cada passaro durou. Default é None.
+        exibicao (Exibicao, optional): Quando e o que desenhar com o jogo. Default é None
+            (desenha todos os passaros em todos os quadros).
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+            Default é PASSOS_MAXIMOS_EPISODIO.
+
+    Returns:
+        list[float]: Fitness de cada genoma, na mesma ordem de ge.
+    """
+    if medidor:
+        inicio = perf_counter()
+    compiladas: list[RedeCompilada] = [compilar_genoma(g, config) for g in ge]
+    simulacao: SimulacaoVetorizada = SimulacaoVetorizada(quantidade_passaros=len(ge), semente=semente)
+    simulacao.medidor = medidor
+
+    if jogo:
+        exibicao = exibicao or Exibicao()
+        clock: Clock            = Clock()
+        passaros: list[Passaro] = jogo.instanciar_populacao(len(ge))
+        ordem: Optional[np.ndarray] = exibicao.ordem_desenho(ge)
+        ultima_previa: float    = perf_counter()
+
+    ativos: np.ndarray  = np.arange(len(ge))
+    redes: LoteRedes    = LoteRedes(compiladas)
+    acoes: np.ndarray   = np.zeros(len(ge), dtype=bool)
+    if medidor:
+        medidor.marcar('compilacao', inicio)
+        medidor.inicio_quadros()
+
+    while simulacao.quantidade_vivos > 0 and (passos_maximos is None or simulacao.passos < passos_maximos):
+        if jogo:
+            tempo_real = exibicao.tempo_real(geracao)
+            if tempo_real or simulacao.passos % PASSOS_ENTRE_EVENTOS == 0:
+                if medidor:
+                    inicio = perf_counter()
+                exibicao.processar_eventos()
+                if medidor:
+                    medidor.marcar('eventos', inicio)
+
+        if medidor:
+            inicio = perf_counter()
+        if simulacao.quantidade_vivos <= len(ativos) // 2:
+            # RECOMPILA O LOTE SO COM OS VIVOS PARA NAO CALCULAR REDES DE PASSAROS MORTOS
+            ativos = np.flatnonzero(simulacao.vivo)
+            redes = LoteRedes([compiladas[i] for i in ativos.tolist()])
+
+        saidas = redes.ativar(simulacao.observacoes()[ativos])
+        acoes[ativos] = saidas[:, 0] > LIMIAR_PULO
+        if gravador:
+            gravador.registrar(acoes, simulacao.vivo)
+        if medidor:
+            medidor.marcar('inferencia', inicio)
+            medidor.contar('passos_passaros', simulacao.quantidade_vivos)
+        simulacao.step(acoes)
+
+        if jogo and (tempo_real or perf_counter() - ultima_previa >= INTERVALO_PREVIA):
+            # FORA DO TEMPO REAL O TICK NAO ESPERA; O LIMITE EVITA UM SALTO DO CENARIO AO VOLTAR DO TURBO
+            delta_time = min(clock.tick(FRAMERATE if tempo_real else 0) / 1000, ACUMULO_MAXIMO)
+            if medidor:
+                inicio = perf_counter()
+            indices = None
+            if ordem is not None:
+                indices = ordem[simulacao.vivo[ordem]][:exibicao.melhores].tolist()
+            aviso = None if tempo_real else 'TURBO' if exibicao.turbo else f"Desenho a cada {exibicao.intervalo} geracoes"
+            desenhar_geracao(jogo, passaros, simulacao, delta_time, indices, aviso)
+            ultima_previa = perf_counter()
+            if medidor:
+                medidor.marcar('desenho', inicio)
+        if medidor:
+            medidor.fim_quadro()
+
+    if gravador:
+        gravador.finalizar(simulacao.gerador.aberturas, simulacao.passos_vivo, simulacao.vivo)
+    if medidor:
+        medidor.contar('passos', simulacao.passos)
+        medidor.registrar_duracoes(simulacao.passos_vivo)
+    return [
+        calcular_fitness(passos_vivo, morreu=not vivo)
+        for passos_vivo, vivo in zip(simulacao.passos_vivo.tolist(), simulacao.vivo.tolist())
+    ]
+
+class AvaliadorParalelo:
+    def __init__(
+            self,
+            processos:          int,
+            lotes_por_processo: int = 2,
+            pasta_replay:       Optional[str] = None,
+            medidor:            Optional[MedidorFases] = None,
+            cache:              Optional[CacheFitness] = None,
+            passos_maximos:     Optional[int] = PASSOS_MAXIMOS_EPISODIO
+    ) -> None:
+        """
+        Avalia a população dividida entre vários processos, cada um com sua própria simulação
+        sem janela. Todos os processos usam a mesma semente, então os genomas enfrentam o mesmo
+        percurso e o fitness é igual ao de uma avaliação num único processo.
+
+        Args:
+            processos (int): Quantidade de processos.
+            lotes_por_processo (int, optional): Em quantos lotes a população é dividida por
+                processo; mais lotes equilibram melhor a carga quando poucos passaros vivem
+                muito. Default é 2.
+            pasta_replay (str, optional): Pasta onde o replay de cada geração é salvo.
+                Default é None (sem gravar).
+            medidor (MedidorFases, optional): Recebe a soma das medições dos processos.
+                Default é None.
+            cache (CacheFitness, optional): Cache do fitness dos genomas já avaliados no
+                percurso, consultado antes de dividir a população. Default é None.
+            passos_maximos (int, optional): Limite de passos do episódio (None para sem
+                limite). Default é PASSOS_MAXIMOS_EPISODIO.
+
+        Returns:
+            None
+        """
+        self.processos: int             = processos
+        self.lotes_por_processo: int    = lotes_por_processo
+        self.pasta_replay: Optional[str] = pasta_replay
+        self.medidor: Optional[MedidorFases] = medidor
+        self.cache: Optional[CacheFitness]  = cache
+        self.passos_maximos: Optional[int]  = passos_maximos
+        self.pool                       = multiprocessing.Pool(processos)
+
+    def avaliar(self, genomes, config) -> None:
+        """
+        Função de fitness para o neat.Population.run.
+
+        Args:
+            genomes (list): Lista de genomas.
+            config (neat.Config): Configuração do NEAT.
+
+        Returns:
+            None
+        """
+        global geracao
+
+        ge: list[neat.DefaultGenome] = [g for _, g in genomes]
+        semente = sortear_semente_percurso()
+        if self.cache is None:
+            resultados = self.avaliar_lotes(ge, config, semente)
+        else:
+            resultados = self.cache.avaliar(
+                ge, semente, partial(self.avaliar_lotes, config=config, semente=semente),
+                consultar=not self.pasta_replay, medidor=self.medidor
             )
+        for g, fitness in zip(ge, resultados):
+            g.fitness = fitness
+        registrar_limite(ge, self.passos_maximos, self.medidor)
+        geracao += 1
+
+    def avaliar_lotes(
+            self,
+            ge:             list[neat.DefaultGenome],
+            config:         neat.Config,
+            semente:        int,
+            passos_maximos: Optional[int] = None
+    ) -> list[float]:
+        """
+        Divide os genomas em lotes intercalados e avalia os lotes nos processos.
+
+        Args:
+            ge (list[neat.DefaultGenome]): Genomas a serem avaliados.
+            config (neat.Config): Configuração do NEAT.
+            semente (int): Semente do percurso.
+            passos_maximos (int, optional): Limite de passos do episódio. Default é None
+                (usa self.passos_maximos).
+
+        Returns:
+            list[float]: Fitness de cada genoma, na mesma ordem de ge.
+        """
+        passos_maximos = passos_maximos or self.passos_maximos
+        quantidade_lotes = max(1, min(len(ge), self.processos * self.lotes_por_processo))
+        lotes = [ge[i::quantidade_lotes] for i in range(quantidade_lotes)]
+
+        argumentos = [
+            (lote, config, semente, bool(self.pasta_replay), type(self.medidor)() if self.medidor else None, passos_maximos)
+            for lote in lotes
+        ]
+        resultados, replays, medicoes = zip(*self.pool.starmap(avaliar_lote, argumentos))
+        if self.pasta_replay:
+            salvar_replay_geracao(Replay.intercalar(list(replays)), self.pasta_replay)
+        if self.medidor:
+            for medicao in medicoes:
+                self.medidor.somar(medicao)
+
+        fitness: list[float] = [0.0] * len(ge)
+        for i, fitness_lote in enumerate(resultados):
+            fitness[i::quantidade_lotes] = fitness_lote
+        return fitness
+
+    def avaliar_percursos(
+            self,
+            ge:             list[neat.DefaultGenome],
+            config:         neat.Config,
+            sementes:       Sequence[int],
+            passos_maximos: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Divide os genomas em lotes intercalados e avalia cada lote em vários percursos nos
+        processos (veja avaliar_percursos).
+
+        Args:
+            ge (list[neat.DefaultGenome]): Genomas a serem avaliados.
+            config (neat.Config): Configuração do NEAT.
+            sementes (Sequence[int]): Sementes dos percursos.
+            passos_maximos (int, optional): Limite de passos do episódio. Default é None
+                (usa self.passos_maximos).
+
+        Returns:
+            np.ndarray: Fitness de cada genoma (linhas) em cada percurso (colunas).
+        """
+        passos_maximos = passos_maximos or self.passos_maximos
+        quantidade_lotes = max(1, min(len(ge), self.processos * self.lotes_por_processo))
+        lotes = [ge[i::quantidade_lotes] for i in range(quantidade_lotes)]
+
+        argumentos = [
+            (lote, config, list(sementes), passos_maximos, type(self.medidor)() if self.medidor else None)
+            for lote in lotes
+        ]
+        resultados, medicoes = zip(*self.pool.starmap(avaliar_lote_percursos, argumentos))
+        if self.medidor:
+            for medicao in medicoes:
+                self.medidor.somar(medicao)
 
-            output = redes[i].activate(entrada)
-            if output[0] > 0.5:
-                passaro.aplicar_pulo()
-            
-            passaro.aplicar_gravidade(delta_time)
-            passaro.aplicar_angulo(delta_time)
-            passaro.aplicar_animacao(delta_time)
-
-            ge[i].fitness += 10
-
-            passaro.atualizar_hitbox()
-
-            colidiu_tela = jogo.verificar_colisao_tela(passaro)
-            colidiu_cano = jogo.verificar_colisao_canos(passaro)
-            
-            if colidiu_tela or colidiu_cano:
-                ge[i].fitness -= 50
-                passaros.pop(i)
-                redes.pop(i)
-                ge.pop(i)
-                continue
-
-        jogo.fundo.desenhar()
-        for grupo in (jogo.nuvens, jogo.predios, jogo.arvores):
-            for enfeite in grupo:
-                enfeite.movimentar(delta_time)
-                enfeite.desenhar()
-
-        for idx in range(QUANTIDADE_CANO):
-            jogo.canos_inf[idx].movimentar(delta_time)
-            jogo.canos_inf[idx].desenhar()
-            jogo.canos_sup[idx].movimentar(delta_time)
-            jogo.canos_sup[idx].desenhar()
-
-        for passaro in passaros:
-            passaro.desenhar()
-
-        for chao in jogo.chaos:
-            chao.movimentar(delta_time)
-            chao.desenhar()
+        fitness = np.zeros((len(ge), len(sementes)), dtype=np.float64)
+        for i, fitness_lote in enumerate(resultados):
+            fitness[i::quantidade_lotes] = fitness_lote
+        return fitness
 
+    def fechar(self) -> None:
+        """
+        Encerra os processos.
+
+        Returns:
+            None
+        """
+        self.pool.close()
+        self.pool.join()
+
+class AvaliadorEtapas:
+    def __init__(
+            self,
+            etapas:             tuple[tuple[float, int], ...] = ETAPAS_AVALIACAO,
+            fracao_promovida:   float = FRACAO_PROMOVIDA,
+            passos_maximos:     Optional[int] = PASSOS_MAXIMOS_EPISODIO,
+            paralelo:           Optional[AvaliadorParalelo] = None,
+            medidor:            Optional[MedidorFases] = None,
+            cache:              Optional[CacheFitness] = None,
+            reducao:            str = REDUCAO_FITNESS
+    ) -> None:
+        """
+        Avalia a população em etapas (successive halving): todos os genomas jogam um percurso
+        curto; só a fração com maior fitness passa para a etapa seguinte, com episódios mais
+        longos e mais percursos, e assim por diante. Como a maioria dos genomas morre logo,
+        quase todo o tempo de simulação vai para os que ainda precisam ser diferenciados.
+
+        Com uma etapa só, ((1.0, k),), todos os genomas jogam os mesmos k percursos, o que
+        diminui o ruído de avaliar cada genoma num percurso sorteado (--percursos).
+
+        O fitness de uma etapa junta os percursos da etapa (veja reduzir_fitness), somado a um deslocamento
+        maior que qualquer fitness das etapas anteriores; assim, quem chegou mais longe
+        sempre fica na frente, e o fitness de genomas eliminados em etapas diferentes
+        continua comparável.
+
+        Args:
+            etapas (tuple[tuple[float, int], ...], optional): Para cada etapa, a fração de
+                passos_maximos que cada episódio dura e a quantidade de percursos.
+                Default é ETAPAS_AVALIACAO.
+            fracao_promovida (float, optional): Fração dos genomas de uma etapa que passa
+                para a seguinte. Default é FRACAO_PROMOVIDA.
+            passos_maximos (int, optional): Limite de passos da última etapa (None para sem
+                limite, só com uma etapa). Default é PASSOS_MAXIMOS_EPISODIO.
+            paralelo (AvaliadorParalelo, optional): Se informado, cada percurso é avaliado
+                nos processos dele. Default é None (num único processo).
+            medidor (MedidorFases, optional): Medidor das fases da avaliação. Default é None.
+            cache (CacheFitness, optional): Cache do fitness dos genomas já avaliados em
+                cada percurso e etapa. Default é None.
+            reducao (str, optional): Como os fitness dos percursos de uma etapa viram um só
+                (veja reduzir_fitness). Default é REDUCAO_FITNESS.
+
+        Returns:
+            None
+        """
+        if reducao not in REDUCOES:
+            raise ValueError(f"Redução de fitness desconhecida: {reducao}")
+        if passos_maximos is None and len(etapas) > 1:
+            raise ValueError("A avaliação em etapas exige um limite de passos.")
+        self.etapas: list[tuple[Optional[int], int]] = [
+            (None if passos_maximos is None else max(1, round(fracao * passos_maximos)), percursos)
+            for fracao, percursos in etapas
+        ]
+        self.fracao_promovida: float            = fracao_promovida
+        self.paralelo: Optional[AvaliadorParalelo] = paralelo
+        self.medidor: Optional[MedidorFases]    = medidor
+        self.cache: Optional[CacheFitness]      = cache
+        self.reducao: str                       = reducao
+
+        # QUEM E ELIMINADO NUMA ETAPA TEM NO MAXIMO O FITNESS DE QUEM SOBREVIVE A ELA INTEIRA;
+        # QUEM PASSA PARA A SEGUINTE TEM NO MINIMO O DE QUEM MORRE NO PRIMEIRO PASSO
+        self.deslocamentos: list[float] = [0.0]
+        for passos, _ in self.etapas[:-1]:
+            self.deslocamentos.append(self.deslocamentos[-1] + calcular_fitness(passos, morreu=False) + PENALIDADE_MORTE)
+        passos_ultima = self.etapas[-1][0]
+        self.fitness_maximo: Optional[float] = (
+            None if passos_ultima is None else self.deslocamentos[-1] + calcular_fitness(passos_ultima, morreu=False)
+        )
+
+    def avaliar(self, genomes, config) -> None:
+        """
+        Função de fitness para o neat.Population.run.
+
+        Args:
+            genomes (list): Lista de genomas.
+            config (neat.Config): Configuração do NEAT.
+
+        Returns:
+            None
+        """
         global geracao
 
-        jogo.escrever_texto(f"Individuos:{len(passaros)}", LARGURA_TELA // 2, 30)
-        jogo.escrever_texto(f"Geracao:{geracao}", LARGURA_TELA // 2, 60)
+        ge: list[neat.DefaultGenome] = [g for _, g in genomes]
+        # OS PERCURSOS DE TODAS AS ETAPAS SAEM DA SEMENTE DA GERACAO (FIXA COM --percurso-fixo)
+        rng = random.Random(sortear_semente_percurso())
+        candidatos: list[int] = list(range(len(ge)))
+
+        for etapa, ((passos, percursos), deslocamento) in enumerate(zip(self.etapas, self.deslocamentos)):
+            if etapa:
+                promovidos = max(1, math.ceil(len(candidatos) * self.fracao_promovida))
+                candidatos = sorted(candidatos, key=lambda i: -ge[i].fitness)[:promovidos]
+
+            sementes = tuple(rng.randrange(2**32) for _ in range(percursos))
+            fitness = self.avaliar_etapa([ge[i] for i in candidatos], config, sementes, passos)
+            for i, fitness_etapa in zip(candidatos, fitness):
+                ge[i].fitness = deslocamento + fitness_etapa
+
+        registrar_limite(ge, self.etapas[-1][0], self.medidor, self.fitness_maximo)
+        geracao += 1
+
+    def avaliar_etapa(
+            self,
+            ge:         list[neat.DefaultGenome],
+            config:     neat.Config,
+            sementes:   tuple[int, ...],
+            passos:     Optional[int]
+    ) -> list[float]:
+        """
+        Avalia genomas nos percursos de uma etapa, todos ao mesmo tempo.
+
+        Args:
+            ge (list[neat.DefaultGenome]): Genomas a serem avaliados.
+            config (neat.Config): Configuração do NEAT.
+            sementes (tuple[int, ...]): Sementes dos percursos da etapa.
+            passos (int, optional): Limite de passos do episódio (None para sem limite).
+
+        Returns:
+            list[float]: Fitness de cada genoma nos percursos, já reduzido, na mesma ordem de ge.
+        """
+        def avaliar(pendentes: list[neat.DefaultGenome]) -> list[float]:
+            if self.paralelo:
+                fitness = self.paralelo.avaliar_percursos(pendentes, config, sementes, passos)
+            else:
+                fitness = avaliar_percursos(pendentes, config, sementes, passos, self.medidor)
+            return reduzir_fitness(fitness, self.reducao).tolist()
+
+        if self.cache is None:
+            return avaliar(ge)
+        return self.cache.avaliar(ge, (sementes, passos, self.reducao), avaliar, medidor=self.medidor)
+
+def reduzir_fitness(fitness: np.ndarray, reducao: str = REDUCAO_FITNESS, quantil: float = QUANTIL_FITNESS) -> np.ndarray:
+    """
+    Junta o fitness de cada genoma em vários percursos num só.
+
+    A média premia quem vai bem na maioria dos percursos; o mínimo e um quantil baixo
+    premiam quem não vai mal em nenhum, e não deixam um percurso fácil promover um genoma.
+
+    Args:
+        fitness (np.ndarray): Fitness de cada genoma (linhas) em cada percurso (colunas).
+        reducao (str, optional): 'media', 'minimo' ou 'quantil'. Default é REDUCAO_FITNESS.
+        quantil (float, optional): Quantil usado por 'quantil'. Default é QUANTIL_FITNESS.
+
+    Returns:
+        np.ndarray: Fitness de cada genoma.
+    """
+    if reducao == 'media':
+        return fitness.mean(axis=1)
+    if reducao == 'minimo':
+        return fitness.min(axis=1)
+    if reducao == 'quantil':
+        return np.quantile(fitness, quantil, axis=1)
+    raise ValueError(f"Redução de fitness desconhecida: {reducao}")
+
+def compilar_genoma(genome: neat.DefaultGenome, config: neat.Config) -> RedeCompilada:
+    """
+    Compila um genoma para a forma em arrays usada no cálculo em lote.
+
+    Args:
+        genome (neat.DefaultGenome): Genoma a ser compilado.
+        config (neat.Config): Configuração do NEAT.
+
+    Returns:
+        RedeCompilada: Rede equivalente à FeedForwardNetwork do genoma.
+    """
+    return RedeCompilada.de_rede(FeedForwardNetwork.create(genome, config))
+
+def calcular_fitness(passos_vivo: int, morreu: bool) -> float:
+    """
+    Calcula o fitness de um passaro a partir de quanto tempo ele sobreviveu.
+
+    Args:
+        passos_vivo (int): Quantidade de passos que o passaro sobreviveu.
+        morreu (bool): Se o passaro morreu.
+
+    Returns:
+        float: Fitness do passaro.
+    """
+    return FITNESS_POR_PASSO * passos_vivo - (PENALIDADE_MORTE if morreu else 0)
+
+def registrar_limite(
+        ge:             list[neat.DefaultGenome],
+        passos_maximos: Optional[int],
+        medidor:        Optional[MedidorFases] = None,
+        fitness_limite: Optional[float] = None
+) -> list[int]:
+    """
+    Registra em genomas_no_limite os genomas da geração que sobreviveram até o limite de
+    passos do episódio (só eles têm o fitness máximo, já que quem morre perde PENALIDADE_MORTE).
+
+    Args:
+        ge (list[neat.DefaultGenome]): Genomas avaliados.
+        passos_maximos (int, optional): Limite de passos do episódio (None para sem limite).
+        medidor (MedidorFases, optional): Recebe a quantidade em 'no_limite'. Default é None.
+        fitness_limite (float, optional): Fitness de quem chega ao limite. Default é None
+            (o de calcular_fitness).
+
+    Returns:
+        list[int]: Chaves dos genomas que chegaram ao limite.
+    """
+    if passos_maximos is None:
+        return []
+    if fitness_limite is None:
+        fitness_limite = calcular_fitness(passos_maximos, morreu=False)
+    chaves = [g.key for g in ge if g.fitness >= fitness_limite]
+    if chaves:
+        genomas_no_limite[geracao] = chaves
+        print(f"{len(chaves)} genoma(s) chegaram ao limite de {passos_maximos} passos: {chaves}")
+    if medidor:
+        medidor.contar('no_limite', len(chaves))
+    return chaves
+
+def desenhar_geracao(
+        jogo:       FlappyBird,
+        passaros:   list[Passaro],
+        simulacao:  SimulacaoVetorizada,
+        delta_time: float,
+        indices:    Optional[list[int]] = None,
+        aviso:      Optional[str] = None
+) -> None:
+    """
+    Desenha o cenario, os passaros vivos e as informações da geração atual.
+
+    Args:
+        jogo (FlappyBird): Jogo que contém o cenário e os canos.
+        passaros (list[Passaro]): Sprites de todos os passaros da geração.
+        simulacao (SimulacaoVetorizada): Simulação com o estado atual dos passaros e canos.
+        delta_time (float): Tempo decorrido desde o ultimo frame.
+        indices (list[int], optional): Passaros (vivos) a desenhar. Default é None (todos os vivos).
+        aviso (str, optional): Texto mostrado abaixo das informações. Default é None.
 
-        pg.display.flip()
-        if len(passaros) == 0:
-            geracao += 1
-            rodando = False
+    Returns:
+        None
+    """
+    jogo.desenhar_populacao(passaros, simulacao, delta_time, indices)
+    jogo.escrever_texto(f"Individuos:{simulacao.quantidade_vivos}", LARGURA_TELA // 2, 30)
+    jogo.escrever_texto(f"Geracao:{geracao}", LARGURA_TELA // 2, 60)
+    if aviso:
+        jogo.escrever_texto(aviso, LARGURA_TELA // 2, 90, tamanho=24)
+
+    jogo.renderizador.apresentar()
 
 geracao: int = 0
+rng_percurso: random.Random = random.Random()
+percurso_fixo: Optional[int] = None # SEMENTE USADA EM TODAS AS GERACOES, SE HOUVER
+genomas_no_limite: dict[int, list[int]] = {} # CHAVES DOS GENOMAS QUE CHEGARAM AO LIMITE, POR GERACAO
+
+def salvar_replay_geracao(replay: Replay, pasta: str) -> None:
+    """
+    Salva o replay da geração atual em pasta/geracao-NNNNN.fbr.
+
+    Args:
+        replay (Replay): Replay da geração.
+        pasta (str): Pasta dos replays.
+
+    Returns:
+        None
+    """
+    os.makedirs(pasta, exist_ok=True)
+    replay.salvar(os.path.join(pasta, f'geracao-{geracao:05d}.fbr'))
+
+def sortear_semente_percurso() -> int:
+    """
+    Sorteia a semente do percurso de uma geração. Todos os genomas da geração enfrentam o
+    mesmo percurso, e treinos com a mesma semente (veja rodar) sorteiam os mesmos percursos.
+    Com um percurso fixo, todas as gerações usam a mesma semente.
+
+    Returns:
+        int: Semente do percurso.
+    """
+    if percurso_fixo is not None:
+        return percurso_fixo
+    return rng_percurso.randrange(2**32)
+
+def estado_treino() -> dict:
+    """
+    Retorna o estado do treino que não faz parte da população do NEAT, para os checkpoints.
+
+    Returns:
+        dict: Contador de gerações, estado do gerador de percursos, percurso fixo e genomas
+            que chegaram ao limite de passos.
+    """
+    return {
+        'geracao': geracao,
+        'rng_percurso': rng_percurso.getstate(),
+        'percurso_fixo': percurso_fixo,
+        'genomas_no_limite': genomas_no_limite
+    }
+
+def restaurar_estado_treino(estado: dict) -> None:
+    """
+    Restaura o estado salvo por estado_treino.
 
-def rodar(config_path) -> None:
+    Args:
+        estado (dict): Estado salvo.
+
+    Returns:
+        None
+    """
+    global geracao, percurso_fixo
+    geracao = estado['geracao']
+    rng_percurso.setstate(estado['rng_percurso'])
+    percurso_fixo = estado.get('percurso_fixo')
+    genomas_no_limite.clear()
+    genomas_no_limite.update(estado.get('genomas_no_limite', {}))
+
+def rodar(
+        config_path,
+        headless:   bool = False,
+        processos:  int = 1,
+        semente:    Optional[int] = None,
+        intervalo_checkpoint:   int = 0,
+        pasta_checkpoint:       str = 'checkpoints',
+        retomar:                Optional[str] = None,
+        campeao:                Optional[str] = 'campeao.npz',
+        pasta_replay:           Optional[str] = None,
+        telemetria:             Optional[str] = None,
+        perfilador:             Optional[Perfilador] = None,
+        exibicao:               Optional[Exibicao] = None,
+        fixar_percurso:         Optional[int] = None,
+        tamanho_cache:          int = TAMANHO_CACHE_FITNESS,
+        passos_maximos:         Optional[int] = PASSOS_MAXIMOS_EPISODIO,
+        parar_ao_resolver:      bool = True,
+        etapas:                 bool = False,
+        percursos:              int = 1,
+        reducao:                str = REDUCAO_FITNESS
+) -> None:
     """
     Função que executa o NEAT.
 
     Args:
         config_path (str): Caminho para o arquivo de configuração do NEAT.
+        headless (bool, optional): Treina sem janela e sem limite de framerate. Default é False.
+        processos (int, optional): Quantidade de processos que avaliam a população. Com mais
+            de um processo o treino é sempre sem janela. Default é 1.
+        semente (int, optional): Semente do treino (mutações do NEAT e percursos de cada
+            geração); a mesma semente reproduz o mesmo treino. Default é None (aleatória).
+        intervalo_checkpoint (int, optional): Salva um checkpoint a cada tantas gerações e
+            também quando o treino é interrompido (0 desativa). Default é 0.
+        pasta_checkpoint (str, optional): Pasta dos checkpoints. Default é 'checkpoints'.
+        retomar (str, optional): Checkpoint a partir do qual o treino continua; a
+            configuração e a semente salvas nele são usadas no lugar de config_path e
+            semente. Default é None.
+        campeao (str, optional): Arquivo .npz onde o melhor genoma é exportado ao fim do
+            treino, para ser jogado com `main.py --ia` (None desativa). Default é 'campeao.npz'.
+        pasta_replay (str, optional): Pasta onde o replay de cada geração é salvo (veja
+            replay.py). Default é None (sem gravar).
+        telemetria (str, optional): Arquivo .jsonl ou .csv que recebe, a cada geração, o
+            tempo de cada fase, os passos simulados, os sobreviventes e o fitness (veja
+            telemetria.py). Default é None.
+        perfilador (Perfilador, optional): Perfilador que recebe o tempo de cada fase de cada
+            passo da simulação (veja perfil.py). Default é None.
+        exibicao (Exibicao, optional): Quando e o que desenhar, se o treino tiver janela.
+            Default é None (desenha todas as gerações).
+        fixar_percurso (int, optional): Semente de um percurso usado em todas as gerações;
+            assim, os genomas que o elitismo mantém não são simulados de novo (veja
+            cache_fitness.py). Ao retomar, o percurso salvo no checkpoint é mantido se este
+            for None. Default é None (um percurso por geração).
+        tamanho_cache (int, optional): Quantidade máxima de fitness guardados pelo cache
+            (0 desativa). Default é TAMANHO_CACHE_FITNESS.
+        passos_maximos (int, optional): Limite de passos de cada episódio, que limita a
+            duração de cada geração (None para sem limite). Default é PASSOS_MAXIMOS_EPISODIO.
+        parar_ao_resolver (bool, optional): Termina o treino na primeira geração em que um
+            genoma chega ao limite de passos. Default é True.
+        etapas (bool, optional): Avalia a população em etapas, com AvaliadorEtapas (sempre
+            sem janela e sem replays; exige um limite de passos). Default é False.
+        percursos (int, optional): Sem etapas, quantidade de percursos que cada genoma joga
+            por geração, todos ao mesmo tempo (com mais de um, sempre sem janela e sem
+            replays). Default é 1.
+        reducao (str, optional): Como os fitness dos vários percursos (de --percursos ou
+            das etapas) viram um só (veja reduzir_fitness). Default é REDUCAO_FITNESS.
 
     Returns:
         None
     """
-    config = neat.config.Config(
-        neat.DefaultGenome,
-        neat.DefaultReproduction,
-        neat.DefaultSpeciesSet,
-        neat.DefaultStagnation,
-        config_path
-    )
-    global geracao
-    populacao = neat.Population(config)
-    geracao = populacao.generation
+    global geracao, percurso_fixo
+    if etapas and passos_maximos is None:
+        raise ValueError("A avaliação em etapas exige um limite de passos.")
+    if retomar:
+        populacao, estado = restaurar_checkpoint(retomar)
+        restaurar_estado_treino(estado)
+    else:
+        config = neat.config.Config(
+            neat.DefaultGenome,
+            neat.DefaultReproduction,
+            neat.DefaultSpeciesSet,
+            neat.DefaultStagnation,
+            config_path
+        )
+        if semente is not None:
+            random.seed(semente)
+            rng_percurso.seed(semente)
+
+        populacao = neat.Population(config)
+        geracao = populacao.generation
+    if fixar_percurso is not None:
+        percurso_fixo = fixar_percurso
+
     populacao.add_reporter(neat.StdOutReporter(True))
     populacao.add_reporter(neat.StatisticsReporter())
-    populacao.run(eval_genomes, 30)
+    checkpointer = CheckpointerAtomico(intervalo_checkpoint, pasta_checkpoint, estado_extra=estado_treino)
+    if intervalo_checkpoint:
+        populacao.add_reporter(checkpointer)
+    medidor: Optional[MedidorFases] = perfilador
+    if telemetria:
+        reporter_telemetria = ReporterTelemetria(telemetria, perfilador)
+        populacao.add_reporter(reporter_telemetria)
+        medidor = reporter_telemetria.medidor
+
+    cache = CacheFitness(tamanho_cache) if tamanho_cache > 0 else None
+    avaliador_etapas: Optional[AvaliadorEtapas] = None
+    if etapas or percursos > 1:
+        # VARIOS PERCURSOS SEM ETAPAS SAO UMA AVALIACAO DE UMA ETAPA SO
+        avaliador_etapas = AvaliadorEtapas(
+            ETAPAS_AVALIACAO if etapas else ((1.0, percursos),),
+            passos_maximos=passos_maximos, medidor=medidor, cache=cache, reducao=reducao
+        )
+    if parar_ao_resolver and passos_maximos is not None:
+        # O NEAT PARA QUANDO O MELHOR FITNESS ALCANCA O LIMIAR, ISTO E, QUANDO ALGUEM CHEGA AO LIMITE
+        fitness_limite = avaliador_etapas.fitness_maximo if avaliador_etapas else calcular_fitness(passos_maximos, morreu=False)
+        populacao.config.fitness_threshold = min(populacao.config.fitness_threshold, fitness_limite)
+
+    geracoes_restantes = max(0, GERACOES_TREINO - populacao.generation)
+    try:
+        if avaliador_etapas:
+            avaliador_etapas.paralelo = AvaliadorParalelo(processos, medidor=medidor) if processos > 1 else None
+            try:
+                populacao.run(avaliador_etapas.avaliar, geracoes_restantes)
+            finally:
+                if avaliador_etapas.paralelo:
+                    avaliador_etapas.paralelo.fechar()
+        elif processos > 1:
+            avaliador = AvaliadorParalelo(
+                processos, pasta_replay=pasta_replay, medidor=medidor, cache=cache, passos_maximos=passos_maximos
+            )
+            try:
+                populacao.run(avaliador.avaliar, geracoes_restantes)
+            finally:
+                avaliador.fechar()
+        else:
+            exibicao = None if headless else exibicao or Exibicao()
+            avaliar = partial(
+                eval_genomes, headless=headless, pasta_replay=pasta_replay, medidor=medidor, exibicao=exibicao,
+                cache=cache, passos_maximos=passos_maximos
+            )
+            populacao.run(avaliar, geracoes_restantes)
+    except (AbortTraining, KeyboardInterrupt):
+        print("Treino interrompido.")
+        if intervalo_checkpoint:
+            checkpointer.salvar_interrupcao(populacao)
+
+    if cache and cache.acertos:
+        print(f"Cache de fitness: {cache.acertos} de {cache.consultas} genomas não precisaram ser simulados.")
+
+    if campeao and populacao.best_genome is not None:
+        exportar_campeao(populacao.best_genome, populacao.config, campeao)
+
+def exportar_campeao(genome: neat.DefaultGenome, config: neat.Config, caminho: str) -> None:
+    """
+    Exporta um genoma como RedeCompilada, que roda sem o neat-python.
+
+    Args:
+        genome (neat.DefaultGenome): Genoma a exportar.
+        config (neat.Config): Configuração do NEAT.
+        caminho (str): Caminho do arquivo .npz.
+
+    Returns:
+        None
+    """
+    compilar_genoma(genome, config).salvar(caminho, fitness=genome.fitness, chave=genome.key, geracao=geracao)
+    print(f"Campeão (fitness {genome.fitness}) exportado para {caminho}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Treina o Flappy Bird com NEAT.")
+    parser.add_argument("--headless", action="store_true", help="treina sem janela e sem limite de framerate")
+    parser.add_argument("--processos", type=int, default=1, help="quantidade de processos que avaliam a população (implica --headless)")
+    parser.add_argument("--semente", type=int, default=None, help="semente que torna o treino reproduzível")
+    parser.add_argument("--checkpoint", type=int, default=0, metavar="N", help="salva um checkpoint a cada N gerações e ao interromper o treino")
+    parser.add_argument("--pasta-checkpoint", default="checkpoints", help="pasta dos checkpoints")
+    parser.add_argument("--retomar", default=None, metavar="ARQUIVO", help="continua o treino a partir de um checkpoint")
+    parser.add_argument("--campeao", default="campeao.npz", metavar="ARQUIVO", help="onde exportar o melhor genoma ao fim do treino")
+    parser.add_argument("--gravar", default=None, metavar="PASTA", help="salva o replay de cada geração nesta pasta")
+    parser.add_argument("--telemetria", default=None, metavar="ARQUIVO", help="acrescenta as medições de cada geração neste arquivo (.jsonl ou .csv)")
+    parser.add_argument("--perfil", default=None, metavar="ARQUIVO", help="mede cada fase de cada passo e salva percentis e histogramas neste JSON")
+    parser.add_argument("--cprofile", default=None, metavar="ARQUIVO", help="salva as estatísticas do cProfile do treino neste arquivo .pstats")
+    parser.add_argument("--desenhar-a-cada", type=int, default=1, metavar="N", help="desenha só uma geração a cada N; as outras rodam sem limite de framerate")
+    parser.add_argument("--melhores", type=int, default=None, metavar="K", help="desenha no máximo K passaros, os de maior fitness na geração anterior")
+    parser.add_argument("--percurso-fixo", type=int, default=None, metavar="SEMENTE", help="usa o mesmo percurso em todas as gerações, sem simular de novo genomas já avaliados")
+    parser.add_argument("--cache", type=int, default=TAMANHO_CACHE_FITNESS, metavar="N", help="quantidade máxima de fitness guardados pelo cache (0 desativa)")
+    parser.add_argument("--passos-maximos", type=int, default=PASSOS_MAXIMOS_EPISODIO, metavar="N", help="limite de passos de cada episódio (0 para sem limite)")
+    parser.add_argument("--etapas", action="store_true", help="avalia em etapas: só os melhores de cada etapa jogam episódios mais longos e em mais percursos (implica --headless)")
+    parser.add_argument("--percursos", type=int, default=1, metavar="K", help=f"avalia cada genoma em K percursos por geração, todos ao mesmo tempo (por exemplo, {PERCURSOS_AVALIACAO}; implica --headless)")
+    parser.add_argument("--reducao", choices=REDUCOES, default=REDUCAO_FITNESS, help=f"como os fitness de vários percursos viram um só ('quantil' usa o quantil {QUANTIL_FITNESS})")
+    parser.add_argument("--sem-parada", action="store_true", help="continua o treino depois que um genoma chega ao limite de passos")
+    parser.add_argument("--turbo", action="store_true", help="começa sem desenhar nem limitar o framerate (a tecla T alterna durante o treino)")
+    args = parser.parse_args()
+
     caminho_config = os.path.join(os.path.dirname(__file__), "config-feedforward.txt")
-    rodar(caminho_config)
+    perfilador = Perfilador() if args.perfil else None
+    with perfilar(perfilador, args.perfil, args.cprofile):
+        rodar(caminho_config, headless=args.headless, processos=args.processos, semente=args.semente,
+              intervalo_checkpoint=args.checkpoint, pasta_checkpoint=args.pasta_checkpoint, retomar=args.retomar,
+              campeao=args.campeao, pasta_replay=args.gravar,
+              telemetria=args.telemetria, perfilador=perfilador,
+              exibicao=Exibicao(args.desenhar_a_cada, args.melhores, args.turbo),
+              fixar_percurso=args.percurso_fixo, tamanho_cache=args.cache,
+              passos_maximos=args.passos_maximos or None, parar_ao_resolver=not args.sem_parada,
+              etapas=args.etapas, percursos=args.percursos, reducao=args.reducao)
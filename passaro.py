@@ -1,21 +1,23 @@
 import pygame as pg
 from pygame import Vector2
 from constants import *
-from os.path import join
+from recursos import carregar_sprite, carregar_sprite_rotacionado, SPRITES_PASSARO, ROTACAO_MINIMA_PASSARO
 
 class Passaro:
     def __init__(
             self,
             tela:               pg.Surface,
             posicao:            Vector2,
-            dimensoes_sprite:   Vector2,
-            hitbox:             pg.Rect
+            dimensoes_sprite:   Vector2
     ) -> None:
         """
         Inicializa o passaro com suas características iniciais.
+
+        A física do passaro fica na Simulacao; esta classe só guarda o que é
+        necessário para desenhá-lo.
+
         Args:
             tela (pg.Surface): Superfície na qual é desenhado o passaro.
-            sprites (list[pg.Surface]): Sprites do passaro.
             posicao (Vector2): Posição inicial do passaro.
             dimensoes_sprite (Vector2): Dimensões dos sprites do passaro (largura, altura).
         Returns:
@@ -23,53 +25,13 @@ class Passaro:
         """
         self.tela: pg.Surface           = tela
         self.posicao: Vector2           = posicao
-        self.velocidade_y: float        = 0
         self.dimensoes_sprite: Vector2  = dimensoes_sprite
         self.frame_atual: int           = 0
         self.tempo_animacao: float      = 0.0
         self.intervalo_frame: float     = 0.07
-        self.angulo: int                = -20
-        self.hitbox: pg.Rect            = hitbox
-    
-        caminhos: list[str] = [
-            join("img", 'flap1.png'),
-            join("img", 'flap2.png'),
-            join("img", 'flap3.png')
-        ]
-
-        self.sprites: list[pg.Surface] = [
-            pg.image.load(caminhos[0]).convert_alpha(),
-            pg.image.load(caminhos[1]).convert_alpha(),
-            pg.image.load(caminhos[2]).convert_alpha()
-        ]
+        self.angulo: float              = -20
     
-    def atualizar_hitbox(self) -> None:
-        self.hitbox.topleft = (
-            self.posicao.x,
-            self.posicao.y
-        )
-
-    def aplicar_gravidade(self, delta_time: float) -> None:
-        """
-        Aplica a gravidade ao passaro.
-
-        Args:
-            delta_time (float): Tempo decorrido desde o ultimo frame.
-        Returns:
-            None
-        """
-        self.velocidade_y   += CONSTANTE_GRAVITACIONAL * delta_time
-        self.posicao.y      += self.velocidade_y * delta_time
-
-    def aplicar_pulo(self) -> None:
-        """
-        Aplica o pulo ao passaro.
-
-        Returns:
-            None
-        """
-        self.angulo = -20
-        self.velocidade_y = -FORCA_PULO
+        self.sprites: list[pg.Surface] = [carregar_sprite(nome) for nome in SPRITES_PASSARO]
     
     def aplicar_animacao(self, delta_time: float) -> None:
         """
@@ -87,24 +49,24 @@ class Passaro:
                 self.frame_atual = 0
             else:
                 self.frame_atual += 1
-    
-    def aplicar_angulo(self, delta_time: float) -> None:
+
+    def sprite_atual(self) -> pg.Surface:
         """
-        Aplica o ângulo ao passaro.
+        Retorna o sprite do quadro atual da animação, rotacionado pelo ângulo do passaro.
 
-        Args:
-            delta_time (float): Tempo decorrido desde o ultimo frame.
         Returns:
-            None
+            pg.Surface: O sprite.
         """
-        self.angulo = self.angulo + VELOCIDADE_ANGULO * delta_time
-        self.sprite_rotacionado = pg.transform.rotate(self.sprites[self.frame_atual - 1], max(-100, -self.angulo))
+        return carregar_sprite_rotacionado(
+            SPRITES_PASSARO[self.frame_atual - 1],
+            max(ROTACAO_MINIMA_PASSARO, -self.angulo)
+        )
 
-    def desenhar(self) -> None:
+    def desenhar(self) -> pg.Rect:
         """
         Desenha o passaro na tela.
 
         Returns:
-            None
+            pg.Rect: Região da tela desenhada.
         """
-        self.tela.blit(self.sprite_rotacionado, self.posicao)
+        return self.tela.blit(self.sprite_atual(), self.posicao)
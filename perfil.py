@@ -0,0 +1,135 @@
+import json
+import cProfile
+import numpy as np
+from array import array
+from functools import partial
+from time import perf_counter
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Iterator, Optional
+from medicao import MedidorFases
+
+# LIMITES (EM MS) DAS FAIXAS DOS HISTOGRAMAS; A ULTIMA FAIXA VAI ATE O INFINITO
+FAIXAS_HISTOGRAMA: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66)
+
+class Perfilador(MedidorFases):
+    def __init__(self) -> None:
+        """
+        MedidorFases que, além dos totais, guarda quanto cada fase levou em cada quadro
+        (no jogo, um quadro desenhado; no treino, um passo da simulação), para calcular
+        percentis e histogramas e encontrar os quadros lentos.
+
+        As amostras não são descartadas por zerar, que continua zerando só os totais usados
+        pela telemetria.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        # ARRAYS DE DOUBLES: 8 BYTES POR AMOSTRA, MESMO EM TREINOS LONGOS
+        self.amostras: defaultdict[str, array]      = defaultdict(partial(array, 'd'))
+        self.quadro_atual: defaultdict[str, float]  = defaultdict(float)
+        self.inicio_quadro: float                   = perf_counter()
+
+    def marcar(self, fase: str, inicio: float) -> float:
+        agora = perf_counter()
+        self.tempos[fase] += agora - inicio
+        self.quadro_atual[fase] += agora - inicio
+        return agora
+
+    def inicio_quadros(self) -> None:
+        # O TEMPO ENTRE DOIS LACOS (POR EXEMPLO, A REPRODUCAO DO NEAT) NAO CONTA COMO QUADRO
+        self.quadro_atual.clear()
+        self.inicio_quadro = perf_counter()
+
+    def fim_quadro(self) -> None:
+        agora = perf_counter()
+        for fase, tempo in self.quadro_atual.items():
+            self.amostras[fase].append(tempo)
+        self.amostras['quadro'].append(agora - self.inicio_quadro)
+        self.quadro_atual.clear()
+        self.inicio_quadro = agora
+
+    def exportar(self) -> dict:
+        medicao = super().exportar()
+        medicao['amostras'] = dict(self.amostras)
+        return medicao
+
+    def somar(self, medicao: dict) -> None:
+        super().somar(medicao)
+        for fase, tempos in medicao.get('amostras', {}).items():
+            self.amostras[fase].extend(tempos)
+
+    def relatorio(self) -> dict:
+        """
+        Resume as amostras de cada fase.
+
+        Returns:
+            dict: Para cada fase, a quantidade de amostras, a média, os percentis 50, 90 e 99,
+                o máximo (em ms) e o histograma nas faixas de FAIXAS_HISTOGRAMA.
+        """
+        relatorio = {}
+        for fase, tempos in self.amostras.items():
+            ms = np.array(tempos, dtype=np.float64) * 1000
+            contagens = np.bincount(np.searchsorted(FAIXAS_HISTOGRAMA, ms), minlength=len(FAIXAS_HISTOGRAMA) + 1)
+            nomes_faixas = [f'<{limite}' for limite in FAIXAS_HISTOGRAMA] + [f'>={FAIXAS_HISTOGRAMA[-1]}']
+            relatorio[fase] = {
+                'amostras': len(ms),
+                'media_ms': float(ms.mean()),
+                'p50_ms': float(np.percentile(ms, 50)),
+                'p90_ms': float(np.percentile(ms, 90)),
+                'p99_ms': float(np.percentile(ms, 99)),
+                'max_ms': float(ms.max()),
+                'histograma_ms': {nome: int(c) for nome, c in zip(nomes_faixas, contagens) if c}
+            }
+        return relatorio
+
+    def imprimir(self) -> None:
+        """
+        Mostra uma tabela com os percentis de cada fase, da mais lenta para a mais rápida.
+
+        Returns:
+            None
+        """
+        relatorio = self.relatorio()
+        print(f"{'fase':<18}{'amostras':>10}{'media':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)")
+        for fase, dados in sorted(relatorio.items(), key=lambda item: -item[1]['p99_ms']):
+            print(
+                f"{fase:<18}{dados['amostras']:>10}{dados['media_ms']:>10.3f}{dados['p50_ms']:>10.3f}"
+                f"{dados['p90_ms']:>10.3f}{dados['p99_ms']:>10.3f}{dados['max_ms']:>10.3f}"
+            )
+
+@contextmanager
+def perfilar(
+        perfilador:         Optional[Perfilador],
+        caminho_relatorio:  Optional[str] = None,
+        caminho_cprofile:   Optional[str] = None
+) -> Iterator[None]:
+    """
+    Envolve um trecho (o jogo ou o treino) e, ao sair, mostra e salva o relatório do
+    perfilador e, opcionalmente, as estatísticas do cProfile (abra com pstats ou snakeviz).
+
+    Args:
+        perfilador (Perfilador, optional): Perfilador usado pelo trecho. Default é None.
+        caminho_relatorio (str, optional): Arquivo JSON do relatório. Default é None.
+        caminho_cprofile (str, optional): Arquivo .pstats do cProfile. Default é None (sem cProfile).
+
+    Returns:
+        Iterator[None]
+    """
+    perfil_cprofile = cProfile.Profile() if caminho_cprofile else None
+    if perfil_cprofile:
+        perfil_cprofile.enable()
+    try:
+        yield
+    finally:
+        if perfil_cprofile:
+            perfil_cprofile.disable()
+            perfil_cprofile.dump_stats(caminho_cprofile)
+            print(f"Estatísticas do cProfile salvas em {caminho_cprofile}")
+        if perfilador and perfilador.amostras:
+            perfilador.imprimir()
+            if caminho_relatorio:
+                with open(caminho_relatorio, 'w', encoding='utf-8') as arquivo:
+                    json.dump(perfilador.relatorio(), arquivo, indent=2)
+                print(f"Relatório do perfil salvo em {caminho_relatorio}")
@@ -0,0 +1,137 @@
+import pygame as pg
+from pygame import Vector2
+from pygame.font import Font
+from os.path import join
+from functools import lru_cache
+from typing import Optional
+from constants import *
+
+# SPRITES CARREGADOS, INDEXADOS POR (NOME DO ARQUIVO, DIMENSOES OU None PARA O TAMANHO ORIGINAL)
+_sprites: dict[tuple[str, Optional[tuple[int, int]]], pg.Surface] = {}
+# SPRITES ROTACIONADOS, INDEXADOS POR (NOME DO ARQUIVO, ANGULO QUANTIZADO)
+_rotacoes: dict[tuple[str, int], pg.Surface] = {}
+
+PASSO_ROTACAO: int          = 1 # RESOLUCAO (EM GRAUS) DAS ROTACOES GUARDADAS
+ROTACAO_MINIMA_PASSARO: int = -100 # MENOR ROTACAO USADA AO DESENHAR O PASSARO (CAINDO)
+ROTACAO_MAXIMA_PASSARO: int = 20 # MAIOR ROTACAO USADA AO DESENHAR O PASSARO (LOGO APOS O PULO)
+TAMANHO_CACHE_TEXTO: int    = 256 # QUANTIDADE DE TEXTOS RENDERIZADOS GUARDADOS
+
+SPRITES_PASSARO: tuple[str, ...] = ('flap1.png', 'flap2.png', 'flap3.png')
+SPRITES_JOGO: tuple[tuple[str, Optional[Vector2]], ...] = (
+    ('fundo.png', Vector2(LARGURA_TELA, ALTURA_TELA)),
+    ('chao.png', DIMENSOES_CHAO),
+    ('arvores.png', DIMENSOES_ARVORE),
+    ('predios.png', DIMENSOES_PREDIO),
+    ('nuvens.png', DIMENSOES_NUVEM),
+    ('cano.png', DIMENSOES_CANO),
+) + tuple((nome, None) for nome in SPRITES_PASSARO)
+
+def carregar_sprite(nome: str, dimensoes: Optional[Vector2] = None) -> pg.Surface:
+    """
+    Retorna um sprite da pasta img, carregando, convertendo e redimensionando só na primeira vez.
+
+    A superfície retornada é compartilhada por todos que pedirem o mesmo sprite, então não
+    deve ser modificada. Exige que a janela (ou o driver dummy) já tenha sido criada.
+
+    Args:
+        nome (str): Nome do arquivo dentro da pasta img.
+        dimensoes (Vector2, optional): Dimensões do sprite (largura, altura). Default é None
+            (tamanho original).
+    Returns:
+        pg.Surface: O sprite.
+    """
+    chave = (nome, (int(dimensoes.x), int(dimensoes.y)) if dimensoes else None)
+    sprite = _sprites.get(chave)
+    if sprite is None:
+        if dimensoes:
+            sprite = pg.transform.scale(carregar_sprite(nome), chave[1])
+        else:
+            sprite = pg.image.load(join("img", nome)).convert_alpha()
+        _sprites[chave] = sprite
+    return sprite
+
+def carregar_sprite_rotacionado(nome: str, angulo: float) -> pg.Surface:
+    """
+    Retorna um sprite da pasta img (no tamanho original) rotacionado, com o ângulo arredondado
+    para múltiplos de PASSO_ROTACAO. Cada rotação é calculada uma única vez.
+
+    Args:
+        nome (str): Nome do arquivo dentro da pasta img.
+        angulo (float): Ângulo de rotação em graus (sentido anti-horário).
+    Returns:
+        pg.Surface: O sprite rotacionado.
+    """
+    chave = (nome, int(round(angulo / PASSO_ROTACAO)) * PASSO_ROTACAO)
+    sprite = _rotacoes.get(chave)
+    if sprite is None:
+        sprite = pg.transform.rotate(carregar_sprite(nome), chave[1])
+        _rotacoes[chave] = sprite
+    return sprite
+
+def redimensionar(sprite: pg.Surface, dimensoes: Vector2) -> pg.Surface:
+    """
+    Redimensiona um sprite, sem criar uma nova superfície se ele já tiver as dimensões pedidas.
+
+    Args:
+        sprite (pg.Surface): Sprite original.
+        dimensoes (Vector2): Dimensões desejadas (largura, altura).
+    Returns:
+        pg.Surface: O sprite nas dimensões pedidas.
+    """
+    if sprite.get_size() == (int(dimensoes.x), int(dimensoes.y)):
+        return sprite
+    return pg.transform.scale(sprite, dimensoes)
+
+@lru_cache(maxsize=None)
+def carregar_fonte(tamanho: int) -> Font:
+    """
+    Retorna a fonte do jogo no tamanho pedido, lendo o arquivo .ttf só uma vez por tamanho.
+
+    Args:
+        tamanho (int): Tamanho da fonte.
+    Returns:
+        Font: A fonte.
+    """
+    return Font(join("font", 'flappy_bird.ttf'), tamanho)
+
+@lru_cache(maxsize=TAMANHO_CACHE_TEXTO)
+def renderizar_texto(texto: str, tamanho: int, cor: tuple[int, int, int]) -> pg.Surface:
+    """
+    Renderiza um texto com a fonte do jogo. Os textos mais recentes ficam guardados, então
+    um placar que não mudou não é renderizado de novo.
+
+    Args:
+        texto (str): Texto a ser renderizado.
+        tamanho (int): Tamanho da fonte.
+        cor (tuple[int, int, int]): Cor do texto (RGB).
+    Returns:
+        pg.Surface: Superfície com o texto (compartilhada, não deve ser modificada).
+    """
+    return carregar_fonte(tamanho).render(texto, True, cor)
+
+def precarregar() -> None:
+    """
+    Carrega de uma vez todos os sprites usados pelo jogo, incluindo todas as rotações do passaro.
+
+    Returns:
+        None
+    """
+    for nome, dimensoes in SPRITES_JOGO:
+        carregar_sprite(nome, dimensoes)
+
+    for nome in SPRITES_PASSARO:
+        for angulo in range(ROTACAO_MINIMA_PASSARO, ROTACAO_MAXIMA_PASSARO + 1, PASSO_ROTACAO):
+            carregar_sprite_rotacionado(nome, angulo)
+
+def limpar() -> None:
+    """
+    Descarta os sprites, fontes e textos carregados (necessário antes de pg.quit, depois do
+    qual as superfícies convertidas para a janela antiga e as fontes deixam de valer).
+
+    Returns:
+        None
+    """
+    _sprites.clear()
+    _rotacoes.clear()
+    carregar_fonte.cache_clear()
+    renderizar_texto.cache_clear()
@@ -0,0 +1,298 @@
+import math
+import json
+import numpy as np
+from typing import Any, Sequence
+
+# FUNCOES DO NEAT SUPORTADAS (AS UNICAS PERMITIDAS PELO config-feedforward.txt)
+ATIVACOES_SUPORTADAS: tuple[str, ...]   = ('tanh_activation',)
+AGREGACOES_SUPORTADAS: tuple[str, ...]  = ('sum_aggregation',)
+
+VERSAO_FORMATO: int = 1 # VERSAO DO ARQUIVO .npz GERADO POR RedeCompilada.salvar
+
+_tanh_exata = np.frompyfunc(math.tanh, 1, 1)
+
+def tanh_neat(z: np.ndarray, exato: bool = True) -> np.ndarray:
+    """
+    Aplica a ativação tanh do NEAT (tanh(2.5 * z), com z limitado a [-60, 60]).
+
+    Args:
+        z (np.ndarray): Valores de entrada.
+        exato (bool, optional): Se True, usa math.tanh elemento a elemento, dando exatamente o
+            mesmo resultado do NEAT. Se False, usa np.tanh, que é mais rápido mas pode diferir
+            na última casa decimal. Default é True.
+
+    Returns:
+        np.ndarray: Valores ativados.
+    """
+    z = np.clip(2.5 * z, -60.0, 60.0)
+    if exato:
+        return _tanh_exata(z).astype(np.float64)
+    return np.tanh(z)
+
+class RedeCompilada:
+    def __init__(
+            self,
+            quantidade_entradas:    int,
+            saidas:                 np.ndarray,
+            nos:                    np.ndarray,
+            vieses:                 np.ndarray,
+            respostas:              np.ndarray,
+            inicio_ligacoes:        np.ndarray,
+            origens:                np.ndarray,
+            pesos:                  np.ndarray
+    ) -> None:
+        """
+        Forma compacta de uma rede feed-forward do NEAT, só com arrays do NumPy.
+
+        Cada valor da rede ocupa uma posição: primeiro as entradas, depois os nós
+        calculados na ordem topológica e, por fim, uma posição sempre zerada usada por
+        saídas desconectadas. As ligações do nó i são origens/pesos[inicio_ligacoes[i]:inicio_ligacoes[i + 1]].
+
+        Args:
+            quantidade_entradas (int): Quantidade de entradas da rede.
+            saidas (np.ndarray): Posição de cada saída.
+            nos (np.ndarray): Posição de cada nó calculado, em ordem topológica.
+            vieses (np.ndarray): Viés de cada nó calculado.
+            respostas (np.ndarray): Resposta (multiplicador) de cada nó calculado.
+            inicio_ligacoes (np.ndarray): Início das ligações de cada nó (tamanho len(nos) + 1).
+            origens (np.ndarray): Posição de origem de cada ligação.
+            pesos (np.ndarray): Peso de cada ligação.
+
+        Returns:
+            None
+        """
+        self.quantidade_entradas: int   = quantidade_entradas
+        self.saidas: np.ndarray         = saidas
+        self.nos: np.ndarray            = nos
+        self.vieses: np.ndarray         = vieses
+        self.respostas: np.ndarray      = respostas
+        self.inicio_ligacoes: np.ndarray = inicio_ligacoes
+        self.origens: np.ndarray        = origens
+        self.pesos: np.ndarray          = pesos
+        self.metadados: dict            = {}
+        self.quantidade_valores: int    = quantidade_entradas + len(nos) + 1
+        self.profundidades: np.ndarray  = self.calcular_profundidades()
+
+        # MESMOS DADOS EM LISTAS DO PYTHON, PARA CALCULAR UMA UNICA ENTRADA SEM O CUSTO DO NUMPY
+        self.avaliacao_nos: list[tuple[int, float, float, list[tuple[int, float]]]] = [
+            (
+                no,
+                vies,
+                resposta,
+                list(zip(
+                    origens[inicio_ligacoes[i]:inicio_ligacoes[i + 1]].tolist(),
+                    pesos[inicio_ligacoes[i]:inicio_ligacoes[i + 1]].tolist()
+                ))
+            )
+            for i, (no, vies, resposta) in enumerate(zip(nos.tolist(), vieses.tolist(), respostas.tolist()))
+        ]
+        self.lista_saidas: list[int] = saidas.tolist()
+
+    @staticmethod
+    def de_rede(rede: Any) -> 'RedeCompilada':
+        """
+        Compila uma neat.nn.FeedForwardNetwork.
+
+        Args:
+            rede (FeedForwardNetwork): Rede criada com FeedForwardNetwork.create.
+
+        Returns:
+            RedeCompilada: A rede compilada.
+        """
+        posicoes: dict[int, int] = {no: i for i, no in enumerate(rede.input_nodes)}
+        for i, (no, *_) in enumerate(rede.node_evals):
+            posicoes[no] = len(rede.input_nodes) + i
+        posicao_zero = len(rede.input_nodes) + len(rede.node_evals)
+
+        vieses, respostas, inicio_ligacoes, origens, pesos = [], [], [0], [], []
+        for no, ativacao, agregacao, vies, resposta, ligacoes in rede.node_evals:
+            if ativacao.__name__ not in ATIVACOES_SUPORTADAS:
+                raise ValueError(f"Ativação não suportada: {ativacao.__name__}")
+            if agregacao.__name__ not in AGREGACOES_SUPORTADAS:
+                raise ValueError(f"Agregação não suportada: {agregacao.__name__}")
+
+            vieses.append(vies)
+            respostas.append(resposta)
+            for origem, peso in ligacoes:
+                origens.append(posicoes.get(origem, posicao_zero))
+                pesos.append(peso)
+            inicio_ligacoes.append(len(origens))
+
+        return RedeCompilada(
+            quantidade_entradas=len(rede.input_nodes),
+            saidas=np.array([posicoes.get(no, posicao_zero) for no in rede.output_nodes], dtype=np.int64),
+            nos=np.arange(len(rede.input_nodes), posicao_zero, dtype=np.int64),
+            vieses=np.array(vieses, dtype=np.float64),
+            respostas=np.array(respostas, dtype=np.float64),
+            inicio_ligacoes=np.array(inicio_ligacoes, dtype=np.int64),
+            origens=np.array(origens, dtype=np.int64),
+            pesos=np.array(pesos, dtype=np.float64)
+        )
+
+    def calcular_profundidades(self) -> np.ndarray:
+        """
+        Calcula a profundidade de cada nó calculado (1 + a maior profundidade de suas origens).
+
+        Returns:
+            np.ndarray: Profundidade de cada nó, na ordem de self.nos.
+        """
+        profundidade_valor = np.zeros(self.quantidade_valores, dtype=np.int64)
+        for i, no in enumerate(self.nos.tolist()):
+            origens = self.origens[self.inicio_ligacoes[i]:self.inicio_ligacoes[i + 1]]
+            profundidade_valor[no] = 1 + (profundidade_valor[origens].max() if len(origens) else 0)
+        return profundidade_valor[self.nos]
+
+    def ativar(self, entradas: Sequence[float]) -> list[float]:
+        """
+        Calcula as saídas da rede para uma entrada, com exatamente o mesmo resultado de
+        FeedForwardNetwork.activate. Para muitas redes de uma vez, use LoteRedes.
+
+        Args:
+            entradas (Sequence[float]): Valores das entradas.
+
+        Returns:
+            list[float]: Valores das saídas.
+        """
+        valores = [0.0] * self.quantidade_valores
+        valores[:self.quantidade_entradas] = entradas
+        for no, vies, resposta, ligacoes in self.avaliacao_nos:
+            soma = 0.0
+            for origem, peso in ligacoes:
+                soma += valores[origem] * peso
+            valores[no] = math.tanh(max(-60.0, min(60.0, 2.5 * (vies + resposta * soma))))
+        return [valores[saida] for saida in self.lista_saidas]
+
+    def salvar(self, caminho: str, **metadados: Any) -> None:
+        """
+        Salva a rede num arquivo .npz versionado, que pode ser carregado sem o neat-python.
+
+        Args:
+            caminho (str): Caminho do arquivo.
+            **metadados: Informações extras (fitness, geração...) salvas em JSON junto da rede.
+
+        Returns:
+            None
+        """
+        np.savez_compressed(
+            caminho,
+            versao=np.int64(VERSAO_FORMATO),
+            quantidade_entradas=np.int64(self.quantidade_entradas),
+            saidas=self.saidas,
+            nos=self.nos,
+            vieses=self.vieses,
+            respostas=self.respostas,
+            inicio_ligacoes=self.inicio_ligacoes,
+            origens=self.origens,
+            pesos=self.pesos,
+            metadados=np.array(json.dumps(metadados))
+        )
+
+    @staticmethod
+    def carregar(caminho: str) -> 'RedeCompilada':
+        """
+        Carrega uma rede salva com salvar.
+
+        Args:
+            caminho (str): Caminho do arquivo .npz.
+
+        Returns:
+            RedeCompilada: A rede carregada (os metadados ficam em rede.metadados).
+        """
+        with np.load(caminho, allow_pickle=False) as dados:
+            if int(dados['versao']) != VERSAO_FORMATO:
+                raise ValueError(f"Versão de rede não suportada: {int(dados['versao'])}")
+            rede = RedeCompilada(
+                quantidade_entradas=int(dados['quantidade_entradas']),
+                saidas=dados['saidas'],
+                nos=dados['nos'],
+                vieses=dados['vieses'],
+                respostas=dados['respostas'],
+                inicio_ligacoes=dados['inicio_ligacoes'],
+                origens=dados['origens'],
+                pesos=dados['pesos']
+            )
+            rede.metadados = json.loads(str(dados['metadados']))
+        return rede
+
+class LoteRedes:
+    def __init__(self, redes: Sequence[RedeCompilada]) -> None:
+        """
+        Junta várias redes compiladas para calculá-las todas de uma vez.
+
+        Os valores de todas as redes ficam em um único array; os nós de mesma profundidade
+        de todas as redes formam uma camada, e cada camada é calculada com operações do
+        NumPy, somando as ligações na mesma ordem que o NEAT para dar resultados idênticos.
+
+        Args:
+            redes (Sequence[RedeCompilada]): Redes a serem calculadas juntas. Todas precisam
+                ter a mesma quantidade de entradas e de saídas.
+
+        Returns:
+            None
+        """
+        self.quantidade_redes: int = len(redes)
+        deslocamentos = np.cumsum([0] + [rede.quantidade_valores for rede in redes])
+        self.quantidade_valores: int = int(deslocamentos[-1]) + 1
+        posicao_zero = self.quantidade_valores - 1
+
+        quantidade_entradas = redes[0].quantidade_entradas if redes else 0
+        self.entradas: np.ndarray = np.array(
+            [deslocamento + np.arange(quantidade_entradas) for deslocamento in deslocamentos[:-1]],
+            dtype=np.int64
+        ).reshape(len(redes), quantidade_entradas)
+        self.saidas: np.ndarray = np.array(
+            [deslocamento + rede.saidas for rede, deslocamento in zip(redes, deslocamentos)],
+            dtype=np.int64
+        ).reshape(len(redes), -1)
+
+        nos_por_profundidade: dict[int, list[tuple[int, float, float, np.ndarray, np.ndarray]]] = {}
+        for rede, deslocamento in zip(redes, deslocamentos.tolist()):
+            for i, no in enumerate(rede.nos.tolist()):
+                inicio, fim = rede.inicio_ligacoes[i], rede.inicio_ligacoes[i + 1]
+                nos_por_profundidade.setdefault(int(rede.profundidades[i]), []).append((
+                    deslocamento + no,
+                    rede.vieses[i],
+                    rede.respostas[i],
+                    deslocamento + rede.origens[inicio:fim],
+                    rede.pesos[inicio:fim]
+                ))
+
+        self.camadas: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        for profundidade in sorted(nos_por_profundidade):
+            nos = nos_por_profundidade[profundidade]
+            maximo_ligacoes = max(len(origens) for *_, origens, _ in nos)
+            origens = np.full((len(nos), maximo_ligacoes), posicao_zero, dtype=np.int64)
+            pesos = np.zeros((len(nos), maximo_ligacoes), dtype=np.float64)
+            for j, (*_, origens_no, pesos_no) in enumerate(nos):
+                origens[j, :len(origens_no)] = origens_no
+                pesos[j, :len(pesos_no)] = pesos_no
+
+            self.camadas.append((
+                np.array([no[0] for no in nos], dtype=np.int64),
+                np.array([no[1] for no in nos], dtype=np.float64),
+                np.array([no[2] for no in nos], dtype=np.float64),
+                origens,
+                pesos
+            ))
+
+    def ativar(self, entradas: np.ndarray, exato: bool = True) -> np.ndarray:
+        """
+        Calcula as saídas de todas as redes para um passo.
+
+        Args:
+            entradas (np.ndarray): Matriz (quantidade_redes, quantidade_entradas).
+            exato (bool, optional): Veja tanh_neat. Default é True.
+
+        Returns:
+            np.ndarray: Matriz (quantidade_redes, quantidade_saidas).
+        """
+        valores = np.zeros(self.quantidade_valores, dtype=np.float64)
+        valores[self.entradas] = entradas
+
+        for nos, vieses, respostas, origens, pesos in self.camadas:
+            soma = np.zeros(len(nos), dtype=np.float64)
+            for k in range(origens.shape[1]):
+                soma += valores[origens[:, k]] * pesos[:, k]
+            valores[nos] = tanh_neat(vieses + respostas * soma, exato)
+
+        return valores[self.saidas]
@@ -0,0 +1,212 @@
+import pygame as pg
+from pygame import Rect
+from constants import *
+from enfeite import Enfeite
+from cano import Cano
+from passaro import Passaro
+
+class CamadaParalaxe:
+    def __init__(self, enfeites: list[Enfeite]) -> None:
+        """
+        Camada do cenário que rola na horizontal (nuvens, prédios, árvores ou chão), desenhada
+        com um único blit por quadro.
+
+        O sprite é repetido uma única vez numa faixa com a largura do sprite mais a da tela;
+        como os enfeites de uma camada andam juntos e são reposicionados de uma largura de
+        sprite por vez, a parte visível é sempre um recorte dessa faixa. Os enfeites continuam
+        guardando a posição e a velocidade da camada.
+
+        Args:
+            enfeites (list[Enfeite]): Enfeites da camada, todos com o mesmo sprite.
+
+        Returns:
+            None
+        """
+        self.enfeites: list[Enfeite]    = enfeites
+        sprite: pg.Surface              = enfeites[0].sprite
+        self.largura: int               = sprite.get_width()
+        self.y: int                     = int(enfeites[0].posicao.y)
+        self.recorte: Rect              = Rect(0, 0, LARGURA_TELA, sprite.get_height())
+
+        # SPRITES SEM TRANSPARENCIA (O CHAO) VIRAM UMA FAIXA OPACA, BEM MAIS RAPIDA DE COPIAR
+        transparente = bool(sprite.get_flags() & pg.SRCALPHA) and pg.surfarray.array_alpha(sprite).min() < 255
+        tamanho = (self.largura + LARGURA_TELA, sprite.get_height())
+        if transparente:
+            self.faixa: pg.Surface = pg.Surface(tamanho, pg.SRCALPHA).convert_alpha()
+        else:
+            self.faixa = pg.Surface(tamanho).convert()
+        for x in range(0, tamanho[0], self.largura):
+            # BLEND_RGBA_MAX SOBRE A FAIXA VAZIA COPIA OS PIXELS (INCLUSIVE O ALFA) SEM MISTURAR
+            self.faixa.blit(sprite, (x, 0), special_flags=pg.BLEND_RGBA_MAX if transparente else 0)
+
+    def movimentar(self, delta_time: float) -> None:
+        """
+        Move os enfeites da camada.
+
+        Args:
+            delta_time (float): Tempo decorrido desde o ultimo frame.
+
+        Returns:
+            None
+        """
+        for enfeite in self.enfeites:
+            enfeite.movimentar(delta_time)
+
+    def desenhar(self, tela: pg.Surface) -> None:
+        """
+        Desenha a parte visível da camada.
+
+        Args:
+            tela (pg.Surface): Superfície na qual a camada é desenhada.
+
+        Returns:
+            None
+        """
+        # O BLIT TRUNCA A POSICAO DO ENFEITE, ENTAO O RECORTE TAMBEM
+        self.recorte.x = -int(self.enfeites[0].posicao.x) % self.largura
+        tela.blit(self.faixa, (0, self.y), self.recorte)
+
+class Renderizador:
+    def __init__(
+            self,
+            tela:       pg.Surface,
+            fundo:      Enfeite,
+            camadas:    list[list[Enfeite]],
+            chaos:      list[Enfeite]
+    ) -> None:
+        """
+        Desenha os quadros do jogo redesenhando só o que muda.
+
+        O céu é estático: a cada quadro, só as regiões onde houve canos, passaros e textos no
+        quadro anterior são restauradas a partir de uma cópia opaca do fundo. A faixa de baixo
+        (nuvens, prédios, árvores e chão), que rola o tempo todo, é redesenhada inteira. Ao
+        apresentar, só essas regiões são enviadas para a janela.
+
+        A tela sempre contém o quadro completo, então pode ser lida (por exemplo, para exportar).
+        Tudo o que for desenhado fora do Renderizador deve ser informado com registrar.
+
+        Args:
+            tela (pg.Surface): Superfície da janela.
+            fundo (Enfeite): Fundo estático, do tamanho da tela.
+            camadas (list[list[Enfeite]]): Camadas desenhadas atrás dos canos, de trás para frente.
+            chaos (list[Enfeite]): Enfeites do chão, desenhado na frente de tudo.
+
+        Returns:
+            None
+        """
+        self.tela: pg.Surface               = tela
+        self.fundo: pg.Surface              = fundo.sprite.convert()
+        self.camadas: list[CamadaParalaxe]  = [CamadaParalaxe(enfeites) for enfeites in camadas]
+        self.chao: CamadaParalaxe           = CamadaParalaxe(chaos)
+
+        topo = min(camada.y for camada in self.camadas + [self.chao])
+        self.ceu: Rect              = Rect(0, 0, LARGURA_TELA, topo)
+        self.faixa: Rect            = Rect(0, topo, LARGURA_TELA, ALTURA_TELA - topo)
+        self.sujos: list[Rect]      = [] # REGIOES DESENHADAS NO QUADRO ATUAL
+        self.anteriores: list[Rect] = [] # REGIOES DESENHADAS NO QUADRO ANTERIOR
+        self.tela_inteira: bool     = True # O PROXIMO QUADRO REDESENHA A TELA INTEIRA
+        self.quadro_inteiro: bool   = False # O QUADRO ATUAL FOI REDESENHADO INTEIRO
+
+    def invalidar(self) -> None:
+        """
+        Faz o próximo quadro ser desenhado e apresentado por inteiro (por exemplo, depois de
+        algo ter sido desenhado na tela sem passar pelo Renderizador).
+
+        Returns:
+            None
+        """
+        self.tela_inteira = True
+
+    def registrar(self, retangulo: Rect) -> None:
+        """
+        Informa uma região desenhada no quadro atual, para ser apresentada e depois restaurada.
+
+        Args:
+            retangulo (Rect): Região desenhada.
+
+        Returns:
+            None
+        """
+        self.sujos.append(retangulo)
+
+    def desenhar_cenario(self, delta_time: float) -> None:
+        """
+        Começa um quadro: restaura o céu sob o quadro anterior e move e desenha as camadas
+        que ficam atrás dos canos.
+
+        Args:
+            delta_time (float): Tempo decorrido desde o ultimo frame.
+
+        Returns:
+            None
+        """
+        tela = self.tela
+        self.quadro_inteiro = self.tela_inteira
+        if self.tela_inteira:
+            tela.blit(self.fundo, (0, 0))
+            self.tela_inteira = False
+        else:
+            for retangulo in self.sujos:
+                retangulo = retangulo.clip(self.ceu)
+                if retangulo:
+                    tela.blit(self.fundo, retangulo, retangulo)
+            tela.blit(self.fundo, self.faixa, self.faixa)
+        self.anteriores, self.sujos = self.sujos, []
+
+        for camada in self.camadas:
+            camada.movimentar(delta_time)
+            camada.desenhar(tela)
+
+    def desenhar_canos(self, canos: list[Cano]) -> None:
+        """
+        Desenha os canos.
+
+        Args:
+            canos (list[Cano]): Os canos.
+
+        Returns:
+            None
+        """
+        for cano in canos:
+            self.sujos.append(cano.desenhar())
+
+    def desenhar_passaros(self, passaros: list[Passaro]) -> None:
+        """
+        Desenha vários passaros num único blits.
+
+        Args:
+            passaros (list[Passaro]): Passaros a desenhar.
+
+        Returns:
+            None
+        """
+        if not passaros:
+            return
+        retangulos = self.tela.blits([(passaro.sprite_atual(), passaro.posicao) for passaro in passaros])
+        # OS PASSAROS FICAM NA MESMA COLUNA, ENTAO UM RETANGULO SO OS CONTEM SEM SOBRAR MUITO
+        self.sujos.append(retangulos[0].unionall(retangulos))
+
+    def desenhar_chao(self, delta_time: float) -> None:
+        """
+        Move e desenha o chão, terminando o cenário do quadro.
+
+        Args:
+            delta_time (float): Tempo decorrido desde o ultimo frame.
+
+        Returns:
+            None
+        """
+        self.chao.movimentar(delta_time)
+        self.chao.desenhar(self.tela)
+
+    def apresentar(self) -> None:
+        """
+        Envia para a janela as regiões que mudaram desde o quadro anterior.
+
+        Returns:
+            None
+        """
+        if self.quadro_inteiro:
+            pg.display.flip()
+            return
+        pg.display.update(self.anteriores + self.sujos + [self.faixa])
@@ -0,0 +1,236 @@
+import sys
+import zlib
+import struct
+import argparse
+import numpy as np
+from typing import Callable, Optional, Sequence
+from simulacao_vetorizada import SimulacaoVetorizada
+
+MAGICO: bytes           = b'FBRP'
+VERSAO_REPLAY: int      = 1
+# MAGICO, VERSAO, SEMENTE DO PERCURSO, QUANTIDADE DE PASSAROS E DE ABERTURAS
+CABECALHO: struct.Struct = struct.Struct('<4sBQII')
+
+class Replay:
+    def __init__(
+            self,
+            semente:    int,
+            aberturas:  Sequence[int],
+            pulos:      list[np.ndarray],
+            vivo_final: Sequence[bool]
+    ) -> None:
+        """
+        Gravação de um jogo ou de uma geração inteira, suficiente para refazê-la exatamente.
+
+        Como a simulação é determinística, basta guardar a semente do percurso e, para cada
+        passaro, se ele pulou em cada passo em que esteve vivo. As aberturas dos canos também
+        são guardadas, para conferir que o percurso refeito é o mesmo da gravação.
+
+        Args:
+            semente (int): Semente do percurso.
+            aberturas (Sequence[int]): Aberturas dos canos geradas durante a gravação.
+            pulos (list[np.ndarray]): Para cada passaro, um array booleano com um valor por
+                passo vivo (True se ele pulou no passo).
+            vivo_final (Sequence[bool]): Se cada passaro ainda estava vivo no fim da gravação.
+
+        Returns:
+            None
+        """
+        self.semente: int               = semente
+        self.aberturas: np.ndarray      = np.asarray(aberturas, dtype=np.int64)
+        self.pulos: list[np.ndarray]    = pulos
+        self.vivo_final: np.ndarray     = np.asarray(vivo_final, dtype=bool)
+        self.passos_vivo: np.ndarray    = np.array([len(p) for p in pulos], dtype=np.int64)
+
+    def salvar(self, caminho: str) -> int:
+        """
+        Escreve o replay em formato binário compactado.
+
+        Args:
+            caminho (str): Caminho do arquivo.
+
+        Returns:
+            int: Tamanho do arquivo em bytes.
+        """
+        todos_pulos = np.concatenate(self.pulos) if self.pulos else np.zeros(0, dtype=bool)
+        corpo = b''.join((
+            self.aberturas.astype('<u2').tobytes(),
+            self.passos_vivo.astype('<u4').tobytes(),
+            np.packbits(self.vivo_final).tobytes(),
+            np.packbits(todos_pulos).tobytes()
+        ))
+        dados = CABECALHO.pack(MAGICO, VERSAO_REPLAY, self.semente, len(self.pulos), len(self.aberturas))
+        dados += zlib.compress(corpo, 9)
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(dados)
+        return len(dados)
+
+    @staticmethod
+    def carregar(caminho: str) -> 'Replay':
+        """
+        Lê um replay salvo com salvar.
+
+        Args:
+            caminho (str): Caminho do arquivo.
+
+        Returns:
+            Replay: O replay lido.
+        """
+        with open(caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        magico, versao, semente, quantidade, quantidade_aberturas = CABECALHO.unpack_from(dados)
+        if magico != MAGICO:
+            raise ValueError(f"{caminho} não é um replay")
+        if versao != VERSAO_REPLAY:
+            raise ValueError(f"Versão de replay não suportada: {versao}")
+
+        corpo = zlib.decompress(dados[CABECALHO.size:])
+        inicio = 0
+        aberturas = np.frombuffer(corpo, dtype='<u2', count=quantidade_aberturas, offset=inicio)
+        inicio += aberturas.nbytes
+        passos_vivo = np.frombuffer(corpo, dtype='<u4', count=quantidade, offset=inicio).astype(np.int64)
+        inicio += 4 * quantidade
+        tamanho_vivo = (quantidade + 7) // 8
+        vivo_final = np.unpackbits(np.frombuffer(corpo, dtype=np.uint8, count=tamanho_vivo, offset=inicio), count=quantidade)
+        inicio += tamanho_vivo
+        todos_pulos = np.unpackbits(np.frombuffer(corpo, dtype=np.uint8, offset=inicio), count=int(passos_vivo.sum()))
+
+        limites = np.cumsum(passos_vivo)[:-1]
+        pulos = np.split(todos_pulos.astype(bool), limites) if quantidade else []
+        return Replay(semente, aberturas, pulos, vivo_final.astype(bool))
+
+    @staticmethod
+    def intercalar(replays: list['Replay']) -> 'Replay':
+        """
+        Junta os replays de lotes de uma mesma geração avaliados separadamente, em que o lote
+        i tem os passaros i, i + k, i + 2k... (k = quantidade de lotes), como no AvaliadorParalelo.
+
+        Args:
+            replays (list[Replay]): Replays dos lotes, na ordem dos lotes.
+
+        Returns:
+            Replay: Replay da geração com os passaros na ordem original.
+        """
+        k = len(replays)
+        pulos: list[Optional[np.ndarray]] = [None] * sum(len(r.pulos) for r in replays)
+        vivo_final = np.zeros(len(pulos), dtype=bool)
+        for i, replay in enumerate(replays):
+            pulos[i::k] = replay.pulos
+            vivo_final[i::k] = replay.vivo_final
+        # OS LOTES USAM O MESMO PERCURSO; O QUE DUROU MAIS GEROU MAIS ABERTURAS
+        aberturas = max((r.aberturas for r in replays), key=len)
+        return Replay(replays[0].semente, aberturas, pulos, vivo_final)
+
+    def acoes(self) -> np.ndarray:
+        """
+        Monta as ações de todos os passaros em todos os passos gravados.
+
+        Returns:
+            np.ndarray: Matriz booleana (passos, passaros).
+        """
+        acoes = np.zeros((int(self.passos_vivo.max(initial=0)), len(self.pulos)), dtype=bool)
+        for i, pulos in enumerate(self.pulos):
+            acoes[:len(pulos), i] = pulos
+        return acoes
+
+    def simular(self, ao_passar: Optional[Callable[[SimulacaoVetorizada], bool]] = None) -> bool:
+        """
+        Refaz a gravação e confere se o resultado é o mesmo.
+
+        Args:
+            ao_passar (Callable, optional): Função chamada depois de cada passo com a simulação
+                (por exemplo, para desenhá-la); se retornar False, a reprodução para. Default é None.
+
+        Returns:
+            bool: True se cada passaro viveu exatamente os mesmos passos da gravação e os
+                canos tiveram as mesmas aberturas.
+        """
+        acoes = self.acoes()
+        simulacao = SimulacaoVetorizada(quantidade_passaros=len(self.pulos), semente=self.semente)
+        for passo in range(len(acoes)):
+            simulacao.step(acoes[passo])
+            if ao_passar and not ao_passar(simulacao):
+                return False
+
+        aberturas = simulacao.gerador.aberturas[:len(self.aberturas)]
+        return (
+            np.array_equal(simulacao.passos_vivo, self.passos_vivo)
+            and np.array_equal(simulacao.vivo, self.vivo_final)
+            and np.array_equal(aberturas, self.aberturas)
+        )
+
+class GravadorReplay:
+    def __init__(self, quantidade_passaros: int, semente: int) -> None:
+        """
+        Grava os pulos de uma simulação passo a passo para montar um Replay.
+
+        Args:
+            quantidade_passaros (int): Quantidade de passaros da simulação.
+            semente (int): Semente do percurso da simulação.
+
+        Returns:
+            None
+        """
+        self.quantidade_passaros: int   = quantidade_passaros
+        self.semente: int               = semente
+        self.passos: list[np.ndarray]   = []
+        self.replay: Optional[Replay]   = None
+
+    def registrar(self, acoes: Sequence[bool], vivos: Sequence[bool]) -> None:
+        """
+        Registra as ações de um passo. Deve ser chamado antes do step da simulação.
+
+        Args:
+            acoes (Sequence[bool]): Se cada passaro pula no passo.
+            vivos (Sequence[bool]): Se cada passaro está vivo antes do passo.
+
+        Returns:
+            None
+        """
+        self.passos.append(np.packbits(np.asarray(acoes, dtype=bool) & np.asarray(vivos, dtype=bool)))
+
+    def finalizar(self, aberturas: Sequence[int], passos_vivo: Sequence[int], vivos: Sequence[bool]) -> Replay:
+        """
+        Monta o replay com o que foi registrado.
+
+        Args:
+            aberturas (Sequence[int]): Aberturas geradas pelo percurso da simulação.
+            passos_vivo (Sequence[int]): Passos que cada passaro viveu.
+            vivos (Sequence[bool]): Se cada passaro ainda está vivo.
+
+        Returns:
+            Replay: O replay, também guardado em self.replay.
+        """
+        n = self.quantidade_passaros
+        if self.passos:
+            acoes = np.unpackbits(np.stack(self.passos), axis=1, count=n).astype(bool)
+        else:
+            acoes = np.zeros((0, n), dtype=bool)
+        pulos = [acoes[:passos, i].copy() for i, passos in enumerate(passos_vivo)]
+        self.replay = Replay(self.semente, aberturas, pulos, vivos)
+        return self.replay
+
+def main() -> None:
+    """
+    Confere, sem janela, se os replays informados são reproduzidos exatamente.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Confere replays do Flappy Bird.")
+    parser.add_argument("arquivos", nargs="+", help="arquivos .fbr")
+    args = parser.parse_args()
+
+    todos_ok = True
+    for caminho in args.arquivos:
+        replay = Replay.carregar(caminho)
+        ok = replay.simular()
+        todos_ok &= ok
+        print(
+            f"{caminho}: {len(replay.pulos)} passaros, semente {replay.semente}, "
+            f"maior duração {replay.passos_vivo.max(initial=0)} passos - {'OK' if ok else 'DIVERGIU'}"
+        )
+    sys.exit(0 if todos_ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+from typing import Optional, Sequence
+from constants import *
+from gerador_canos import GeradorCanos
+
+X_PASSARO: float    = POSICAO_INICIAL_PASSARO.x
+Y_CHAO: float       = ALTURA_TELA - DIMENSOES_CHAO.y
+
+class EstadoPassaro:
+    __slots__ = ('y', 'y_anterior', 'velocidade_y', 'angulo', 'angulo_anterior', 'vivo', 'passos_vivo')
+
+    def __init__(self) -> None:
+        """
+        Inicializa o estado físico de um passaro na posição inicial.
+
+        Returns:
+            None
+        """
+        self.y: float               = POSICAO_INICIAL_PASSARO.y
+        self.y_anterior: float      = self.y
+        self.velocidade_y: float    = 0
+        self.angulo: float          = -20
+        self.angulo_anterior: float = self.angulo
+        self.vivo: bool             = True
+        self.passos_vivo: int       = 0
+
+class EstadoCano:
+    __slots__ = (
+        'x', 'x_anterior', 'x_direita', 'abertura',
+        'y_cano_sup', 'y_cano_inf', 'topo_cano_sup', 'base_cano_inf'
+    )
+
+    def __init__(self, x: float, abertura: int) -> None:
+        """
+        Inicializa o estado de um par de canos.
+
+        Além da posição, o par guarda sua geometria de colisão (bordas dos dois canos), que só
+        é recalculada quando ele se move ou recebe uma nova abertura.
+
+        Args:
+            x (float): Posição horizontal do par de canos.
+            abertura (int): Coordenada Y do centro da abertura entre os canos.
+
+        Returns:
+            None
+        """
+        self.x: float           = x
+        self.x_anterior: float  = x
+        self.x_direita: float   = x + DIMENSOES_CANO.x
+        self.definir_abertura(abertura)
+
+    def definir_abertura(self, abertura: int) -> None:
+        """
+        Define a abertura do par e as bordas verticais dos canos.
+
+        Args:
+            abertura (int): Coordenada Y do centro da abertura entre os canos.
+
+        Returns:
+            None
+        """
+        self.abertura: int          = abertura
+        self.y_cano_sup: float      = abertura - ABERTURA_CANO # BASE DO CANO SUPERIOR
+        self.y_cano_inf: float      = abertura + ABERTURA_CANO # TOPO DO CANO INFERIOR
+        self.topo_cano_sup: float   = self.y_cano_sup - DIMENSOES_CANO.y
+        self.base_cano_inf: float   = self.y_cano_inf + DIMENSOES_CANO.y
+
+    def mover(self, deslocamento: float) -> None:
+        """
+        Move o par de canos na horizontal.
+
+        Args:
+            deslocamento (float): Deslocamento horizontal.
+
+        Returns:
+            None
+        """
+        self.x += deslocamento
+        self.x_direita = self.x + DIMENSOES_CANO.x
+
+class Simulacao:
+    def __init__(self, quantidade_passaros: int = 1, semente: Optional[int] = None) -> None:
+        """
+        Inicializa a simulação do jogo, independente de janela e de relógio.
+
+        Cada chamada de step avança o mundo exatamente PASSO_SIMULACAO segundos, então
+        a mesma semente e as mesmas ações sempre produzem o mesmo resultado.
+
+        Args:
+            quantidade_passaros (int, optional): Quantidade de passaros simulados. Default é 1.
+            semente (int, optional): Semente do percurso (veja GeradorCanos). Default é None (aleatória).
+
+        Returns:
+            None
+        """
+        self.quantidade_passaros: int = quantidade_passaros
+        self.resetar(semente)
+
+    def resetar(self, semente: Optional[int] = None) -> None:
+        """
+        Recoloca os passaros e os canos no estado inicial.
+
+        Args:
+            semente (int, optional): Semente do percurso (veja GeradorCanos). Default é None (aleatória).
+
+        Returns:
+            None
+        """
+        self.gerador: GeradorCanos  = GeradorCanos(semente)
+        self.passos: int            = 0
+        self.pontuacao: int         = 0
+        self.idx_cano_atual: int    = 0
+        self.idx_cano_placar: int   = 0
+        self.quantidade_vivos: int  = self.quantidade_passaros
+        self.instanciar_passaros()
+        self.instanciar_canos()
+        self.atualizar_cano_coluna()
+
+    def instanciar_passaros(self) -> None:
+        """
+        Cria os passaros na posição inicial.
+
+        Returns:
+            None
+        """
+        self.passaros: list[EstadoPassaro] = [EstadoPassaro() for _ in range(self.quantidade_passaros)]
+
+    def instanciar_canos(self) -> None:
+        """
+        Cria os pares de canos à direita da tela, cada um com uma abertura sorteada.
+
+        Returns:
+            None
+        """
+        self.canos: list[EstadoCano] = []
+        for cano in range(QUANTIDADE_CANO):
+            x_cano = LARGURA_TELA + (DIMENSOES_CANO.x + DISTANCIA_ENTRE_CANOS) * (cano + 1)
+            self.canos.append(EstadoCano(x_cano, self.sortear_abertura()))
+
+    def sortear_abertura(self) -> int:
+        """
+        Retorna a coordenada Y do centro da abertura do próximo par de canos do percurso.
+
+        Returns:
+            int: Centro da abertura.
+        """
+        return self.gerador.proxima()
+
+    def step(self, acoes: Sequence[bool]) -> list[int]:
+        """
+        Avança a simulação em um passo de duração fixa.
+
+        Args:
+            acoes (Sequence[bool]): Para cada passaro, True se ele deve pular neste passo.
+
+        Returns:
+            list[int]: Índices dos passaros que morreram neste passo.
+        """
+        for cano in self.canos:
+            cano.x_anterior = cano.x
+
+        mortos: list[int] = []
+        for idx, passaro in enumerate(self.passaros):
+            passaro.y_anterior      = passaro.y
+            passaro.angulo_anterior = passaro.angulo
+
+            if passaro.vivo:
+                if acoes[idx]:
+                    self.aplicar_pulo(passaro)
+                self.aplicar_fisica(passaro)
+                passaro.passos_vivo += 1
+
+                if self.verificar_colisao_tela(passaro) or self.verificar_colisao_canos(passaro):
+                    passaro.vivo = False
+                    passaro.velocidade_y = 0
+                    mortos.append(idx)
+            elif not self.verificar_colisao_chao(passaro):
+                self.aplicar_fisica(passaro)
+
+        self.quantidade_vivos -= len(mortos)
+        self.avancar_mundo()
+        return mortos
+
+    def avancar_mundo(self) -> None:
+        """
+        Move os canos e atualiza a pontuação, desde que ainda haja algum passaro vivo.
+
+        Returns:
+            None
+        """
+        if self.quantidade_vivos > 0 or not self.quantidade_passaros:
+            self.movimentar_canos()
+            self.resetar_canos()
+            self.atualizar_cano_coluna()
+            self.atualizar_cano_atual()
+            self.passos += 1
+
+    def aplicar_pulo(self, passaro: EstadoPassaro) -> None:
+        """
+        Aplica o pulo ao passaro.
+
+        Args:
+            passaro (EstadoPassaro): O passaro que pula.
+
+        Returns:
+            None
+        """
+        passaro.angulo = -20
+        passaro.velocidade_y = -FORCA_PULO
+
+    def aplicar_fisica(self, passaro: EstadoPassaro) -> None:
+        """
+        Aplica a gravidade e a variação de ângulo ao passaro durante um passo.
+
+        Args:
+            passaro (EstadoPassaro): O passaro a ser atualizado.
+
+        Returns:
+            None
+        """
+        passaro.velocidade_y    += CONSTANTE_GRAVITACIONAL * PASSO_SIMULACAO
+        passaro.y               += passaro.velocidade_y * PASSO_SIMULACAO
+        passaro.angulo          += VELOCIDADE_ANGULO * PASSO_SIMULACAO
+
+    def movimentar_canos(self) -> None:
+        """
+        Move os canos durante um passo.
+
+        Returns:
+            None
+        """
+        for cano in self.canos:
+            cano.mover(VELOCIDADE_CANO.x * PASSO_SIMULACAO)
+
+    def resetar_canos(self) -> None:
+        """
+        Leva para o fim da fila os canos que ultrapassaram o lado esquerdo da tela,
+        sorteando uma nova abertura.
+
+        Returns:
+            None
+        """
+        offset_cano = QUANTIDADE_CANO * (DIMENSOES_CANO.x + DISTANCIA_ENTRE_CANOS)
+        for cano in self.canos:
+            if cano.x_direita < 0:
+                cano.mover(offset_cano)
+                cano.definir_abertura(self.sortear_abertura())
+
+    def atualizar_cano_coluna(self) -> None:
+        """
+        Encontra o par de canos que cruza a coluna ocupada pelos passaros (todos têm o mesmo x).
+        Como a distância entre os pares é maior que a largura do passaro mais a do cano, no
+        máximo um par cruza a coluna, e só ele precisa ser testado nas colisões.
+
+        Returns:
+            None
+        """
+        self.cano_coluna: Optional[EstadoCano] = None
+        for cano in self.canos:
+            if X_PASSARO < cano.x_direita and X_PASSARO + DIMENSOES_PASSARO.x > cano.x:
+                self.cano_coluna = cano
+                break
+
+    def atualizar_cano_atual(self) -> None:
+        """
+        Atualiza o cano que os passaros enxergam e a pontuação.
+
+        Returns:
+            None
+        """
+        if X_PASSARO > self.canos[self.idx_cano_atual].x_direita - 10:
+            self.idx_cano_atual = (self.idx_cano_atual + 1) % QUANTIDADE_CANO
+
+        if X_PASSARO > self.canos[self.idx_cano_placar].x_direita:
+            self.pontuacao += 1
+            self.idx_cano_placar = (self.idx_cano_placar + 1) % QUANTIDADE_CANO
+
+    def verificar_colisao_canos(self, passaro: EstadoPassaro) -> bool:
+        """
+        Verifica se o passaro colidiu com o par de canos que cruza a coluna dos passaros.
+
+        Args:
+            passaro (EstadoPassaro): O passaro a ser verificado.
+        Returns:
+            bool: True se houver colisão, False caso contrário.
+        """
+        cano = self.cano_coluna
+        if cano is None:
+            return False
+
+        base_passaro = passaro.y + DIMENSOES_PASSARO.y
+        colisao_superior = passaro.y < cano.y_cano_sup and base_passaro > cano.topo_cano_sup
+        colisao_inferior = base_passaro > cano.y_cano_inf and passaro.y < cano.base_cano_inf
+        return colisao_superior or colisao_inferior
+
+    def verificar_colisao_tela(self, passaro: EstadoPassaro) -> bool:
+        """
+        Verifica se o passaro colidiu com o teto ou com o chão.
+
+        Args:
+            passaro (EstadoPassaro): O passaro a ser verificado.
+        Returns:
+            bool: True se houver colisão, False caso contrário.
+        """
+        return passaro.y < 0 or self.verificar_colisao_chao(passaro)
+
+    def verificar_colisao_chao(self, passaro: EstadoPassaro) -> bool:
+        """
+        Verifica se o passaro colidiu com o chão.
+
+        Args:
+            passaro (EstadoPassaro): O passaro a ser verificado.
+        Returns:
+            bool: True se houver colisão, False caso contrário.
+        """
+        return passaro.y + DIMENSOES_PASSARO.y > Y_CHAO
+
+    def observacao(self, idx: int) -> tuple[float, float, float, float, float]:
+        """
+        Monta as entradas da rede neural para um passaro.
+
+        Args:
+            idx (int): Índice do passaro.
+        Returns:
+            tuple: Distância horizontal até o cano, distância até o topo do cano inferior,
+                distância até a base do cano superior, velocidade vertical e ângulo.
+        """
+        passaro = self.passaros[idx]
+        cano = self.canos[self.idx_cano_atual]
+        return (
+            cano.x - X_PASSARO,
+            cano.y_cano_inf - passaro.y,
+            cano.y_cano_sup - passaro.y,
+            passaro.velocidade_y,
+            passaro.angulo
+        )
+
+    def posicoes_canos(self, alpha: float = 1.0) -> list[tuple[float, int]]:
+        """
+        Retorna a posição de cada par de canos interpolada entre os dois últimos passos.
+
+        Args:
+            alpha (float, optional): Fração do passo já decorrida (0 a 1). Default é 1.0.
+        Returns:
+            list[tuple[float, int]]: Posição horizontal e centro da abertura de cada par.
+        """
+        posicoes = []
+        for cano in self.canos:
+            if cano.x > cano.x_anterior:
+                # O CANO ACABOU DE VOLTAR PARA A DIREITA: NAO INTERPOLA ATRAVES DA TELA
+                posicoes.append((cano.x, cano.abertura))
+            else:
+                posicoes.append((cano.x_anterior + (cano.x - cano.x_anterior) * alpha, cano.abertura))
+        return posicoes
@@ -0,0 +1,176 @@
+import numpy as np
+from random import Random
+from typing import Optional, Sequence
+from constants import *
+from gerador_canos import GeradorCanos
+from simulacao import X_PASSARO, Y_CHAO
+
+OFFSET_CANO: float = QUANTIDADE_CANO * (DIMENSOES_CANO.x + DISTANCIA_ENTRE_CANOS)
+
+class SimulacaoMundos:
+    def __init__(self, quantidade_mundos: int, semente: Optional[int] = None) -> None:
+        """
+        Inicializa vários mundos independentes, cada um com um passaro e seus próprios canos.
+
+        Diferente da SimulacaoVetorizada, em que todos os passaros dividem o mesmo percurso,
+        aqui cada mundo tem seu percurso e pode ser reiniciado sozinho. Todo o estado fica em
+        arrays do NumPy (os canos em matrizes mundos x canos), e cada mundo evolui exatamente
+        como uma Simulacao com um único passaro e a mesma semente.
+
+        Args:
+            quantidade_mundos (int): Quantidade de mundos simulados.
+            semente (int, optional): Semente da qual são sorteadas as sementes dos percursos
+                de cada mundo. Default é None (aleatória).
+
+        Returns:
+            None
+        """
+        self.quantidade_mundos: int = quantidade_mundos
+        n, q = quantidade_mundos, QUANTIDADE_CANO
+
+        self.y: np.ndarray              = np.empty(n, dtype=np.float64)
+        self.velocidade_y: np.ndarray   = np.empty(n, dtype=np.float64)
+        self.angulo: np.ndarray         = np.empty(n, dtype=np.float64)
+        self.vivo: np.ndarray           = np.empty(n, dtype=bool)
+        self.passos_vivo: np.ndarray    = np.empty(n, dtype=np.int64)
+        self.pontuacao: np.ndarray      = np.empty(n, dtype=np.int64)
+        self.idx_cano_atual: np.ndarray = np.empty(n, dtype=np.int64)
+        self.idx_cano_placar: np.ndarray = np.empty(n, dtype=np.int64)
+        self.x_canos: np.ndarray        = np.empty((n, q), dtype=np.float64)
+        self.aberturas: np.ndarray      = np.empty((n, q), dtype=np.int64)
+        self.geradores: list[Optional[GeradorCanos]] = [None] * n
+
+        self.rng_sementes: Random = Random(semente)
+        self.resetar_mundos(np.arange(n))
+
+    def resetar_mundos(self, indices: np.ndarray, sementes: Optional[Sequence[int]] = None) -> None:
+        """
+        Recoloca o passaro e os canos dos mundos escolhidos no estado inicial, com um novo percurso.
+
+        Args:
+            indices (np.ndarray): Índices dos mundos.
+            sementes (Sequence[int], optional): Semente do percurso de cada mundo. Default é None
+                (sorteadas de rng_sementes).
+
+        Returns:
+            None
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        self.y[indices]                 = POSICAO_INICIAL_PASSARO.y
+        self.velocidade_y[indices]      = 0
+        self.angulo[indices]            = -20
+        self.vivo[indices]              = True
+        self.passos_vivo[indices]       = 0
+        self.pontuacao[indices]         = 0
+        self.idx_cano_atual[indices]    = 0
+        self.idx_cano_placar[indices]   = 0
+
+        x_inicial = [LARGURA_TELA + (DIMENSOES_CANO.x + DISTANCIA_ENTRE_CANOS) * (cano + 1) for cano in range(QUANTIDADE_CANO)]
+        for i, mundo in enumerate(indices.tolist()):
+            semente = self.rng_sementes.randrange(2**32) if sementes is None else sementes[i]
+            gerador = GeradorCanos(semente)
+            self.geradores[mundo] = gerador
+            self.x_canos[mundo] = x_inicial
+            self.aberturas[mundo] = [gerador.proxima() for _ in range(QUANTIDADE_CANO)]
+
+    def step(self, acoes: np.ndarray) -> np.ndarray:
+        """
+        Avança todos os mundos com passaro vivo em um passo de duração fixa. Mundos cujo
+        passaro já morreu ficam parados até serem reiniciados.
+
+        Args:
+            acoes (np.ndarray): Array booleano com True para cada mundo cujo passaro deve pular.
+
+        Returns:
+            np.ndarray: Índices dos mundos cujo passaro morreu neste passo.
+        """
+        vivos = self.vivo.copy()
+        pulos = vivos & acoes
+        self.velocidade_y[pulos]    = -FORCA_PULO
+        self.angulo[pulos]          = -20
+
+        self.velocidade_y[vivos]    += CONSTANTE_GRAVITACIONAL * PASSO_SIMULACAO
+        self.y[vivos]               += self.velocidade_y[vivos] * PASSO_SIMULACAO
+        self.angulo[vivos]          += VELOCIDADE_ANGULO * PASSO_SIMULACAO
+        self.passos_vivo[vivos]     += 1
+
+        colidiu = vivos & (self.verificar_colisao_tela() | self.verificar_colisao_canos())
+        mortos = np.flatnonzero(colidiu)
+        self.velocidade_y[mortos]   = 0
+        self.vivo[mortos]           = False
+
+        self.avancar_mundos(np.flatnonzero(self.vivo))
+        return mortos
+
+    def avancar_mundos(self, indices: np.ndarray) -> None:
+        """
+        Move os canos e atualiza a pontuação dos mundos escolhidos.
+
+        Args:
+            indices (np.ndarray): Índices dos mundos que avançam.
+
+        Returns:
+            None
+        """
+        self.x_canos[indices] += VELOCIDADE_CANO.x * PASSO_SIMULACAO
+
+        # CANOS QUE SAIRAM PELA ESQUERDA VOLTAM PARA O FIM DA FILA COM UMA NOVA ABERTURA
+        for mundo, cano in np.argwhere(self.x_canos[indices] + DIMENSOES_CANO.x < 0).tolist():
+            mundo = int(indices[mundo])
+            self.x_canos[mundo, cano]   += OFFSET_CANO
+            self.aberturas[mundo, cano] = self.geradores[mundo].proxima()
+
+        x_direita_atual = self.x_canos[indices, self.idx_cano_atual[indices]] + DIMENSOES_CANO.x
+        passou = indices[X_PASSARO > x_direita_atual - 10]
+        self.idx_cano_atual[passou] = (self.idx_cano_atual[passou] + 1) % QUANTIDADE_CANO
+
+        x_direita_placar = self.x_canos[indices, self.idx_cano_placar[indices]] + DIMENSOES_CANO.x
+        pontuou = indices[X_PASSARO > x_direita_placar]
+        self.pontuacao[pontuou]         += 1
+        self.idx_cano_placar[pontuou]   = (self.idx_cano_placar[pontuou] + 1) % QUANTIDADE_CANO
+
+    def verificar_colisao_canos(self) -> np.ndarray:
+        """
+        Verifica, para todos os mundos, a colisão do passaro com o par de canos que cruza sua coluna.
+
+        Returns:
+            np.ndarray: Array booleano com True para cada mundo cujo passaro colidiu.
+        """
+        cruza_coluna = (X_PASSARO < self.x_canos + DIMENSOES_CANO.x) & (X_PASSARO + DIMENSOES_PASSARO.x > self.x_canos)
+        y_cano_sup = self.aberturas - ABERTURA_CANO
+        y_cano_inf = self.aberturas + ABERTURA_CANO
+
+        topo = self.y[:, None]
+        base = topo + DIMENSOES_PASSARO.y
+        colidiu = (topo < y_cano_sup) & (base > y_cano_sup - DIMENSOES_CANO.y)
+        colidiu |= (base > y_cano_inf) & (topo < y_cano_inf + DIMENSOES_CANO.y)
+        return (cruza_coluna & colidiu).any(axis=1)
+
+    def verificar_colisao_tela(self) -> np.ndarray:
+        """
+        Verifica, para todos os mundos, a colisão do passaro com o teto ou com o chão.
+
+        Returns:
+            np.ndarray: Array booleano com True para cada mundo cujo passaro colidiu.
+        """
+        return (self.y < 0) | (self.y + DIMENSOES_PASSARO.y > Y_CHAO)
+
+    def observacoes(self) -> np.ndarray:
+        """
+        Monta as entradas da rede neural para o passaro de cada mundo.
+
+        Returns:
+            np.ndarray: Matriz (quantidade_mundos, 5) com as mesmas entradas de
+                SimulacaoVetorizada.observacoes, cada linha relativa aos canos do seu mundo.
+        """
+        mundos = np.arange(self.quantidade_mundos)
+        x_cano = self.x_canos[mundos, self.idx_cano_atual]
+        abertura = self.aberturas[mundos, self.idx_cano_atual]
+
+        entradas = np.empty((self.quantidade_mundos, 5), dtype=np.float64)
+        entradas[:, 0] = x_cano - X_PASSARO
+        entradas[:, 1] = (abertura + ABERTURA_CANO) - self.y
+        entradas[:, 2] = (abertura - ABERTURA_CANO) - self.y
+        entradas[:, 3] = self.velocidade_y
+        entradas[:, 4] = self.angulo
+        return entradas
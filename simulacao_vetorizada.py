@@ -0,0 +1,150 @@
+import numpy as np
+from time import perf_counter
+from typing import Optional
+from constants import *
+from simulacao import Simulacao, X_PASSARO, Y_CHAO
+from medicao import MedidorFases
+
+class SimulacaoVetorizada(Simulacao):
+    def __init__(self, quantidade_passaros: int = 1, semente: Optional[int] = None) -> None:
+        """
+        Inicializa uma simulação que guarda a população inteira em arrays do NumPy.
+
+        Os canos continuam sendo os da Simulacao (são poucos e compartilhados por todos),
+        mas gravidade, pulos e colisões são calculados para todos os passaros de uma vez,
+        com os mesmos resultados da versão em Python puro.
+
+        Args:
+            quantidade_passaros (int, optional): Quantidade de passaros simulados. Default é 1.
+            semente (int, optional): Semente do percurso (veja GeradorCanos). Default é None (aleatória).
+
+        Returns:
+            None
+        """
+        self.medidor: Optional[MedidorFases] = None # SE DEFINIDO, MEDE O TEMPO DE FISICA E DE COLISAO
+        super().__init__(quantidade_passaros, semente)
+
+    def instanciar_passaros(self) -> None:
+        """
+        Cria os arrays com o estado de todos os passaros na posição inicial.
+
+        Returns:
+            None
+        """
+        n = self.quantidade_passaros
+        self.y: np.ndarray                  = np.full(n, POSICAO_INICIAL_PASSARO.y, dtype=np.float64)
+        self.y_anterior: np.ndarray         = self.y.copy()
+        self.velocidade_y: np.ndarray       = np.zeros(n, dtype=np.float64)
+        self.angulo: np.ndarray             = np.full(n, -20, dtype=np.float64)
+        self.angulo_anterior: np.ndarray    = self.angulo.copy()
+        self.vivo: np.ndarray               = np.ones(n, dtype=bool)
+        self.passos_vivo: np.ndarray        = np.zeros(n, dtype=np.int64)
+
+    def step(self, acoes: np.ndarray) -> np.ndarray:
+        """
+        Avança a simulação em um passo de duração fixa para toda a população.
+
+        Args:
+            acoes (np.ndarray): Array booleano com True para cada passaro que deve pular.
+
+        Returns:
+            np.ndarray: Índices dos passaros que morreram neste passo.
+        """
+        medidor = self.medidor
+        if medidor:
+            inicio = perf_counter()
+
+        for cano in self.canos:
+            cano.x_anterior = cano.x
+        self.y_anterior[:]      = self.y
+        self.angulo_anterior[:] = self.angulo
+
+        vivos = self.vivo
+        pulos = vivos & acoes
+        self.velocidade_y[pulos]    = -FORCA_PULO
+        self.angulo[pulos]          = -20
+
+        # OS MORTOS CONTINUAM CAINDO ATE ENCOSTAR NO CHAO
+        em_movimento = vivos | (self.y + DIMENSOES_PASSARO.y <= Y_CHAO)
+        self.velocidade_y[em_movimento] += CONSTANTE_GRAVITACIONAL * PASSO_SIMULACAO
+        self.y[em_movimento]            += self.velocidade_y[em_movimento] * PASSO_SIMULACAO
+        self.angulo[em_movimento]       += VELOCIDADE_ANGULO * PASSO_SIMULACAO
+        self.passos_vivo[vivos]         += 1
+        if medidor:
+            inicio = medidor.marcar('fisica', inicio)
+
+        colidiu = vivos & (self.verificar_colisao_tela_vetorizada() | self.verificar_colisao_canos_vetorizada())
+        mortos = np.flatnonzero(colidiu)
+        self.velocidade_y[mortos]   = 0
+        self.vivo[mortos]           = False
+        if medidor:
+            inicio = medidor.marcar('colisao', inicio)
+
+        self.quantidade_vivos -= len(mortos)
+        self.avancar_mundo()
+        if medidor:
+            medidor.marcar('fisica', inicio)
+        return mortos
+
+    def verificar_colisao_canos_vetorizada(self) -> np.ndarray:
+        """
+        Verifica, para todos os passaros, a colisão com o par de canos que cruza a coluna dos passaros.
+
+        Returns:
+            np.ndarray: Array booleano com True para cada passaro que colidiu.
+        """
+        cano = self.cano_coluna
+        if cano is None:
+            return np.zeros(self.quantidade_passaros, dtype=bool)
+
+        topo = self.y
+        base = self.y + DIMENSOES_PASSARO.y
+        colidiu = (topo < cano.y_cano_sup) & (base > cano.topo_cano_sup)
+        colidiu |= (base > cano.y_cano_inf) & (topo < cano.base_cano_inf)
+        return colidiu
+
+    def verificar_colisao_tela_vetorizada(self) -> np.ndarray:
+        """
+        Verifica, para todos os passaros, a colisão com o teto ou com o chão.
+
+        Returns:
+            np.ndarray: Array booleano com True para cada passaro que colidiu.
+        """
+        return (self.y < 0) | (self.y + DIMENSOES_PASSARO.y > Y_CHAO)
+
+    def observacoes(self) -> np.ndarray:
+        """
+        Monta as entradas da rede neural para todos os passaros.
+
+        Returns:
+            np.ndarray: Matriz (quantidade_passaros, 5) com, para cada passaro, a distância
+                horizontal até o cano, a distância até o topo do cano inferior, a distância
+                até a base do cano superior, a velocidade vertical e o ângulo.
+        """
+        cano = self.canos[self.idx_cano_atual]
+        entradas = np.empty((self.quantidade_passaros, 5), dtype=np.float64)
+        entradas[:, 0] = cano.x - X_PASSARO
+        entradas[:, 1] = cano.y_cano_inf - self.y
+        entradas[:, 2] = cano.y_cano_sup - self.y
+        entradas[:, 3] = self.velocidade_y
+        entradas[:, 4] = self.angulo
+        return entradas
+
+    def observacao(self, idx: int) -> tuple[float, float, float, float, float]:
+        """
+        Monta as entradas da rede neural para um passaro.
+
+        Args:
+            idx (int): Índice do passaro.
+        Returns:
+            tuple: As mesmas cinco entradas de observacoes, para um único passaro.
+        """
+        cano = self.canos[self.idx_cano_atual]
+        y = float(self.y[idx])
+        return (
+            cano.x - X_PASSARO,
+            cano.y_cano_inf - y,
+            cano.y_cano_sup - y,
+            float(self.velocidade_y[idx]),
+            float(self.angulo[idx])
+        )
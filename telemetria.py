@@ -0,0 +1,127 @@
+import os
+import csv
+import json
+import numpy as np
+from time import perf_counter, time
+from typing import Optional
+from neat.reporting import BaseReporter
+from medicao import MedidorFases
+
+FASES: tuple[str, ...]  = ('compilacao', 'inferencia', 'fisica', 'colisao', 'desenho', 'eventos')
+PONTOS_CURVA: int       = 20 # QUANTIDADE DE PONTOS DA CURVA DE SOBREVIVENTES DE CADA GERACAO
+
+class ReporterTelemetria(BaseReporter):
+    def __init__(self, caminho: str, medidor: Optional[MedidorFases] = None) -> None:
+        """
+        Reporter do NEAT que acrescenta uma linha por geração num arquivo JSONL ou CSV
+        (pela extensão) com o tempo gasto em cada fase, os passos simulados, os genomas
+        encontrados no cache de fitness, os que chegaram ao limite de passos, a curva de
+        sobreviventes e as estatísticas de fitness.
+
+        A avaliação da população deve medir as fases em self.medidor (veja avaliar_genomas).
+        O arquivo só recebe linhas novas, então treinos retomados continuam o mesmo arquivo.
+
+        Args:
+            caminho (str): Caminho do arquivo (.csv para CSV; qualquer outra extensão, JSONL).
+            medidor (MedidorFases, optional): Medidor usado pela avaliação (por exemplo, um
+                Perfilador). Default é None (cria um MedidorFases).
+
+        Returns:
+            None
+        """
+        self.caminho: str           = caminho
+        self.csv: bool              = caminho.lower().endswith('.csv')
+        self.medidor: MedidorFases  = medidor or MedidorFases()
+        self.geracao_atual: int     = 0
+        self.inicio: float          = 0
+        self.fitness: list[float]   = []
+        self.quantidade_especies: int = 0
+
+    def start_generation(self, generation: int) -> None:
+        self.geracao_atual = generation
+        self.medidor.zerar()
+        self.inicio = perf_counter()
+
+    def post_evaluate(self, config, population, species, best_genome) -> None:
+        self.fitness = [g.fitness for g in population.values() if g.fitness is not None]
+        self.quantidade_especies = len(species.species)
+
+    def end_generation(self, config, population, species_set) -> None:
+        self.escrever(self.montar_linha(perf_counter() - self.inicio))
+
+    def found_solution(self, config, generation, best) -> None:
+        # QUANDO O LIMIAR DE FITNESS E ALCANCADO, O NEAT PARA SEM CHAMAR end_generation
+        self.escrever(self.montar_linha(perf_counter() - self.inicio))
+
+    def montar_linha(self, tempo_total: float) -> dict:
+        """
+        Monta o registro da geração que acabou de terminar.
+
+        Args:
+            tempo_total (float): Duração da geração, incluindo a reprodução do NEAT.
+
+        Returns:
+            dict: O registro.
+        """
+        medidor = self.medidor
+        tempos = {fase: medidor.tempos.get(fase, 0.0) for fase in FASES}
+        passos_passaros = medidor.contadores.get('passos_passaros', 0)
+        fitness = np.array(self.fitness, dtype=np.float64)
+
+        duracoes = np.sort(np.array(medidor.duracoes, dtype=np.int64))
+        pontos = np.linspace(0, duracoes[-1], PONTOS_CURVA).round().astype(np.int64) if len(duracoes) else np.zeros(0, dtype=np.int64)
+        vivos = len(duracoes) - np.searchsorted(duracoes, pontos, side='right')
+
+        return {
+            'geracao': self.geracao_atual,
+            'horario': round(time(), 3),
+            'tempo_total': tempo_total,
+            'tempos': tempos,
+            'passos': medidor.contadores.get('passos', 0),
+            'passos_passaros': passos_passaros,
+            'passos_passaros_por_segundo': passos_passaros / tempo_total if tempo_total else 0.0,
+            'cache_acertos': medidor.contadores.get('cache_acertos', 0),
+            'no_limite': medidor.contadores.get('no_limite', 0),
+            'sobreviventes': [[int(p), int(v)] for p, v in zip(pontos, vivos)],
+            'fitness': {
+                'media': float(fitness.mean()) if len(fitness) else None,
+                'desvio': float(fitness.std()) if len(fitness) else None,
+                'minimo': float(fitness.min()) if len(fitness) else None,
+                'mediana': float(np.median(fitness)) if len(fitness) else None,
+                'maximo': float(fitness.max()) if len(fitness) else None
+            },
+            'populacao': len(self.fitness),
+            'especies': self.quantidade_especies
+        }
+
+    def escrever(self, linha: dict) -> None:
+        """
+        Acrescenta um registro ao arquivo.
+
+        Args:
+            linha (dict): O registro.
+
+        Returns:
+            None
+        """
+        pasta = os.path.dirname(self.caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        if not self.csv:
+            with open(self.caminho, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(json.dumps(linha) + '\n')
+            return
+
+        # NO CSV, OS CAMPOS ANINHADOS VIRAM COLUNAS (tempo_inferencia, fitness_media...)
+        plana = {chave: valor for chave, valor in linha.items() if not isinstance(valor, (dict, list))}
+        plana.update({f'tempo_{fase}': tempo for fase, tempo in linha['tempos'].items()})
+        plana.update({f'fitness_{nome}': valor for nome, valor in linha['fitness'].items()})
+        plana['sobreviventes'] = ' '.join(f'{passo}:{vivos}' for passo, vivos in linha['sobreviventes'])
+
+        novo = not os.path.exists(self.caminho) or os.path.getsize(self.caminho) == 0
+        with open(self.caminho, 'a', encoding='utf-8', newline='') as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=list(plana))
+            if novo:
+                escritor.writeheader()
+            escritor.writerow(plana)